@@ -0,0 +1,93 @@
+"""
+BAPLIE rendering benchmark.
+
+Compares generate_message (ElementTree build + tostring), the streaming
+iter_message and the pre-rendered BaplieTemplate on the project discharge CSV
+and on synthetic vessels where every cell holds a container, and times the
+streaming reader's check of each message against its CSV.
+
+Usage:
+    python -m benchmarks.bench_baplie
+    python -m benchmarks.bench_baplie --containers 1000 50000 --json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from helper.synthetic_discharge import synthetic_discharge
+from helper.JMS.baplie_reader import diff_against_csv
+from helper.JMS.baplie_template import render_message
+from helper.JMS.generate_msg import generate_message, iter_message
+from helper.paths import ProjectPaths
+
+DEFAULT_CONTAINERS = (1_000, 12_000, 50_000)
+
+
+def _best_ms(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def run(containers: List[int], repeat: int, workdir: Path) -> List[Dict[str, object]]:
+    inputs = [("vessel_discharge_data.csv", ProjectPaths.DATA / "vessel_discharge_data.csv")]
+    for count in containers:
+        path = workdir / f"baplie_{count}.csv"
+        synthetic_discharge(count, occupancy=1.0).to_csv(path, index=False)
+        inputs.append((f"synthetic {count}", path))
+
+    results = []
+    for name, path in inputs:
+        expected = generate_message(path)
+        if render_message(path) != expected:
+            raise AssertionError(f"Template output differs from generate_message for {name}")
+        row = {
+            "input": name,
+            "containers": expected.count("<EquipmentAndGoodsInfo>"),
+            "bytes": len(expected.encode("utf-8")),
+            "generate_message_ms": _best_ms(lambda: generate_message(path), repeat),
+            "iter_message_ms": _best_ms(lambda: "".join(iter_message(path)), repeat),
+            "template_ms": _best_ms(lambda: render_message(path), repeat),
+        }
+        row["speedup"] = round(row["generate_message_ms"] / max(row["template_ms"], 1e-9), 2)
+        message = workdir / "message.xml"
+        message.write_text(expected, encoding="utf-8")
+        if not diff_against_csv(str(message), path)["ok"]:
+            raise AssertionError(f"Reader found differences for {name}")
+        row["verify_ms"] = _best_ms(lambda: diff_against_csv(str(message), path), repeat)
+        results.append(row)
+    return results
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="generate_message vs pre-rendered BAPLIE template")
+    parser.add_argument("--containers", type=int, nargs="+", default=list(DEFAULT_CONTAINERS))
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per timing")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run(args.containers, args.repeat, Path(workdir))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'input':<28} {'containers':>10} {'ET ms':>10} {'stream ms':>10} {'template ms':>12} {'speedup':>8} "
+          f"{'verify ms':>10}")
+    for row in results:
+        print(f"{row['input']:<28} {row['containers']:>10} {row['generate_message_ms']:>10.1f} "
+              f"{row['iter_message_ms']:>10.1f} {row['template_ms']:>12.1f} {row['speedup']:>7.1f}x "
+              f"{row['verify_ms']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+"""
+Discharge allocation benchmark at realistic vessel sizes.
+
+Generates synthetic vessel discharge tables (helper.synthetic_discharge)
+with a fixed seed and times, per size:
+index build, group detection (get_bay_groups), bulk allocation, CSV save and,
+for small tables, the per-container auto_assign_containers loop.
+No WebDriver is needed.
+
+Usage:
+    python -m benchmarks.bench_discharge
+    python -m benchmarks.bench_discharge --sizes 1000 12000 --count 2000 --json
+    python -m benchmarks.bench_discharge --output after.json --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from helper.data_store import write_csv_atomic
+from helper.generate_discharge_container import GenerateDischarge
+from helper.synthetic_discharge import synthetic_discharge
+
+DEFAULT_SIZES = (1_000, 12_000, 100_000, 500_000)
+LEGACY_MAX_CELLS = 12_000
+LEGACY_COUNT = 50
+
+
+def _timed(func: Callable[..., object], repeat: int, setup: Optional[Callable[[], object]] = None) -> float:
+    """
+    Best-of-`repeat` wall time of `func` in ms; page-style prints are discarded.
+    When given, `setup()` runs untimed before each call and its result is passed to `func`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            args = () if setup is None else (setup(),)
+            start = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def run(sizes: List[int], count: int, seed: int, repeat: int, workdir: Path) -> List[Dict[str, object]]:
+    results = []
+    for cells in sizes:
+        df = synthetic_discharge(cells, seed)
+        path = workdir / f"discharge_{cells}.csv"
+        df.to_csv(path, index=False)
+        row: Dict[str, object] = {"cells": cells, "count": count, "seed": seed}
+
+        row["build_index_ms"] = _timed(lambda: GenerateDischarge(df.copy(), path), repeat)
+        g = GenerateDischarge(df.copy(), path)
+        row["bay_groups_ms"] = _timed(g.get_bay_groups, repeat)
+
+        for size in (20, 40):
+            assigned = []
+
+            def allocate(fresh: GenerateDischarge):
+                assigned[:] = [fresh.bulk_assign_containers("DISH100000", count, size, save=False), fresh]
+
+            row[f"bulk_{size}_ms"] = _timed(allocate, repeat, setup=lambda: GenerateDischarge(df.copy(), path))
+            row[f"assigned_{size}"] = len(assigned[0])
+            row[f"save_{size}_ms"] = _timed(lambda: write_csv_atomic(assigned[1].df, path), repeat)
+
+        if cells <= LEGACY_MAX_CELLS:
+            df.to_csv(path, index=False)
+            legacy = GenerateDischarge(df.copy(), path)
+            row["legacy_loop_ms"] = _timed(lambda: legacy.auto_assign_containers("DISH100000", LEGACY_COUNT, 20), 1)
+            row["legacy_count"] = LEGACY_COUNT
+        results.append(row)
+    return results
+
+
+def compare(results: List[Dict[str, object]], baseline: List[Dict[str, object]]) -> List[str]:
+    """Lines of `metric: before -> after (ratio)` for every timing both runs share."""
+    before = {row["cells"]: row for row in baseline}
+    lines = []
+    for row in results:
+        old = before.get(row["cells"])
+        if old is None:
+            continue
+        for key, value in row.items():
+            if key.endswith("_ms") and key in old and old[key]:
+                lines.append(f"{row['cells']:>8} {key:<16} {old[key]:>12.3f} -> {value:>12.3f}  x{old[key] / max(value, 1e-9):.2f}")
+    return lines
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Discharge group detection / allocation / save timings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Cells per table")
+    parser.add_argument("--count", type=int, default=1000, help="Containers allocated per size class")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per timing")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--compare", default=None, help="JSON report from a previous run")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run(args.sizes, args.count, args.seed, args.repeat, Path(workdir))
+
+    report = {
+        "benchmark": "discharge_allocation",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'cells':>8} {'index ms':>10} {'groups ms':>10} {'bulk20 ms':>10} {'bulk40 ms':>10} "
+              f"{'save ms':>10} {'legacy ms':>10}")
+        for row in results:
+            print(f"{row['cells']:>8} {row['build_index_ms']:>10.1f} {row['bay_groups_ms']:>10.1f} "
+                  f"{row['bulk_20_ms']:>10.1f} {row['bulk_40_ms']:>10.1f} {row['save_20_ms']:>10.1f} "
+                  f"{row.get('legacy_loop_ms', float('nan')):>10.1f}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+        print("\n".join(compare(results, baseline)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+"""
+BAPLIE generation and send benchmark against the local stand-in brokers.
+
+Renders a BAPLIE message for a synthetic discharge table (see helper.synthetic_discharge)
+and sends it through each transport: memory:// in-process, tcp:// and spool://
+with the broker in a separate process (python -m helper.JMS.local_broker).
+Reports generation time, sequential request latency (p50/p95/max) and
+concurrent throughput. With --chunk-containers it also times the whole bay
+plan sent as one message against chunked dispatch (baplie_dispatch).
+No JVM or WebLogic server is needed.
+
+Usage:
+    python -m benchmarks.bench_jms
+    python -m benchmarks.bench_jms --transports tcp --messages 500 --containers 2000 --json
+    python -m benchmarks.bench_jms --containers 20000 --chunk-containers 1000 --per-container-ms 0.05
+    python -m benchmarks.bench_jms --output after.json --compare before.json
+"""
+
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from helper.synthetic_discharge import synthetic_discharge
+from helper.JMS.baplie_dispatch import dispatch_bay_plan
+from helper.JMS.baplie_template import BaplieTemplate
+from helper.JMS.local_broker import reset_memory_broker
+from helper.JMS.send_msg import Producer
+from helper.paths import ProjectPaths
+
+TRANSPORTS = ("memory", "tcp", "spool")
+QUEUE = "jms/sp/InboundBayplanQueue"
+LATENCY_SAMPLES = 100
+
+
+@contextlib.contextmanager
+def broker_url(transport: str, workdir: Path, latency_ms: float, per_container_ms: float = 0.0) -> Iterator[str]:
+    """Provider URL for `transport`; tcp and spool brokers run in a child process."""
+    if transport == "memory":
+        reset_memory_broker("bench")
+        yield f"memory://bench?latency_ms={latency_ms}&per_container_ms={per_container_ms}"
+        reset_memory_broker("bench")
+        return
+
+    args = ["tcp", "--port", "0"] if transport == "tcp" else ["spool", str(workdir / "spool")]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "helper.JMS.local_broker", *args, "--latency-ms", str(latency_ms),
+         "--per-container-ms", str(per_container_ms)],
+        cwd=ProjectPaths.ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        yield process.stdout.readline().strip()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(transports: List[str], messages: int, containers: int, pool_size: int, seed: int,
+        latency_ms: float, workdir: Path, chunk_containers: int = 0,
+        per_container_ms: float = 0.0) -> List[Dict[str, object]]:
+    df = synthetic_discharge(containers, seed, occupancy=1.0)
+    rows = df.astype(str).to_dict("records")
+    csv_path = workdir / "bay_plan.csv"
+    df.to_csv(csv_path, index=False)
+    template = BaplieTemplate()
+
+    start = time.perf_counter()
+    message = template.render(rows)
+    generate_ms = (time.perf_counter() - start) * 1000
+    size = len(message.encode("utf-8"))
+
+    results = []
+    for transport in transports:
+        row: Dict[str, object] = {}
+        with broker_url(transport, workdir, latency_ms, per_container_ms) as url, \
+                Producer(url, QUEUE, pool_size=pool_size) as producer:
+            producer.request(message)  # connect and warm up
+
+            latencies = []
+            for _ in range(min(messages, LATENCY_SAMPLES)):
+                start = time.perf_counter()
+                producer.request(message)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            replies = producer.send_many([message] * messages)
+            elapsed = time.perf_counter() - start
+
+            if chunk_containers:
+                single = dispatch_bay_plan(producer, csv_path, 0, 0, max_in_flight=pool_size)
+                chunked = dispatch_bay_plan(producer, csv_path, chunk_containers, 0, max_in_flight=pool_size)
+                row = {"single_message_ms": single["elapsed_ms"], "chunked_ms": chunked["elapsed_ms"],
+                       "chunks": len(chunked["chunks"]), "chunks_failed": chunked["failed"]}
+
+        results.append({
+            "transport": transport,
+            "messages": messages,
+            "containers": containers,
+            "message_bytes": size,
+            "generate_ms": round(generate_ms, 3),
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "max_ms": round(max(latencies), 3),
+            "send_many_ms": round(elapsed * 1000, 3),
+            "msgs_per_s": round(len(replies) / elapsed, 1),
+            "mb_per_s": round(size * len(replies) / elapsed / 1e6, 2),
+            **row,
+        })
+    return results
+
+
+def compare(results: List[Dict[str, object]], baseline: List[Dict[str, object]]) -> List[str]:
+    """Lines of `metric: before -> after (ratio)` for every timing both runs share."""
+    before = {row["transport"]: row for row in baseline}
+    lines = []
+    for row in results:
+        old = before.get(row["transport"])
+        if old is None:
+            continue
+        for key, value in row.items():
+            if key.endswith("_ms") and key in old and old[key]:
+                lines.append(f"{row['transport']:>8} {key:<14} {old[key]:>12.3f} -> {value:>12.3f}  x{old[key] / max(value, 1e-9):.2f}")
+    return lines
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="BAPLIE generation and send through local brokers")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--messages", type=int, default=200, help="Messages per send_many run")
+    parser.add_argument("--containers", type=int, default=500, help="Containers per BAPLIE message")
+    parser.add_argument("--pool-size", type=int, default=4, help="Producer sessions/connections")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated broker processing time")
+    parser.add_argument("--per-container-ms", type=float, default=0.0,
+                        help="Simulated broker processing time per container")
+    parser.add_argument("--chunk-containers", type=int, default=0,
+                        help="Also compare one bay plan message with chunks of this many containers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--compare", default=None, help="JSON report from a previous run")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run(args.transports, args.messages, args.containers, args.pool_size, args.seed,
+                      args.latency_ms, Path(workdir), args.chunk_containers, args.per_container_ms)
+
+    report = {
+        "benchmark": "jms_send",
+        "python": platform.python_version(),
+        "pool_size": args.pool_size,
+        "latency_ms": args.latency_ms,
+        "per_container_ms": args.per_container_ms,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'transport':>9} {'bytes':>9} {'gen ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} "
+              f"{'msg/s':>9} {'MB/s':>8}")
+        for row in results:
+            print(f"{row['transport']:>9} {row['message_bytes']:>9} {row['generate_ms']:>8.1f} {row['p50_ms']:>8.2f} "
+                  f"{row['p95_ms']:>8.2f} {row['max_ms']:>8.2f} {row['msgs_per_s']:>9.1f} {row['mb_per_s']:>8.2f}")
+        for row in results:
+            if "chunked_ms" in row:
+                print(f"{row['transport']:>9} bay plan: one message {row['single_message_ms']:.0f} ms, "
+                      f"{row['chunks']} chunks {row['chunked_ms']:.0f} ms ({row['chunks_failed']} failed)")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+        print("\n".join(compare(results, baseline)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
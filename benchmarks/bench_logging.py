@@ -0,0 +1,136 @@
+"""
+Logging overhead benchmark for the core action layer.
+
+Measures the per-call cost of the logging done in ElementProperties, the
+sendkeys log line, debug_out_line and ContainerDetails._save_to_csv at INFO
+and at WARNING, against the eager f-string form they used before. Output goes
+to an in-memory stream, so the numbers are formatting cost without disk I/O.
+
+Usage:
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --iterations 50000 --json
+"""
+
+import argparse
+import io
+import json
+import logging
+import time
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from helper.decorators import debug_out_line, logger as decorator_logger
+from helper.logger import LOG_FORMAT, logger
+from src.core.properties import ElementProperties
+
+XPATH = "//element[@automationid='gate_transaction']//button[@text='Create Pickup']"
+
+
+class _FakeElement:
+    def get_dom_attribute(self, name):
+        return "True"
+
+
+class _FakeDriver:
+    def implicitly_wait(self, timeout):
+        pass
+
+    def find_element(self, by, value):
+        return _FakeElement()
+
+
+def _time_per_call(func: Callable[[], None], iterations: int) -> float:
+    """Return the best-of-3 mean time per call in nanoseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter_ns() - start) / iterations)
+    return best
+
+
+def _cases() -> Dict[str, Callable[[], None]]:
+    properties = ElementProperties(_FakeDriver())
+    df = pd.DataFrame({"cntr_id": [f"TEST{i:06d}" for i in range(30)], "size": [20] * 30})
+
+    @debug_out_line
+    def wrapped(xpath):
+        return xpath
+
+    keys, should_send_tab = "TEST000001", True
+
+    def eager_sendkeys_line():
+        logger.info(f"Sending keys: {keys}{' + TAB' if should_send_tab else ''}")
+
+    def lazy_sendkeys_line():
+        logger.info("Sending keys: %s%s", keys, " + TAB" if should_send_tab else "")
+
+    def eager_to_dict_line():
+        logger.info(f"Updated DataFrame: {df.to_dict()}")
+
+    def guarded_to_dict_line():
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Updated DataFrame: %s", df.to_dict())
+
+    return {
+        "ElementProperties.visible (fake driver)": lambda: properties.visible(XPATH),
+        "sendkeys log line, eager f-string": eager_sendkeys_line,
+        "sendkeys log line, lazy %-args": lazy_sendkeys_line,
+        "debug_out_line wrapper": lambda: wrapped(XPATH),
+        "_save_to_csv log line, eager to_dict": eager_to_dict_line,
+        "_save_to_csv log line, guarded to_dict": guarded_to_dict_line,
+    }
+
+
+def run(iterations: int) -> List[Dict[str, float]]:
+    original_handlers = logger.handlers[:]
+    original_levels = (logger.level, decorator_logger.level)
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.handlers = [handler]
+    decorator_logger.handlers = [handler]
+    decorator_logger.propagate = False
+
+    results = []
+    try:
+        cases = _cases()
+        for name, func in cases.items():
+            row = {"case": name}
+            for level in (logging.DEBUG, logging.INFO, logging.WARNING):
+                logger.setLevel(level)
+                decorator_logger.setLevel(level)
+                handler.stream = io.StringIO()
+                # Slow cases (to_dict) get fewer iterations
+                n = iterations // 20 if "to_dict" in name else iterations
+                row[f"{logging.getLevelName(level)}_ns"] = round(_time_per_call(func, n), 1)
+            results.append(row)
+    finally:
+        logger.handlers = original_handlers
+        logger.setLevel(original_levels[0])
+        decorator_logger.handlers = []
+        decorator_logger.propagate = True
+        decorator_logger.setLevel(original_levels[1])
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Per-call logging overhead at INFO vs WARNING")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'case':<42} {'DEBUG ns':>12} {'INFO ns':>12} {'WARNING ns':>12}")
+    for row in results:
+        print(f"{row['case']:<42} {row['DEBUG_ns']:>12.1f} {row['INFO_ns']:>12.1f} {row['WARNING_ns']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,6 @@
 import allure
+from helper.JMS.baplie_dispatch import DEFAULT_CHUNK_BAYS, DEFAULT_CHUNK_CONTAINERS
+from helper.JMS.jvm import warm_up
 from helper.JMS.send_msg import Producer
 from helper.paths import ProjectPaths
 
@@ -8,14 +10,35 @@ class Baplie:
     
     def __init__(self):
         self.producer = None
+
+    def _get_producer(self, provider_url: str, queue: str) -> Producer:
+        """Reuse the pooled producer while the broker and queue stay the same."""
+        if self.producer is not None and (self.producer.provider_url, self.producer.queue) != (provider_url, queue):
+            self.producer.close()
+            self.producer = None
+        if self.producer is None:
+            self.producer = Producer(provider_url, queue)
+        return self.producer
+
+    def warm_up(self) -> float:
+        """Start the JVM and load the JMS classes now; returns the elapsed ms."""
+        return warm_up()
+
+    def close(self):
+        """Close the pooled JMS connection."""
+        if self.producer is not None:
+            self.producer.close()
+            self.producer = None
     
     def send_bay_plan_message(self, provider_url: str = "t3://172.18.51.25:20212", 
                              queue: str = "jms/sp/InboundBayplanQueue",
-                             data_path: str = ProjectPaths.DATA / "vessel_discharge_data.csv"):
-        """Send bay plan message to JMS queue"""
+                             data_path: str = ProjectPaths.DATA / "vessel_discharge_data.csv",
+                             max_containers: int = DEFAULT_CHUNK_CONTAINERS,
+                             bays_per_chunk: int = DEFAULT_CHUNK_BAYS):
+        """Send bay plan message to JMS queue, split into concurrent chunks when a chunk limit is set"""
         try:
-            self.producer = Producer(provider_url, queue)
-            success = self.producer.send_bay_plan_message(data_path)
+            success = self._get_producer(provider_url, queue).send_bay_plan_message(
+                data_path, max_containers, bays_per_chunk)
             
             if success:
                 print("Bay plan message sent successfully")
@@ -30,8 +53,7 @@ class Baplie:
                            queue: str = "jms/sp/InboundBayplanQueue"):
         """Send custom message to JMS queue"""
         try:
-            self.producer = Producer(provider_url, queue)
-            self.producer.send_message(message)
+            self._get_producer(provider_url, queue).send_message(message)
             print("Custom message sent successfully")
             
         except Exception as e:
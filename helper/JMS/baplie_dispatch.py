@@ -0,0 +1,164 @@
+"""
+BAPLIE Dispatch - Send a vessel bay plan as several smaller BAPLIE messages.
+
+Containers are split by bay range and/or container count. Every chunk is a
+complete message with the usual header and trailer (rendered by
+BaplieTemplate), chunks are sent concurrently with at most `max_in_flight`
+waiting for a reply, and the per-chunk replies are merged into one result.
+A chunk that fails or times out is resent up to `retries` times without
+holding back the others.
+
+Usage:
+    from helper.JMS.baplie_dispatch import dispatch_bay_plan
+    with Producer("t3://172.18.51.25:20212", "jms/sp/InboundBayplanQueue") as producer:
+        result = dispatch_bay_plan(producer, "data/vessel_discharge_data.csv", max_containers=500)
+    result["failed"], result["containers"], [c["bays"] for c in result["chunks"]]
+
+Set BAPLIE_CHUNK_CONTAINERS / BAPLIE_CHUNK_BAYS to chunk Producer.send_bay_plan_message by default.
+"""
+
+import csv
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from helper.JMS.baplie_template import get_template
+from helper.JMS.transport import DEFAULT_POOL_SIZE, DEFAULT_REPLY_TIMEOUT
+from helper.logger import logger
+
+# 0 disables that kind of split; both 0 sends the vessel as one message
+DEFAULT_CHUNK_CONTAINERS = int(os.getenv("BAPLIE_CHUNK_CONTAINERS", "0"))
+DEFAULT_CHUNK_BAYS = int(os.getenv("BAPLIE_CHUNK_BAYS", "0"))
+DEFAULT_CHUNK_RETRIES = 1
+
+
+def bay_of(row: Dict[str, str]) -> int:
+    """Bay number from StowageCell_ISO ("010082" -> 1)."""
+    return int(row["StowageCell_ISO"]) // 10000
+
+
+def split_rows(rows: Iterable[Dict[str, str]], max_containers: Optional[int] = None,
+               bays_per_chunk: Optional[int] = None) -> List[List[Dict[str, str]]]:
+    """
+    Group CSV rows with a container into message chunks.
+
+    Args:
+        rows: Discharge CSV rows (csv.DictReader)
+        max_containers: At most this many containers per chunk
+        bays_per_chunk: At most this many bay numbers per chunk, in bay order
+
+    Returns:
+        Non-empty list of chunks; a vessel without containers gives one empty chunk
+
+    Raises:
+        ValueError: If a limit is negative
+    """
+    if (max_containers or 0) < 0 or (bays_per_chunk or 0) < 0:
+        raise ValueError("Chunk limits must be non-negative")
+    rows = [row for row in rows if row["ContainerNum"] and row["ContainerNum"].strip()]
+
+    if bays_per_chunk:
+        by_bay: Dict[int, List[Dict[str, str]]] = defaultdict(list)
+        for row in rows:
+            by_bay[bay_of(row)].append(row)
+        bays = sorted(by_bay)
+        groups = [[row for bay in bays[i:i + bays_per_chunk] for row in by_bay[bay]]
+                  for i in range(0, len(bays), bays_per_chunk)]
+    else:
+        groups = [rows]
+
+    if max_containers:
+        groups = [group[i:i + max_containers] for group in groups for i in range(0, len(group), max_containers)]
+    return [group for group in groups if group] or [[]]
+
+
+def dispatch_bay_plan(sender, csv_file, max_containers: Optional[int] = DEFAULT_CHUNK_CONTAINERS,
+                      bays_per_chunk: Optional[int] = DEFAULT_CHUNK_BAYS,
+                      max_in_flight: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT,
+                      retries: int = DEFAULT_CHUNK_RETRIES) -> Dict[str, Any]:
+    """
+    Send the bay plan in `csv_file` as concurrent chunk messages.
+
+    Args:
+        sender: Producer or Transport (anything with send_async(message, timeout))
+        csv_file: Vessel discharge CSV
+        max_containers: Containers per chunk (0/None: no limit)
+        bays_per_chunk: Bay numbers per chunk (0/None: no limit)
+        max_in_flight: Chunks waiting for a reply at the same time
+        timeout: Seconds to wait for each chunk's reply
+        retries: Resend a failed chunk this many times
+
+    Returns:
+        {"chunks": [...], "containers", "sent_containers", "failed", "replies", "elapsed_ms"}
+        with one entry per chunk: chunk, bays, containers, bytes, status, reply/error,
+        attempts, elapsed_ms
+    """
+    start = time.perf_counter()
+    with open(csv_file, "r", encoding="utf-8-sig") as f:
+        chunks = split_rows(csv.DictReader(f), max_containers, bays_per_chunk)
+
+    template = get_template()
+    slots = threading.BoundedSemaphore(max(1, max_in_flight))
+    results: List[Dict[str, Any]] = []
+    for i, rows in enumerate(chunks):
+        bays = sorted({bay_of(row) for row in rows})
+        results.append({"chunk": i, "bays": [bays[0], bays[-1]] if bays else [], "containers": len(rows),
+                        "bytes": 0, "status": "pending", "reply": None, "error": None, "attempts": 0})
+
+    def on_done(result: Dict[str, Any], sent: float):
+        def callback(_future):
+            result["elapsed_ms"] = round((time.perf_counter() - sent) * 1000, 1)
+            slots.release()
+        return callback
+
+    pending = list(range(len(chunks)))
+    for attempt in range(retries + 1):
+        futures = {}
+        for i in pending:
+            result = results[i]
+            result["attempts"] = attempt + 1
+            slots.acquire()
+            # Render while earlier chunks are in flight; only in-flight messages are held in memory
+            message = template.render(chunks[i])
+            result["bytes"] = len(message.encode("utf-8"))
+            sent = time.perf_counter()
+            try:
+                future = sender.send_async(message, timeout)
+            except Exception as e:
+                slots.release()
+                result.update(status="error", error=f"{type(e).__name__}: {e}")
+                continue
+            future.add_done_callback(on_done(result, sent))
+            futures[i] = future
+
+        for i, future in futures.items():
+            try:
+                results[i].update(status="ok", reply=future.result(), error=None)
+            except Exception as e:
+                results[i].update(status="error", error=f"{type(e).__name__}: {e}")
+
+        pending = [i for i in pending if results[i]["status"] != "ok"]
+        if not pending:
+            break
+        if attempt < retries:
+            logger.warning("Resending %d of %d BAPLIE chunks (attempt %d/%d)",
+                           len(pending), len(chunks), attempt + 1, retries)
+
+    ok = [r for r in results if r["status"] == "ok"]
+    summary = {
+        "chunks": results,
+        "containers": sum(r["containers"] for r in results),
+        "sent_containers": sum(r["containers"] for r in ok),
+        "failed": len(results) - len(ok),
+        "replies": [r["reply"] for r in ok],
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    logger.info("Sent %d/%d BAPLIE chunks (%d containers) in %.0f ms",
+                len(ok), len(results), summary["sent_containers"], summary["elapsed_ms"])
+    for r in results:
+        if r["status"] != "ok":
+            logger.error("BAPLIE chunk %d (bays %s, %d containers) failed: %s",
+                         r["chunk"], r["bays"], r["containers"], r["error"])
+    return summary
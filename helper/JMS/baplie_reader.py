@@ -0,0 +1,204 @@
+"""
+BAPLIE Reader - Streaming reader for BAPLIE messages and JMS replies.
+
+Messages are parsed with ElementTree.iterparse and every container element is
+cleared as soon as it has been read, so a 100k-container message is checked in
+constant memory instead of loading the whole DOM. `diff_against_csv` compares
+what was sent (or echoed back in a reply) with the discharge CSV on
+ContainerNum / StowageCell_ISO.
+
+Usage:
+    from helper.JMS.baplie_reader import diff_against_csv, iter_containers
+    for record in iter_containers("reply.xml"):
+        record["ContainerNum"], record["StowageCell_ISO"]
+
+    diff = diff_against_csv(["chunk_0.xml", "chunk_1.xml"], "data/vessel_discharge_data.csv")
+    diff["ok"], diff["missing"], diff["mismatched"]
+
+    python -m helper.JMS.baplie_reader message.xml --csv data/vessel_discharge_data.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from helper.JMS.baplie_template import DYNAMIC_FIELDS
+
+Source = Union[str, Path, bytes, IO]
+
+RECORD_TAG = "EquipmentAndGoodsInfo"
+# Replies report a few leaf values (status, counts, errors); cap them so odd replies stay small
+MAX_REPLY_VALUES = 100
+
+
+def _open(source: Source) -> IO:
+    """Binary stream for a path, raw XML text/bytes or an open file."""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, str) and source.lstrip().startswith("<"):
+        return io.BytesIO(source.encode("utf-8"))
+    if isinstance(source, (str, Path)):
+        return open(source, "rb")
+    return source
+
+
+def iter_containers(source: Source, record_tag: str = RECORD_TAG,
+                    fields: Iterable[str] = DYNAMIC_FIELDS) -> Iterator[Dict[str, str]]:
+    """
+    Yield one {field: text} dict per `record_tag` element, in document order.
+
+    Args:
+        source: File path, XML text/bytes or binary file object
+        record_tag: Element holding one container
+        fields: Leaf tags collected from each record (missing or empty ones are "")
+    """
+    fields = tuple(fields)
+    wanted = set(fields)
+    stream = _open(source)
+    try:
+        # Open elements; a finished record is removed from its parent so memory stays flat
+        stack: List[ET.Element] = []
+        record: Dict[str, str] = {}
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            tag = elem.tag
+            if tag in wanted:
+                record[tag] = elem.text or ""
+            elif tag == record_tag:
+                yield {field: record.get(field, "") for field in fields}
+                record = {}
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def read_reply(source: Source, record_tag: str = RECORD_TAG) -> Dict[str, Any]:
+    """
+    Compact summary of a JMS reply.
+
+    Returns:
+        {"root": root tag, "values": {leaf tag: first text} outside container records,
+         "containers": number of container records}
+    """
+    stream = _open(source)
+    stack: List[ET.Element] = []
+    root_tag, values, containers, depth_in_record = None, {}, 0, 0
+    try:
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                root_tag = root_tag or elem.tag
+                stack.append(elem)
+                if elem.tag == record_tag:
+                    depth_in_record += 1
+                continue
+            stack.pop()
+            if elem.tag == record_tag:
+                depth_in_record -= 1
+                containers += 1
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+            elif not depth_in_record and len(elem) == 0 and elem.text and elem.text.strip():
+                if elem.tag not in values and len(values) < MAX_REPLY_VALUES:
+                    values[elem.tag] = elem.text.strip()
+    finally:
+        if stream is not source:
+            stream.close()
+    return {"root": root_tag, "values": values, "containers": containers}
+
+
+def load_csv_cells(csv_file: Union[str, Path]) -> Dict[str, str]:
+    """ContainerNum -> six-digit StowageCell_ISO for every CSV row with a container."""
+    cells: Dict[str, str] = {}
+    with open(csv_file, "r", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            container = (row.get("ContainerNum") or "").strip()
+            if container:
+                cells[container] = str(row["StowageCell_ISO"]).zfill(6)
+    return cells
+
+
+def diff_against_csv(sources: Union[Source, List[Source]], csv_file: Union[str, Path],
+                     record_tag: str = RECORD_TAG, limit: Optional[int] = 100) -> Dict[str, Any]:
+    """
+    Compare the containers in one or more messages with the discharge CSV.
+
+    Args:
+        sources: Message(s) to check, e.g. every chunk of a dispatched bay plan
+        csv_file: Discharge CSV the messages were generated from
+        limit: Report at most this many entries per list (counts are always complete)
+
+    Returns:
+        {"ok", "checked", "matched", "missing", "unexpected", "mismatched", "duplicates",
+         "counts": {...}}; mismatched entries are [ContainerNum, csv cell, message cell]
+    """
+    expected = load_csv_cells(csv_file)
+    seen: Counter = Counter()
+    counts: Counter = Counter()
+    found: Dict[str, List[Any]] = {"unexpected": [], "mismatched": []}
+
+    def note(kind: str, entry: Any) -> None:
+        counts[kind] += 1
+        if limit is None or len(found[kind]) < limit:
+            found[kind].append(entry)
+
+    if not isinstance(sources, list):
+        sources = [sources]
+    for source in sources:
+        for record in iter_containers(source, record_tag, ("ContainerNum", "StowageCell_ISO")):
+            container, cell = record["ContainerNum"].strip(), record["StowageCell_ISO"].zfill(6)
+            counts["checked"] += 1
+            seen[container] += 1
+            if container not in expected:
+                note("unexpected", container)
+            elif expected[container] != cell:
+                note("mismatched", [container, expected[container], cell])
+            else:
+                counts["matched"] += 1
+
+    missing = [container for container in expected if not seen[container]]
+    duplicates = [container for container, n in seen.items() if n > 1]
+    counts["missing"], counts["duplicates"] = len(missing), len(duplicates)
+    return {
+        "ok": not (counts["missing"] or counts["unexpected"] or counts["mismatched"] or counts["duplicates"]),
+        "checked": counts["checked"],
+        "matched": counts["matched"],
+        "missing": missing[:limit],
+        "unexpected": found["unexpected"],
+        "mismatched": found["mismatched"],
+        "duplicates": duplicates[:limit],
+        "counts": {kind: counts[kind] for kind in ("missing", "unexpected", "mismatched", "duplicates")},
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check BAPLIE messages or JMS replies against the discharge CSV")
+    parser.add_argument("messages", nargs="+", help="BAPLIE message or reply XML files")
+    parser.add_argument("--csv", default=None, help="Discharge CSV; without it only a reply summary is printed")
+    parser.add_argument("--record-tag", default=RECORD_TAG)
+    parser.add_argument("--limit", type=int, default=20, help="Entries listed per difference kind")
+    args = parser.parse_args(argv)
+
+    if args.csv is None:
+        for path in args.messages:
+            print(path, json.dumps(read_reply(path, args.record_tag)))
+        return 0
+
+    diff = diff_against_csv(args.messages, args.csv, args.record_tag, args.limit)
+    print(json.dumps(diff, indent=2))
+    return 0 if diff["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""
+BAPLIE Template - Pre-rendered BAPLIE messages.
+
+The envelope (InterchangeHeader, Header, Trailer, TransportInfoList) and the
+static per-container blocks (LocationId, Measurement, Dimension) are serialized
+once from the same ElementTree builders generate_message uses. Rendering then
+only escapes the five dynamic fields and joins strings, producing exactly the
+bytes generate_message would.
+
+Usage:
+    from helper.JMS.baplie_template import render_message
+    msg = render_message("data/vessel_discharge_data.csv")
+
+    template = BaplieTemplate()
+    for chunk in template.iter_render(rows, chunk_size=64 * 1024):
+        ...
+"""
+
+import csv
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from helper.JMS.generate_msg import DEFAULT_CHUNK_SIZE, _build_envelope, _build_equipment
+
+DYNAMIC_FIELDS = ("ContainerNum", "EquipmentSizeType", "FullEmptyInd", "PartyInfo_BIC", "StowageCell_ISO")
+_EMPTY_LIST = "<EquipmentAndGoodsInfoList />"
+# Placeholder text that cannot occur in XML output; \x00 is not a valid XML character
+_SLOT = re.compile(r"<(\w+)>\x00(\w+)\x00</\1>")
+
+
+def escape_text(value: Optional[str]) -> str:
+    """Escape element text the way ElementTree does (&, <, >)."""
+    if not value:
+        return ""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    return value
+
+
+class BaplieTemplate:
+    """Compiled BAPLIE message; build once, render many times."""
+
+    def __init__(self):
+        self.head, self.tail = ET.tostring(_build_envelope(), encoding="unicode").split(_EMPTY_LIST)
+
+        # Serialize one container with placeholder values, then cut it at the placeholders
+        placeholder = {field: f"\x00{field}\x00" for field in DYNAMIC_FIELDS}
+        equipment = ET.tostring(_build_equipment(placeholder), encoding="unicode")
+        # zfill(6) leaves the 17-character placeholder unchanged
+        self._fields: List[str] = []
+        self._tags: List[str] = []
+        pieces, last = [], 0
+        for match in _SLOT.finditer(equipment):
+            pieces.append(equipment[last:match.start()].replace("{", "{{").replace("}", "}}"))
+            pieces.append("{%d}" % len(self._fields))
+            self._tags.append(match.group(1))
+            self._fields.append(match.group(2))
+            last = match.end()
+        pieces.append(equipment[last:].replace("{", "{{").replace("}", "}}"))
+        if sorted(self._fields) != sorted(DYNAMIC_FIELDS):
+            raise RuntimeError(f"BAPLIE template expects fields {DYNAMIC_FIELDS}, found {self._fields}")
+        self._equipment_format = "".join(pieces).format
+
+    def render_equipment(self, row: Dict[str, str]) -> str:
+        """EquipmentAndGoodsInfo XML for one CSV row."""
+        values = []
+        for tag, field in zip(self._tags, self._fields):
+            value = row[field]
+            if field == "StowageCell_ISO":
+                value = str(value).zfill(6)
+            # ElementTree writes elements without text as <Tag />
+            values.append(f"<{tag}>{escape_text(value)}</{tag}>" if value else f"<{tag} />")
+        return self._equipment_format(*values)
+
+    def iter_render(self, rows: Iterable[Dict[str, str]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield the message for `rows` in chunks of about `chunk_size` characters."""
+        buffer, size = [self.head], len(self.head)
+        has_rows = False
+        for row in rows:
+            if not row["ContainerNum"].strip():
+                continue
+            if not has_rows:
+                buffer.append("<EquipmentAndGoodsInfoList>")
+                has_rows = True
+            piece = self.render_equipment(row)
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer, size = [], 0
+
+        buffer.append("</EquipmentAndGoodsInfoList>" if has_rows else _EMPTY_LIST)
+        buffer.append(self.tail)
+        yield "".join(buffer)
+
+    def render(self, rows: Iterable[Dict[str, str]]) -> str:
+        return "".join(self.iter_render(rows, chunk_size=1 << 62))
+
+
+_template: Optional[BaplieTemplate] = None
+
+
+def get_template() -> BaplieTemplate:
+    """Shared compiled template."""
+    global _template
+    if _template is None:
+        _template = BaplieTemplate()
+    return _template
+
+
+def render_message(csv_file) -> str:
+    """Drop-in replacement for generate_message."""
+    with open(csv_file, "r", encoding="utf-8-sig") as f:
+        return get_template().render(csv.DictReader(f))
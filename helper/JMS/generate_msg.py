@@ -1,5 +1,12 @@
 import csv
+import io
+import socket
 import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import IO, Iterator, Union
+
+# Characters collected before iter_message yields a chunk
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 def generate_message(csv_file):
     # Read the CSV file
@@ -7,6 +14,72 @@ def generate_message(csv_file):
         reader = csv.DictReader(f)
         rows = list(reader)
 
+    root = _build_envelope()
+    equipment_and_goods_info_list = root.find('MessageList/Message/EquipmentAndGoodsInfoList')
+    for row in rows:
+        if row['ContainerNum'].strip():
+            equipment_and_goods_info_list.append(_build_equipment(row))
+
+    # Convert to string
+    xml_str = ET.tostring(root, encoding='unicode')
+    return xml_str
+
+def iter_message(csv_file, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the same XML as generate_message in chunks of about `chunk_size` characters.
+
+    The CSV is read row by row and only one container element is built at a
+    time, so memory stays flat regardless of vessel size.
+    """
+    empty_list = '<EquipmentAndGoodsInfoList />'
+    head, tail = ET.tostring(_build_envelope(), encoding='unicode').split(empty_list)
+
+    buffer = [head]
+    size = len(head)
+    has_rows = False
+    with open(csv_file, 'r', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            if not row['ContainerNum'].strip():
+                continue
+            if not has_rows:
+                buffer.append('<EquipmentAndGoodsInfoList>')
+                has_rows = True
+            piece = ET.tostring(_build_equipment(row), encoding='unicode')
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+
+    buffer.append('</EquipmentAndGoodsInfoList>' if has_rows else empty_list)
+    buffer.append(tail)
+    yield ''.join(buffer)
+
+def write_message(csv_file, target: Union[str, Path, IO, socket.socket],
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Stream the message to a file path, an open text/binary file or a socket.
+
+    Returns:
+        Number of bytes written (UTF-8)
+    """
+    if isinstance(target, (str, Path)):
+        with open(target, 'wb') as f:
+            return write_message(csv_file, f, chunk_size)
+
+    written = 0
+    text_mode = isinstance(target, io.TextIOBase)
+    for chunk in iter_message(csv_file, chunk_size):
+        data = chunk.encode('utf-8')
+        written += len(data)
+        if hasattr(target, 'sendall'):
+            target.sendall(data)
+        else:
+            target.write(chunk if text_mode else data)
+    return written
+
+def _build_envelope() -> ET.Element:
+    """Static message with an empty EquipmentAndGoodsInfoList."""
     # Create the root element
     root = ET.Element('Interchange_Baplie')
 
@@ -68,47 +141,47 @@ def generate_message(csv_file):
     ET.SubElement(transport_id, 'TransportName').text = 'TSHM04'
 
     # Add EquipmentAndGoodsInfoList (dynamic)
-    equipment_and_goods_info_list = ET.SubElement(message, 'EquipmentAndGoodsInfoList')
-    for row in rows:
-        if row['ContainerNum'].strip():
-            equipment_and_goods_info = ET.SubElement(equipment_and_goods_info_list, 'EquipmentAndGoodsInfo')
-
-            # EquipmentInfoList
-            equipment_info_list = ET.SubElement(equipment_and_goods_info, 'EquipmentInfoList')
-            equipment_info = ET.SubElement(equipment_info_list, 'EquipmentInfo')
-            equipment_dtl = ET.SubElement(equipment_info, 'EquipmentDtl')
-            equipment_id = ET.SubElement(equipment_dtl, 'EquipmentId')
-            ET.SubElement(equipment_id, 'ContainerNum').text = row['ContainerNum']
-            ET.SubElement(equipment_dtl, 'EquipmentSizeType').text = row['EquipmentSizeType']
-            ET.SubElement(equipment_dtl, 'FullEmptyInd').text = row['FullEmptyInd']
-            name_and_address = ET.SubElement(equipment_info, 'NameAndAddress')
-            party_info = ET.SubElement(name_and_address, 'PartyInfo')
-            ET.SubElement(party_info, 'PartyInfo_BIC').text = row['PartyInfo_BIC']
-
-            # LocationId (static)
-            location_id = ET.SubElement(equipment_and_goods_info, 'LocationId')
-            location = ET.SubElement(location_id, 'Location')
-            location_zzz = ET.SubElement(location, 'Location_ZZZ')
-            ET.SubElement(location_zzz, 'DischargePort_ZZZ').text = 'EGAKI'
-            ET.SubElement(location_zzz, 'LoadingPort_ZZZ').text = 'SGSIN'
-
-            # Measurement (static)
-            measurement = ET.SubElement(equipment_and_goods_info, 'Measurement')
-            measurement_kgm = ET.SubElement(measurement, 'Measurement_KGM')
-            ET.SubElement(measurement_kgm, 'GrossWeight_KGM').text = '8256'
-            ET.SubElement(measurement_kgm, 'VgmIndicator').text = 'Y'
-
-            # Dimension (static)
-            dimension = ET.SubElement(equipment_and_goods_info, 'Dimension')
-            ET.SubElement(dimension, 'Dimension_CMT')
-
-            # StowageId (dynamic)
-            stowage_id = ET.SubElement(equipment_and_goods_info, 'StowageId')
-            ET.SubElement(stowage_id, 'StowageCell_ISO').text = str(row['StowageCell_ISO']).zfill(6)
+    ET.SubElement(message, 'EquipmentAndGoodsInfoList')
+    return root
 
-    # Convert to string
-    xml_str = ET.tostring(root, encoding='unicode')
-    return xml_str
+def _build_equipment(row) -> ET.Element:
+    """EquipmentAndGoodsInfo for one CSV row."""
+    equipment_and_goods_info = ET.Element('EquipmentAndGoodsInfo')
+
+    # EquipmentInfoList
+    equipment_info_list = ET.SubElement(equipment_and_goods_info, 'EquipmentInfoList')
+    equipment_info = ET.SubElement(equipment_info_list, 'EquipmentInfo')
+    equipment_dtl = ET.SubElement(equipment_info, 'EquipmentDtl')
+    equipment_id = ET.SubElement(equipment_dtl, 'EquipmentId')
+    ET.SubElement(equipment_id, 'ContainerNum').text = row['ContainerNum']
+    ET.SubElement(equipment_dtl, 'EquipmentSizeType').text = row['EquipmentSizeType']
+    ET.SubElement(equipment_dtl, 'FullEmptyInd').text = row['FullEmptyInd']
+    name_and_address = ET.SubElement(equipment_info, 'NameAndAddress')
+    party_info = ET.SubElement(name_and_address, 'PartyInfo')
+    ET.SubElement(party_info, 'PartyInfo_BIC').text = row['PartyInfo_BIC']
+
+    # LocationId (static)
+    location_id = ET.SubElement(equipment_and_goods_info, 'LocationId')
+    location = ET.SubElement(location_id, 'Location')
+    location_zzz = ET.SubElement(location, 'Location_ZZZ')
+    ET.SubElement(location_zzz, 'DischargePort_ZZZ').text = 'EGAKI'
+    ET.SubElement(location_zzz, 'LoadingPort_ZZZ').text = 'SGSIN'
+
+    # Measurement (static)
+    measurement = ET.SubElement(equipment_and_goods_info, 'Measurement')
+    measurement_kgm = ET.SubElement(measurement, 'Measurement_KGM')
+    ET.SubElement(measurement_kgm, 'GrossWeight_KGM').text = '8256'
+    ET.SubElement(measurement_kgm, 'VgmIndicator').text = 'Y'
+
+    # Dimension (static)
+    dimension = ET.SubElement(equipment_and_goods_info, 'Dimension')
+    ET.SubElement(dimension, 'Dimension_CMT')
+
+    # StowageId (dynamic)
+    stowage_id = ET.SubElement(equipment_and_goods_info, 'StowageId')
+    ET.SubElement(stowage_id, 'StowageCell_ISO').text = str(row['StowageCell_ISO']).zfill(6)
+
+    return equipment_and_goods_info
 
 # Example usage
 # message = generate_message('dc_data.csv')
@@ -0,0 +1,147 @@
+"""
+JVM - Lazy JVM startup and Java class loading for the JMS helpers.
+
+Nothing here touches Java at import time: the JVM is started and the JMS
+classes are resolved on first use (the first real send), so importing
+helper.JMS.baplie or helper.JMS.send_msg stays cheap for test collection
+and non-JMS runs. Call `warm_up()` to pay the startup cost up front instead.
+
+Usage:
+    from helper.JMS.jvm import java_classes, warm_up
+    warm_up()                          # optional, e.g. before a timed section
+    java = java_classes()
+    table = java.Hashtable()
+
+    python -m helper.JMS.jvm           # print JVM startup and class loading time
+"""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+from helper.logger import logger
+
+JMS_DIR = os.path.dirname(__file__)
+WEBLOGIC_JAR = os.path.join(JMS_DIR, "weblogic-wlthint3client-12.2.1.4.jar")
+JAVA_HOME_CANDIDATES = [
+    "C:\\Program Files\\Java\\jre-1.8",
+    "C:\\Program Files\\Java\\jdk-1.8",
+    "C:\\Program Files\\Java\\latest\\jre-1.8\\bin",
+]
+JAVA_CLASSES = {
+    "Context": "javax.naming.Context",
+    "InitialContext": "javax.naming.InitialContext",
+    "ConnectionFactory": "javax.jms.ConnectionFactory",
+    "QueueConnection": "javax.jms.QueueConnection",
+    "QueueConnectionFactory": "javax.jms.QueueConnectionFactory",
+    "QueueRequestor": "javax.jms.QueueRequestor",
+    "Queue": "javax.jms.Queue",
+    "Hashtable": "java.util.Hashtable",
+    "StringClass": "java.lang.String",
+}
+
+_lock = threading.Lock()
+_classes: Optional[SimpleNamespace] = None
+
+
+def classpath() -> List[str]:
+    return [WEBLOGIC_JAR]
+
+
+def ensure_java_home() -> str:
+    """
+    Set JAVA_HOME from the known install locations when it is not set.
+
+    Raises:
+        EnvironmentError: If JAVA_HOME is unset and no Java installation is found
+    """
+    java_home = os.environ.get("JAVA_HOME", "")
+    if java_home:
+        return java_home
+    for candidate in JAVA_HOME_CANDIDATES:
+        if os.path.exists(candidate):
+            os.environ["JAVA_HOME"] = candidate
+            return candidate
+    raise EnvironmentError("JAVA_HOME not set and no valid Java installation found")
+
+
+def is_started() -> bool:
+    try:
+        import jpype
+    except ImportError:
+        return False
+    return jpype.isJVMStarted()
+
+
+def start_jvm() -> None:
+    """
+    Start the JVM with the WebLogic client on the classpath (no-op if running).
+
+    Raises:
+        EnvironmentError: If no Java installation is found
+        RuntimeError: If jpype is missing or the JVM fails to start
+    """
+    try:
+        import jpype
+        import jpype.imports  # noqa: F401  (enables `import javax...` style imports)
+    except ImportError as e:
+        raise RuntimeError(f"jpype is required for JMS messaging: {e}")
+
+    with _lock:
+        if jpype.isJVMStarted():
+            return
+        ensure_java_home()
+        start = time.perf_counter()
+        try:
+            jpype.startJVM(classpath=classpath())
+        except Exception as e:
+            raise RuntimeError(f"Failed to start JVM: {e}")
+        logger.info("Started JVM in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+def java_classes() -> SimpleNamespace:
+    """
+    JMS and JNDI classes by short name, loaded once (starts the JVM if needed).
+
+    Raises:
+        RuntimeError: If the JVM cannot start or a class cannot be loaded
+    """
+    global _classes
+    if _classes is not None:
+        return _classes
+    start_jvm()
+    import jpype
+
+    with _lock:
+        if _classes is None:
+            try:
+                _classes = SimpleNamespace(**{name: jpype.JClass(path) for name, path in JAVA_CLASSES.items()})
+            except Exception as e:
+                raise RuntimeError(f"Failed to load Java classes: {e}")
+    return _classes
+
+
+def warm_up() -> float:
+    """
+    Start the JVM and load the JMS classes now rather than on the first send.
+
+    Returns:
+        Elapsed time in ms (close to 0 when already warm)
+    """
+    start = time.perf_counter()
+    java_classes()
+    return (time.perf_counter() - start) * 1000
+
+
+def shutdown_jvm() -> None:
+    global _classes
+    if is_started():
+        import jpype
+        jpype.shutdownJVM()
+    _classes = None
+
+
+if __name__ == "__main__":
+    print(f"JVM warm-up: {warm_up():.0f} ms")
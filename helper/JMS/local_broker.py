@@ -0,0 +1,346 @@
+"""
+Local Broker - Stand-in message brokers for offline load tests and benchmarks.
+
+Three brokers answer every message with `handler(queue, message)` (by default
+an acknowledgement with the byte and container counts):
+
+    MemoryBroker   in-process, used by memory:// provider URLs
+    SocketBroker   TCP with length-prefixed frames, used by tcp:// provider URLs
+    SpoolBroker    directory of message/reply files, used by spool:// provider URLs
+
+The socket and spool brokers can run as a separate process, so throughput and
+latency of the messaging path can be measured on a plain Linux box.
+
+Spool layout (one folder per queue):
+    <root>/<queue>/QUEUE            original queue name
+    <root>/<queue>/in/<id>.msg      messages, written atomically by the producer
+    <root>/<queue>/out/<id>.msg     replies (<id>.err when the handler failed)
+
+Usage:
+    python -m helper.JMS.local_broker tcp --port 61616
+    python -m helper.JMS.local_broker spool tests/test-results/spool --latency-ms 5
+"""
+
+import argparse
+import inspect
+import json
+import os
+import re
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from helper.logger import logger
+
+Handler = Callable[[str, str], str]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 61616
+DEFAULT_WORKERS = 4
+DEFAULT_POLL_INTERVAL = 0.02  # seconds
+KEEP_MESSAGES = 1000  # per queue
+QUEUE_FILE = "QUEUE"
+
+# header length, body length
+_FRAME = struct.Struct(">II")
+
+
+def ack_reply(queue: str, message: str) -> str:
+    """Default reply: status, message size and number of BAPLIE containers."""
+    return (f"<Reply><Queue>{escape(queue)}</Queue><Status>OK</Status>"
+            f"<Bytes>{len(message.encode('utf-8'))}</Bytes>"
+            f"<Containers>{message.count('<EquipmentAndGoodsInfo>')}</Containers></Reply>")
+
+
+def write_frame(sock: socket.socket, header: dict, body: str) -> None:
+    head = json.dumps(header).encode("utf-8")
+    data = body.encode("utf-8")
+    sock.sendall(_FRAME.pack(len(head), len(data)) + head + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            if received == 0:
+                return None
+            raise ConnectionError("Connection closed in the middle of a frame")
+        received += n
+    return bytes(buffer)
+
+
+def read_frame(sock: socket.socket) -> Optional[Tuple[dict, str]]:
+    """
+    Next (header, body) from the socket.
+
+    Returns:
+        None when the peer closed the connection between frames
+    """
+    sizes = _recv_exact(sock, _FRAME.size)
+    if sizes is None:
+        return None
+    head_size, body_size = _FRAME.unpack(sizes)
+    head = _recv_exact(sock, head_size) if head_size else b"{}"
+    body = _recv_exact(sock, body_size) if body_size else b""
+    if head is None or body is None:
+        raise ConnectionError("Connection closed in the middle of a frame")
+    return json.loads(head), body.decode("utf-8")
+
+
+def spool_dir(root: Union[str, Path], queue: str) -> Path:
+    """Folder for `queue` under a spool root ("jms/sp/Inbound" -> <root>/jms_sp_Inbound)."""
+    return Path(root) / re.sub(r"[^\w.-]", "_", queue)
+
+
+class Broker:
+    """Shared bookkeeping: runs the handler and keeps the latest messages per queue."""
+
+    def __init__(self, handler: Handler = ack_reply, latency_ms: float = 0.0, keep: int = KEEP_MESSAGES,
+                 per_container_ms: float = 0.0):
+        """
+        Args:
+            handler: handler(queue, message) -> reply body
+            latency_ms: Simulated processing time per message
+            keep: Messages kept per queue in `received`
+            per_container_ms: Simulated processing time per BAPLIE container in a message
+        """
+        self.handler = handler
+        self.latency = latency_ms / 1000
+        self.per_container = per_container_ms / 1000
+        self.received: Dict[str, Deque[str]] = defaultdict(lambda: deque(maxlen=keep))
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def handle(self, queue: str, message: str) -> str:
+        delay = self.latency
+        if self.per_container:
+            delay += self.per_container * message.count("<EquipmentAndGoodsInfo>")
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.received[queue].append(message)
+            self.counts[queue] += 1
+        return self.handler(queue, message)
+
+
+class MemoryBroker(Broker):
+    """In-process broker; messages are handled on a small thread pool."""
+
+    def __init__(self, handler: Handler = ack_reply, latency_ms: float = 0.0, keep: int = KEEP_MESSAGES,
+                 per_container_ms: float = 0.0, workers: int = DEFAULT_WORKERS):
+        super().__init__(handler, latency_ms, keep, per_container_ms)
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, queue: str, message: str) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="memory-broker")
+        return self._pool.submit(self.handle, queue, message)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+_memory_brokers: Dict[str, MemoryBroker] = {}
+_memory_lock = threading.Lock()
+
+
+def get_memory_broker(name: str = "default", **options) -> MemoryBroker:
+    """
+    Named in-process broker, created with `options` on first use.
+
+    Raises:
+        ValueError: If the broker already exists with different options
+            (call reset_memory_broker first to change them)
+    """
+    with _memory_lock:
+        broker = _memory_brokers.get(name)
+        if broker is None:
+            broker = _memory_brokers[name] = MemoryBroker(**options)
+            bound = inspect.signature(MemoryBroker).bind(**options)
+            bound.apply_defaults()
+            broker.options = dict(bound.arguments)
+            return broker
+        changed = {key: value for key, value in options.items() if broker.options.get(key) != value}
+        if changed:
+            existing = {key: broker.options.get(key) for key in changed}
+            raise ValueError(f"Memory broker '{name}' already exists with {existing}, not {changed}; "
+                             f"reset_memory_broker('{name}') first")
+        return broker
+
+
+def reset_memory_broker(name: str = "default") -> None:
+    """Forget a named broker (its received messages and counters)."""
+    with _memory_lock:
+        broker = _memory_brokers.pop(name, None)
+    if broker is not None:
+        broker.close()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _FrameHandler(socketserver.BaseRequestHandler):
+    """One connection: frames are answered in order."""
+
+    def handle(self):
+        broker: SocketBroker = self.server.broker
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                frame = read_frame(self.request)
+                if frame is None:
+                    return
+                header, body = frame
+                try:
+                    reply, extra = broker.handle(header.get("queue", ""), body), {}
+                except Exception as e:
+                    reply, extra = "", {"error": f"{type(e).__name__}: {e}"}
+                write_frame(self.request, {"id": header.get("id"), **extra}, reply)
+        except OSError as e:
+            logger.debug("Broker connection from %s closed: %s", self.client_address, e)
+
+
+class SocketBroker(Broker):
+    """TCP broker; one thread per client connection."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, handler: Handler = ack_reply,
+                 latency_ms: float = 0.0, keep: int = KEEP_MESSAGES, per_container_ms: float = 0.0):
+        super().__init__(handler, latency_ms, keep, per_container_ms)
+        self.server = _TCPServer((host, port), _FrameHandler)
+        self.server.broker = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"tcp://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self.server.serve_forever(poll_interval=0.1)
+
+    def start(self) -> "SocketBroker":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="socket-broker", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+
+class SpoolBroker(Broker):
+    """Directory broker; polls every queue folder under `root` for new messages."""
+
+    def __init__(self, root: Union[str, Path], handler: Handler = ack_reply, latency_ms: float = 0.0,
+                 keep: int = KEEP_MESSAGES, per_container_ms: float = 0.0,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        super().__init__(handler, latency_ms, keep, per_container_ms)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"spool://{self.root.as_posix()}"
+
+    def run_once(self) -> int:
+        """Answer every waiting message; returns how many were handled."""
+        handled = 0
+        for queue_dir in self.root.iterdir():
+            inbox = queue_dir / "in"
+            if not inbox.is_dir():
+                continue
+            queue_file = queue_dir / QUEUE_FILE
+            queue = queue_file.read_text(encoding="utf-8") if queue_file.exists() else queue_dir.name
+            outbox = queue_dir / "out"
+            outbox.mkdir(exist_ok=True)
+            for path in sorted(inbox.glob("*.msg")):
+                message = path.read_text(encoding="utf-8")
+                try:
+                    reply, suffix = self.handle(queue, message), ".msg"
+                except Exception as e:
+                    reply, suffix = f"{type(e).__name__}: {e}", ".err"
+                tmp = outbox / f"{path.stem}.tmp"
+                tmp.write_text(reply, encoding="utf-8")
+                os.replace(tmp, outbox / f"{path.stem}{suffix}")
+                path.unlink()
+                handled += 1
+        return handled
+
+    def serve_forever(self) -> None:
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> "SpoolBroker":
+        """Poll from a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.serve_forever, name="spool-broker", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv: Optional[list] = None) -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--latency-ms", type=float, default=0.0, help="Simulated processing time per message")
+    common.add_argument("--per-container-ms", type=float, default=0.0,
+                        help="Simulated processing time per BAPLIE container")
+    parser = argparse.ArgumentParser(description="Run a local stand-in message broker")
+    sub = parser.add_subparsers(dest="kind", required=True)
+    tcp = sub.add_parser("tcp", parents=[common], help="Serve tcp:// producers")
+    tcp.add_argument("--host", default=DEFAULT_HOST)
+    tcp.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    spool = sub.add_parser("spool", parents=[common], help="Serve spool:// producers")
+    spool.add_argument("root", help="Spool directory")
+    spool.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    args = parser.parse_args(argv)
+
+    if args.kind == "tcp":
+        broker = SocketBroker(args.host, args.port, latency_ms=args.latency_ms,
+                              per_container_ms=args.per_container_ms)
+    else:
+        broker = SpoolBroker(args.root, latency_ms=args.latency_ms, per_container_ms=args.per_container_ms,
+                             poll_interval=args.poll_interval)
+    # First line of output is the provider URL, so scripts can start the broker with port 0
+    print(broker.url, flush=True)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.close()
+        logger.info("Broker handled %s", dict(broker.counts))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
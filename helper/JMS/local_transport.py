@@ -0,0 +1,236 @@
+"""
+Local Transport - Producer transports for the stand-in brokers in local_broker.
+
+    memory://<name>[?latency_ms=5]    MemoryTransport  (named in-process MemoryBroker)
+    tcp://host:port                   SocketTransport  (SocketBroker, pooled connections)
+    spool://<directory>               SpoolTransport   (SpoolBroker)
+
+memory:// URLs also accept per_container_ms to simulate size-dependent processing.
+
+Usage:
+    from helper.JMS.send_msg import Producer
+    with Producer("tcp://127.0.0.1:61616", "jms/sp/InboundBayplanQueue") as producer:
+        replies = producer.send_many(messages)
+"""
+
+import itertools
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from helper.JMS.local_broker import (DEFAULT_POLL_INTERVAL, QUEUE_FILE, get_memory_broker, read_frame,
+                                     spool_dir, write_frame)
+from helper.JMS.transport import (DEFAULT_POOL_SIZE, DEFAULT_REPLY_TIMEOUT, DEFAULT_RETRIES, PendingReplies,
+                                  Transport, new_correlation_id, url_options)
+from helper.logger import logger
+
+EXPIRE_INTERVAL = 0.1  # seconds between timeout checks
+# Seconds a late spool reply for a timed-out request is still deleted when it shows up
+LATE_REPLY_TTL = 300.0
+
+
+class MemoryTransport(Transport):
+    """Hands messages to a named in-process broker; `timeout` is not enforced."""
+
+    def __init__(self, provider_url: str, queue: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES):
+        super().__init__(provider_url, queue, pool_size, retries)
+        options = url_options(provider_url)
+        self.broker = get_memory_broker(urlsplit(provider_url).netloc or "default",
+                                        latency_ms=float(options.get("latency_ms", 0)),
+                                        per_container_ms=float(options.get("per_container_ms", 0)))
+
+    def send_async(self, message: str, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> Future:
+        future = self.broker.submit(self.queue, message)
+        future.correlation_id = new_correlation_id()
+        return future
+
+
+class _Connection:
+    """One broker socket; a reader thread resolves replies by correlation ID."""
+
+    def __init__(self, address):
+        self.sock = socket.create_connection(address)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.pending = PendingReplies()
+        self.alive = True
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_replies, name="broker-reply-reader", daemon=True)
+        self._reader.start()
+
+    def send(self, header: dict, body: str) -> None:
+        with self._send_lock:
+            write_frame(self.sock, header, body)
+
+    def _read_replies(self) -> None:
+        error: Exception = ConnectionError("Broker closed the connection")
+        try:
+            while True:
+                frame = read_frame(self.sock)
+                if frame is None:
+                    break
+                header, body = frame
+                if "error" in header:
+                    self.pending.fail(header["id"], RuntimeError(f"Broker failed: {header['error']}"))
+                else:
+                    self.pending.resolve(header["id"], body)
+        except OSError as e:
+            error = ConnectionError(f"Broker connection failed: {e}")
+        self.alive = False
+        self.pending.fail_all(error)
+
+    def close(self) -> None:
+        self.alive = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class SocketTransport(Transport):
+    """Length-prefixed frames over up to `pool_size` pipelined connections."""
+
+    def __init__(self, provider_url: str, queue: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES):
+        super().__init__(provider_url, queue, pool_size, retries)
+        parts = urlsplit(provider_url)
+        self.address = (parts.hostname, parts.port)
+        self._lock = threading.Lock()
+        self._connections: List[_Connection] = []
+        self._next = itertools.count()
+        self._closed = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def _connection(self) -> _Connection:
+        """Open connections up to the pool size, then rotate over them."""
+        with self._lock:
+            self._connections = [c for c in self._connections if c.alive]
+            if len(self._connections) < self.pool_size:
+                self._connections.append(_Connection(self.address))
+            if self._sweeper is None:
+                self._closed.clear()
+                self._sweeper = threading.Thread(target=self._expire_loop, name="broker-timeouts", daemon=True)
+                self._sweeper.start()
+            return self._connections[next(self._next) % len(self._connections)]
+
+    def _expire_loop(self) -> None:
+        while not self._closed.wait(EXPIRE_INTERVAL):
+            with self._lock:
+                connections = list(self._connections)
+            for connection in connections:
+                connection.pending.expire()
+
+    def send_async(self, message: str, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> Future:
+        key = new_correlation_id()
+        for attempt in range(self.retries + 1):
+            connection = None
+            try:
+                connection = self._connection()
+                future = connection.pending.add(key, timeout)
+                connection.send({"id": key, "queue": self.queue}, message)
+                return future
+            except OSError as e:
+                if connection is not None:
+                    connection.pending.discard(key)
+                    connection.close()
+                if attempt == self.retries:
+                    raise ConnectionError(f"Cannot send to {self.provider_url}: {e}") from e
+                logger.warning("Broker send failed (%s), reconnecting (attempt %d/%d)", e, attempt + 1, self.retries)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+            sweeper, self._sweeper = self._sweeper, None
+        self._closed.set()
+        for connection in connections:
+            connection.close()
+        if sweeper is not None:
+            sweeper.join()
+
+
+class SpoolTransport(Transport):
+    """Writes messages into a spool directory and polls for the reply files."""
+
+    def __init__(self, provider_url: str, queue: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        super().__init__(provider_url, queue, pool_size, retries)
+        parts = urlsplit(provider_url)
+        self.directory = spool_dir(parts.netloc + parts.path, queue)
+        self.inbox, self.outbox = self.directory / "in", self.directory / "out"
+        self.inbox.mkdir(parents=True, exist_ok=True)
+        self.outbox.mkdir(parents=True, exist_ok=True)
+        (self.directory / QUEUE_FILE).write_text(queue, encoding="utf-8")
+        self.poll_interval = float(url_options(provider_url).get("poll_interval", poll_interval))
+        self.pending = PendingReplies()
+        # Timed-out keys -> when to stop waiting for their late reply files
+        self._expired: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+
+    def send_async(self, message: str, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> Future:
+        key = new_correlation_id()
+        future = self.pending.add(key, timeout)
+        tmp = self.inbox / f"{key}.tmp"
+        try:
+            tmp.write_text(message, encoding="utf-8")
+            os.replace(tmp, self.inbox / f"{key}.msg")
+        except OSError:
+            self.pending.discard(key)
+            raise
+        with self._lock:
+            if self._poller is None:
+                self._closed.clear()
+                self._poller = threading.Thread(target=self._poll_replies, name="spool-replies", daemon=True)
+                self._poller.start()
+        return future
+
+    def _collect(self, path: Path) -> None:
+        key, suffix = path.stem, path.suffix
+        try:
+            body = path.read_text(encoding="utf-8")
+            path.unlink()
+        except OSError as e:
+            self.pending.fail(key, ConnectionError(f"Cannot read reply {path}: {e}"))
+            return
+        if suffix == ".err":
+            self.pending.fail(key, RuntimeError(f"Broker failed: {body}"))
+        else:
+            self.pending.resolve(key, body)
+
+    def _poll_replies(self) -> None:
+        while not self._closed.is_set():
+            if len(self.pending) or self._expired:
+                waiting = set(self.pending.keys())
+                with os.scandir(self.outbox) as entries:
+                    # Replies for other producers sharing the spool are left alone
+                    ready = [Path(entry.path) for entry in entries
+                             if entry.name.endswith((".msg", ".err"))
+                             and (entry.name[:-4] in waiting or entry.name[:-4] in self._expired)]
+                for path in ready:
+                    if path.stem in self._expired:
+                        # Nobody waits for this reply any more
+                        self._expired.pop(path.stem)
+                        path.unlink(missing_ok=True)
+                    else:
+                        self._collect(path)
+                now = time.monotonic()
+                for key in self.pending.expire():
+                    self._expired[key] = now + LATE_REPLY_TTL
+                for key in [key for key, until in self._expired.items() if until <= now]:
+                    del self._expired[key]
+            self._closed.wait(self.poll_interval)
+
+    def close(self) -> None:
+        with self._lock:
+            poller, self._poller = self._poller, None
+        self._closed.set()
+        if poller is not None:
+            poller.join()
+        self.pending.fail_all(ConnectionError(f"Spool transport for {self.directory} was closed"))
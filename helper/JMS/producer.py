@@ -1,37 +1,10 @@
 import os
 import time
 
-cur_dir = os.path.dirname(__file__)
-os.environ["CLASSPATH"] = os.path.join(cur_dir, "weblogic-wlthint3client-12.2.1.4.jar")
-
-if not os.environ.get("JAVA_HOME", ""):
-    for java_home in [
-        "C:\\Program Files\\Java\\jre-1.8",
-        "C:\\Program Files\\Java\\jdk-1.8",
-        "C:\\Program Files\\Java\\latest\\jre-1.8\\bin",
-    ]:
-        if os.path.exists(java_home):
-            os.environ["JAVA_HOME"] = java_home
-
-# from bs4 import BeautifulSoup
-import jpype.imports
+from helper.JMS.jvm import java_classes
 
 
 class Producer:
-    # Load necessary Java classes
-    try:
-        Context = jpype.JClass("javax.naming.Context")
-        InitialContext = jpype.JClass("javax.naming.InitialContext")
-        ConnectionFactory = jpype.JClass("javax.jms.ConnectionFactory")
-        QueueConnection = jpype.JClass("javax.jms.QueueConnection")
-        QueueConnectionFactory = jpype.JClass("javax.jms.QueueConnectionFactory")
-        QueueRequestor = jpype.JClass("javax.jms.QueueRequestor")
-        Queue = jpype.JClass("javax.jms.Queue")
-        Hashtable = jpype.JClass("java.util.Hashtable")
-        StringClass = jpype.JClass("java.lang.String")
-    except Exception as e:
-        raise RuntimeError(f"Failed to load Java classes: {e}")
-
     def __init__(self, provider_url, queue) -> None:
         """_summary_
 
@@ -40,14 +13,18 @@ class Producer:
             # hpukiut1-mvp-l01.hphit.hutchisonports.com:30152
             queue (str): _description_
         """
-        hash_table = self.Hashtable()
+        # Starts the JVM and loads the Java classes on first use
+        java = java_classes()
+        self.QueueRequestor = java.QueueRequestor
+        self.StringClass = java.StringClass
+        hash_table = java.Hashtable()
         hash_table.put(
-            self.Context.INITIAL_CONTEXT_FACTORY,
+            java.Context.INITIAL_CONTEXT_FACTORY,
             "weblogic.jndi.WLInitialContextFactory",
         )
-        hash_table.put(self.Context.PROVIDER_URL, provider_url)
+        hash_table.put(java.Context.PROVIDER_URL, provider_url)
         self.queue = queue
-        self.context = self.InitialContext(hash_table)  # properties
+        self.context = java.InitialContext(hash_table)  # properties
         self.connection_factory = self.context.lookup("weblogic/jms/ConnectionFactory")
 
     def send_message(self, str_message):
@@ -1,101 +1,68 @@
 import os
-import time
+import tempfile
+from concurrent.futures import Future
 from pathlib import Path
+from typing import List, Optional
 
-import jpype.imports
-
+from helper.JMS.baplie_dispatch import DEFAULT_CHUNK_BAYS, DEFAULT_CHUNK_CONTAINERS, dispatch_bay_plan
 from helper.JMS.generate_msg import generate_message
+from helper.JMS.jvm import shutdown_jvm
+from helper.JMS.transport import DEFAULT_POOL_SIZE, DEFAULT_REPLY_TIMEOUT, DEFAULT_RETRIES, create_transport
 
-# Set up JVM and classpath
-cur_dir = os.path.dirname(__file__)
-weblogic_jar = os.path.join(cur_dir, "weblogic-wlthint3client-12.2.1.4.jar")
-# jms_api_jar = os.path.join(cur_dir, "javax.jms-api-2.0.1.jar")  # Optional, add if needed
-
-classpath = [weblogic_jar]
-# if os.path.exists(jms_api_jar):
-#     classpath.append(jms_api_jar)
-
-# Verify JARs exist
-# for jar in classpath:
-#     if not os.path.exists(jar):
-#         raise FileNotFoundError(f"JAR file not found: {jar}")
-
-# Set JAVA_HOME
-if not os.environ.get("JAVA_HOME", ""):
-    for java_home in [
-        "C:\\Program Files\\Java\\jre-1.8",
-        "C:\\Program Files\\Java\\jdk-1.8",
-        "C:\\Program Files\\Java\\latest\\jre-1.8\\bin",
-    ]:
-        if os.path.exists(java_home):
-            os.environ["JAVA_HOME"] = java_home
-            break
-    else:
-        raise EnvironmentError("JAVA_HOME not set and no valid Java installation found")
-
-# Start JVM
-if not jpype.isJVMStarted():
-    try:
-        jpype.startJVM(classpath=classpath)
-    except Exception as e:
-        raise RuntimeError(f"Failed to start JVM: {e}")
-
-# Import Java classes
-try:
-    Context = jpype.JClass("javax.naming.Context")
-    InitialContext = jpype.JClass("javax.naming.InitialContext")
-    ConnectionFactory = jpype.JClass("javax.jms.ConnectionFactory")
-    QueueConnection = jpype.JClass("javax.jms.QueueConnection")
-    QueueConnectionFactory = jpype.JClass("javax.jms.QueueConnectionFactory")
-    QueueRequestor = jpype.JClass("javax.jms.QueueRequestor")
-    Queue = jpype.JClass("javax.jms.Queue")
-    Hashtable = jpype.JClass("java.util.Hashtable")
-    StringClass = jpype.JClass("java.lang.String")
-except Exception as e:
-    raise RuntimeError(f"Failed to load Java classes: {e}")
 
 class Producer:
-    def __init__(self, provider_url, queue) -> None:
+    """Sends text messages through the transport selected by the provider URL scheme."""
+
+    def __init__(self, provider_url, queue, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES, **options) -> None:
         """Initialize JMS Producer.
 
         Args:
-            provider_url (str): e.g., 't3://172.18.51.21:25910'
+            provider_url (str): e.g., 't3://172.18.51.21:25910', 'memory://bench',
+                'tcp://127.0.0.1:61616' or 'spool://tests/test-results/spool'
             queue (str): JMS queue name
+            pool_size (int): Maximum sessions or connections kept open for concurrent senders
+            retries (int): Reconnect and resend this many times when the broker connection fails
         """
-        hash_table = Hashtable()
-        hash_table.put(Context.INITIAL_CONTEXT_FACTORY, "weblogic.jndi.WLInitialContextFactory")
-        hash_table.put(Context.PROVIDER_URL, provider_url)
+        self.provider_url = provider_url
         self.queue = queue
-        self.context = InitialContext(hash_table)
-        self.connection_factory = self.context.lookup("weblogic/jms/ConnectionFactory")
+        self.transport = create_transport(provider_url, queue, pool_size=pool_size, retries=retries, **options)
+        self.last_dispatch = None
 
-    def send_message(self, str_message):
-        connection = self.connection_factory.createQueueConnection()
-        session = connection.createQueueSession(False, 1)
-        queue = self.context.lookup(self.queue)
-        queue_requestor = QueueRequestor(session, queue)
-        connection.start()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Close the transport; the next send reconnects."""
+        self.transport.close()
+
+    def request(self, str_message) -> str:
+        """Send a text message and return the reply body."""
+        return self.transport.request(str_message)
 
-        message = session.createTextMessage()
-        message.setStringProperty("handler", "messaging.handler.SimpleHandler")
-        message.setText(str_message)
+    def send_async(self, str_message, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> Future:
+        """Send without waiting; the future resolves with the reply body."""
+        return self.transport.send_async(str_message, timeout)
 
-        simple_reply = queue_requestor.request(message)
+    def send_many(self, messages: List[str], timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> List[str]:
+        """Send all messages concurrently and return the reply bodies in input order."""
+        return self.transport.send_many(messages, timeout)
 
-        reply_id = simple_reply.getJMSCorrelationID()
-        body = str(simple_reply.getBody(StringClass))
-        print(reply_id)
+    def send_message(self, str_message):
+        body = self.request(str_message)
         print(body)
 
-        # Save reply to file
-        temp_dir = os.getenv("LOCALAPPDATA", "") + "\\Temp"
+        # Save reply to %LOCALAPPDATA%\Temp on Windows, the system temp directory elsewhere
+        local_app_data = os.getenv("LOCALAPPDATA")
+        temp_dir = os.path.join(local_app_data, "Temp") if local_app_data else tempfile.gettempdir()
         print(temp_dir)
         os.makedirs(temp_dir, exist_ok=True)
         with open(os.path.join(temp_dir, "reply.xml"), "w") as f:
             f.write(body)
-
-        session.close()
-        connection.close()
+        return body
 
     def send_jms_msg(self, file_path) -> bool:
         with open(file_path, "r", encoding="UTF-8") as file:
@@ -103,12 +70,17 @@ class Producer:
         self.send_message(msg)
         print(f"jms queue: {self.queue}")
         print(f"message: {msg}")
-        time.sleep(5)
         print(f"Done {file_path}")
         return True
 
-    def send_bay_plan_message(self, data_path: str = "data/vessel_discharge_data.csv") -> bool:
-        """Send bay plan message using vessel discharge data"""
+    def send_bay_plan_message(self, data_path: str = "data/vessel_discharge_data.csv",
+                              max_containers: int = DEFAULT_CHUNK_CONTAINERS,
+                              bays_per_chunk: int = DEFAULT_CHUNK_BAYS) -> bool:
+        """
+        Send bay plan message using vessel discharge data.
+        With a chunk limit the plan goes out as concurrent chunk messages (see baplie_dispatch);
+        the merged result is kept in `last_dispatch`.
+        """
         try:
             # Handle both absolute and relative paths
             data_file_path = Path(data_path)
@@ -120,6 +92,13 @@ class Producer:
             if not data_file_path.exists():
                 raise FileNotFoundError(f"Data file not found: {data_file_path}")
                 
+            if max_containers or bays_per_chunk:
+                self.last_dispatch = dispatch_bay_plan(self, data_file_path, max_containers, bays_per_chunk,
+                                                       max_in_flight=self.transport.pool_size)
+                print(f"Bay plan sent to queue {self.queue} in {len(self.last_dispatch['chunks'])} chunks, "
+                      f"{self.last_dispatch['failed']} failed")
+                return not self.last_dispatch["failed"]
+
             msg = generate_message(data_file_path)
             self.send_message(msg)
             print(f"Bay plan message sent to queue: {self.queue}")
@@ -129,6 +108,7 @@ class Producer:
             return False
 
 if __name__ == "__main__":
+    producer = None
     try:
         producer = Producer(
             "t3://172.18.51.25:20212",
@@ -144,6 +124,6 @@ if __name__ == "__main__":
         # print(f"{msg}")
         print("Done")
     finally:
-        if jpype.isJVMStarted():
-
-            jpype.shutdownJVM()
\ No newline at end of file
+        if producer is not None:
+            producer.close()
+        shutdown_jvm()
\ No newline at end of file
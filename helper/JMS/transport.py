@@ -0,0 +1,170 @@
+"""
+Transport - Pluggable message transports under the JMS Producer.
+
+The provider URL scheme selects the transport:
+
+    t3://host:port, t3s://...   WebLogic JMS over JNDI (helper.JMS.weblogic)
+    memory://<broker>           in-process broker, no network or JVM
+    tcp://host:port             local socket broker (python -m helper.JMS.local_broker tcp)
+    spool://<directory>         file-spool broker (python -m helper.JMS.local_broker spool <directory>)
+
+Every transport sends a text message to a queue and returns the reply body,
+either blocking (`request`) or as a future (`send_async`).
+
+Usage:
+    transport = create_transport("memory://bench", "jms/sp/InboundBayplanQueue")
+    reply = transport.request(msg)
+    replies = transport.send_many([msg1, msg2], timeout=30)
+"""
+
+import importlib
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_RETRIES = 1
+DEFAULT_REPLY_TIMEOUT = 60.0  # seconds
+
+# scheme -> "module:Class", imported on first use so unused transports cost nothing
+_TRANSPORTS: Dict[str, object] = {
+    "t3": "helper.JMS.weblogic:WebLogicTransport",
+    "t3s": "helper.JMS.weblogic:WebLogicTransport",
+    "memory": "helper.JMS.local_transport:MemoryTransport",
+    "tcp": "helper.JMS.local_transport:SocketTransport",
+    "spool": "helper.JMS.local_transport:SpoolTransport",
+}
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def url_options(provider_url: str) -> Dict[str, str]:
+    """Query parameters of a provider URL ("memory://bench?latency_ms=5" -> {"latency_ms": "5"})."""
+    return dict(parse_qsl(urlsplit(provider_url).query))
+
+
+class Transport:
+    """Base class; subclasses implement `send_async` (and usually `close`)."""
+
+    def __init__(self, provider_url: str, queue: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES):
+        self.provider_url = provider_url
+        self.queue = queue
+        self.pool_size = pool_size
+        self.retries = retries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def request(self, message: str, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> str:
+        """Send `message` and wait for the reply body."""
+        return self.send_async(message, timeout).result()
+
+    def send_async(self, message: str, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> Future:
+        """
+        Send `message` without waiting.
+
+        Returns:
+            Future resolved with the reply body, or failed with TimeoutError /
+            ConnectionError; its `correlation_id` attribute identifies the request
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement send_async")
+
+    def send_many(self, messages: List[str], timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> List[str]:
+        """Send all messages concurrently and return the reply bodies in input order."""
+        futures = [self.send_async(message, timeout) for message in messages]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        pass
+
+
+class PendingReplies:
+    """Futures waiting for a reply, keyed by correlation ID, with deadlines."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Tuple[Future, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def add(self, key: str, timeout: Optional[float]) -> Future:
+        future = Future()
+        future.correlation_id = key
+        deadline = float("inf") if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._futures[key] = (future, deadline)
+        return future
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._futures)
+
+    def _pop(self, key: str) -> Optional[Future]:
+        with self._lock:
+            entry = self._futures.pop(key, None)
+        if entry is None or entry[0].done():
+            return None
+        return entry[0]
+
+    def resolve(self, key: str, body: str) -> bool:
+        """Complete the future for `key`; False if it is unknown or already done."""
+        future = self._pop(key)
+        if future is None:
+            return False
+        future.set_result(body)
+        return True
+
+    def discard(self, key: str) -> None:
+        """Forget `key` without completing its future (the send never went out)."""
+        with self._lock:
+            self._futures.pop(key, None)
+
+    def fail(self, key: str, error: BaseException) -> None:
+        future = self._pop(key)
+        if future is not None:
+            future.set_exception(error)
+
+    def expire(self) -> List[str]:
+        """Fail every future past its deadline with TimeoutError; returns their keys."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, deadline) in self._futures.items() if deadline <= now]
+        for key in expired:
+            self.fail(key, TimeoutError(f"No reply for {key}"))
+        return expired
+
+    def fail_all(self, error: BaseException) -> None:
+        for key in self.keys():
+            self.fail(key, error)
+
+
+def register_transport(scheme: str, factory: Callable[..., Transport]) -> None:
+    """Use `factory(provider_url, queue, **options)` for provider URLs with this scheme."""
+    _TRANSPORTS[scheme.lower()] = factory
+
+
+def create_transport(provider_url: str, queue: str, **options) -> Transport:
+    """
+    Transport for the provider URL's scheme.
+
+    Raises:
+        ValueError: If no transport is registered for the scheme
+    """
+    scheme = urlsplit(provider_url).scheme.lower()
+    factory = _TRANSPORTS.get(scheme)
+    if factory is None:
+        raise ValueError(f"No message transport for '{scheme}://' (known: {sorted(_TRANSPORTS)})")
+    if isinstance(factory, str):
+        module, _, name = factory.partition(":")
+        factory = _TRANSPORTS[scheme] = getattr(importlib.import_module(module), name)
+    return factory(provider_url, queue, **options)
@@ -0,0 +1,341 @@
+"""
+WebLogic - JMS transport for WebLogic over t3 (JNDI + QueueConnection).
+
+Selected by create_transport for t3:// and t3s:// provider URLs. The JVM is
+started on the first send (see helper.JMS.jvm).
+
+Usage:
+    with WebLogicTransport("t3://172.18.51.25:20212", "jms/sp/InboundBayplanQueue") as transport:
+        reply = transport.request(msg)
+"""
+
+import queue as queue_module
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from helper.JMS.jvm import java_classes
+from helper.JMS.transport import DEFAULT_POOL_SIZE, DEFAULT_REPLY_TIMEOUT, DEFAULT_RETRIES, Transport
+from helper.logger import logger
+
+RECEIVE_POLL_MS = 500
+# Seconds a reply that arrived before its sender registered the message ID is kept
+UNMATCHED_TTL = 60.0
+HANDLER = "messaging.handler.SimpleHandler"
+
+
+class WebLogicTransport(Transport):
+    """WebLogic JMS with a long-lived connection, cached queue lookup and pooled sessions."""
+
+    def __init__(self, provider_url, queue, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES) -> None:
+        """Initialize the WebLogic transport.
+
+        Args:
+            provider_url (str): e.g., 't3://172.18.51.21:25910'
+            queue (str): JMS queue name
+            pool_size (int): Maximum sessions kept open for concurrent senders
+            retries (int): Reconnect and resend this many times when the broker connection fails
+        """
+        super().__init__(provider_url, queue, pool_size, retries)
+        self._lock = threading.Lock()
+        self._connection = None
+        self._queue = None
+        self._idle = queue_module.LifoQueue()
+        self._created = 0
+        self._generation = 0
+        # Async replies: correlation ID or JMS message ID -> (future, deadline)
+        self._pending: Dict[str, tuple] = {}
+        # Correlation ID <-> JMS message ID of the same request, both directions
+        self._aliases: Dict[str, str] = {}
+        # Replies nobody is waiting for (yet): key -> (body, expiry)
+        self._unmatched: Dict[str, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._reply_queue = None
+        self._consumer = None
+        # The JVM, JNDI context and connection are opened on the first send
+        self.context = None
+        self.connection_factory = None
+
+    def _connect(self) -> None:
+        java = java_classes()
+        hash_table = java.Hashtable()
+        hash_table.put(java.Context.INITIAL_CONTEXT_FACTORY, "weblogic.jndi.WLInitialContextFactory")
+        hash_table.put(java.Context.PROVIDER_URL, self.provider_url)
+        self.context = java.InitialContext(hash_table)
+        self.connection_factory = self.context.lookup("weblogic/jms/ConnectionFactory")
+
+    def _ensure_connection(self):
+        """Open the shared connection and look up the queue once."""
+        with self._lock:
+            if self._connection is None:
+                if self.context is None:
+                    self._connect()
+                self._queue = self.context.lookup(self.queue)
+                self._connection = self.connection_factory.createQueueConnection()
+                self._connection.start()
+                logger.info("Opened JMS connection to %s for %s", self.provider_url, self.queue)
+            return self._connection
+
+    def _acquire(self):
+        """Reuse an idle (generation, session, requestor, sender), open a new one, or wait for one."""
+        connection = self._ensure_connection()
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue_module.Empty:
+                pass
+            with self._lock:
+                generation = self._generation
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            if create:
+                break
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue_module.Empty:
+                # A reconnect may have freed pool capacity
+                continue
+
+        try:
+            session = connection.createQueueSession(False, 1)
+            return generation, session, java_classes().QueueRequestor(session, self._queue), session.createSender(self._queue)
+        except Exception:
+            with self._lock:
+                if generation == self._generation:
+                    self._created -= 1
+            raise
+
+    def _release(self, entry) -> None:
+        # Sessions opened before a reconnect belong to the closed connection
+        if entry[0] == self._generation:
+            self._idle.put(entry)
+
+    def _discard(self, entry) -> None:
+        """Close a session whose send failed; the connection and other sessions stay open."""
+        generation, session = entry[0], entry[1]
+        with self._lock:
+            if generation == self._generation:
+                self._created -= 1
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug("Ignoring error while closing %s: %s", session, e)
+
+    def _connection_alive(self) -> bool:
+        """Probe the shared connection by opening and closing a session."""
+        connection = self._connection
+        if connection is None:
+            return False
+        try:
+            connection.createQueueSession(False, 1).close()
+            return True
+        except Exception:
+            return False
+
+    def _send_failed(self, entry) -> None:
+        """Drop the failed session; reset everything only when the connection itself is broken."""
+        self._discard(entry)
+        if not self._connection_alive():
+            self._reset()
+
+    def _reset(self) -> None:
+        """Drop the connection, sessions and JNDI context after a broker failure."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+            self._queue = None
+            self._created = 0
+            self._generation += 1
+            context, self.context = self.context, None
+            self._reply_queue = None
+            self._consumer = None
+        self._fail_pending(ConnectionError(f"JMS connection to {self.provider_url} was reset"))
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue_module.Empty:
+                break
+        # Closing the connection closes its sessions and requestors
+        for resource in (connection, context):
+            if resource is not None:
+                try:
+                    resource.close()
+                except Exception as e:
+                    logger.debug("Ignoring error while closing %s: %s", resource, e)
+
+    def close(self) -> None:
+        """Close the pooled connection; the next send reconnects."""
+        self._reset()
+
+    def request(self, str_message, timeout=None) -> str:
+        """
+        Send a text message on a pooled session and return the reply body.
+        QueueRequestor waits without a timeout, so `timeout` is ignored here.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                entry = self._acquire()
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning("JMS connect failed (%s), reconnecting", e)
+                self._reset()
+                continue
+
+            _, session, queue_requestor, _ = entry
+            try:
+                message = session.createTextMessage()
+                message.setStringProperty("handler", HANDLER)
+                message.setText(str_message)
+                reply = queue_requestor.request(message)
+            except Exception as e:
+                self._send_failed(entry)
+                if attempt == self.retries:
+                    raise
+                logger.warning("JMS send failed (%s), retrying (attempt %d/%d)", e, attempt + 1, self.retries)
+                continue
+            self._release(entry)
+            logger.debug("JMS reply %s", reply.getJMSCorrelationID())
+            return str(reply.getBody(java_classes().StringClass))
+
+    def send_async(self, str_message, timeout: Optional[float] = DEFAULT_REPLY_TIMEOUT) -> Future:
+        """
+        Send without waiting for the reply.
+
+        The message carries a new correlation ID and a JMSReplyTo pointing at this
+        producer's temporary reply queue; a background consumer resolves the future
+        with the reply body, or with TimeoutError after `timeout` seconds.
+
+        Returns:
+            Future whose `correlation_id` attribute identifies the request
+        """
+        correlation_id = uuid.uuid4().hex
+        future = Future()
+        future.correlation_id = correlation_id
+        deadline = float("inf") if timeout is None else time.monotonic() + timeout
+
+        for attempt in range(self.retries + 1):
+            try:
+                reply_queue = self._ensure_consumer()
+                entry = self._acquire()
+            except Exception as e:
+                # No connection or session could be opened; rebuild everything
+                self._reset()
+                if attempt == self.retries:
+                    raise
+                logger.warning("JMS connect failed (%s), reconnecting (attempt %d/%d)", e, attempt + 1, self.retries)
+                continue
+
+            _, session, _, sender = entry
+            try:
+                message = session.createTextMessage()
+                message.setStringProperty("handler", HANDLER)
+                message.setJMSCorrelationID(correlation_id)
+                message.setJMSReplyTo(reply_queue)
+                message.setText(str_message)
+                with self._pending_lock:
+                    self._pending[correlation_id] = (future, deadline)
+                sender.send(message)
+            except Exception as e:
+                with self._pending_lock:
+                    self._pending.pop(correlation_id, None)
+                # Other requests in flight keep waiting unless the connection is gone
+                self._send_failed(entry)
+                if attempt == self.retries:
+                    raise
+                logger.warning("JMS async send failed (%s), retrying (attempt %d/%d)", e, attempt + 1, self.retries)
+                continue
+
+            self._release(entry)
+            # Servers either echo the correlation ID or reply with our message ID
+            self._register(str(message.getJMSMessageID()), correlation_id, future, deadline)
+            return future
+
+    def _register(self, key: str, correlation_id: str, future: Future, deadline: float) -> None:
+        """Also wait for the reply under the JMS message ID `key`."""
+        with self._pending_lock:
+            unmatched = self._unmatched.pop(key, None)
+            if unmatched is not None:
+                self._pending.pop(correlation_id, None)
+            elif correlation_id in self._pending:
+                self._pending[key] = (future, deadline)
+                self._aliases[key] = correlation_id
+                self._aliases[correlation_id] = key
+        if unmatched is not None and not future.done():
+            future.set_result(unmatched[0])
+
+    def _ensure_consumer(self):
+        """Start the reply consumer for the current connection; returns its reply queue."""
+        connection = self._ensure_connection()
+        with self._lock:
+            if self._consumer is None:
+                session = connection.createQueueSession(False, 1)
+                self._reply_queue = session.createTemporaryQueue()
+                receiver = session.createReceiver(self._reply_queue)
+                self._consumer = threading.Thread(
+                    target=self._consume_replies, args=(receiver, self._generation),
+                    name="jms-reply-consumer", daemon=True)
+                self._consumer.start()
+            return self._reply_queue
+
+    def _consume_replies(self, receiver, generation: int) -> None:
+        while generation == self._generation:
+            try:
+                reply = receiver.receive(RECEIVE_POLL_MS)
+            except Exception as e:
+                if generation == self._generation:
+                    logger.error("JMS reply consumer stopped: %s", e)
+                    self._fail_pending(ConnectionError(f"JMS reply consumer failed: {e}"))
+                return
+            if reply is not None:
+                self._resolve(reply)
+            self._expire()
+
+    def _resolve(self, reply) -> None:
+        body = str(reply.getBody(java_classes().StringClass))
+        correlation_id = str(reply.getJMSCorrelationID())
+        with self._pending_lock:
+            entry = self._pending.pop(correlation_id, None)
+            if entry is None:
+                # Reply raced ahead of _register (or its request expired); keep it for a while
+                self._unmatched[correlation_id] = (body, time.monotonic() + UNMATCHED_TTL)
+                return
+            # Drop the registration under the other key
+            alias = self._aliases.pop(correlation_id, None)
+            if alias is not None:
+                self._pending.pop(alias, None)
+                self._aliases.pop(alias, None)
+        if not entry[0].done():
+            entry[0].set_result(body)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        with self._pending_lock:
+            expired = [key for key, (_, deadline) in self._pending.items() if deadline <= now]
+            futures = {}
+            for key in expired:
+                entry = self._pending.pop(key, None)
+                if entry is not None:
+                    futures[id(entry[0])] = entry[0]
+                alias = self._aliases.pop(key, None)
+                if alias is not None:
+                    self._pending.pop(alias, None)
+                    self._aliases.pop(alias, None)
+            for key in [key for key, (_, expiry) in self._unmatched.items() if expiry <= now]:
+                del self._unmatched[key]
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(TimeoutError(f"No JMS reply for {future.correlation_id}"))
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._pending_lock:
+            futures = {id(future): future for future, _ in self._pending.values()}
+            self._pending.clear()
+            self._aliases.clear()
+            self._unmatched.clear()
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,193 @@
+"""
+Data Store - Write-behind, journaled updates for the test-data CSV files.
+
+Page objects record per-row progress (mvt, cro_no, pin, capacity, ...) after
+every UI step. Rewriting the whole CSV each time costs O(rows) per update, so
+the store applies changes to the in-memory DataFrame, appends them to a small
+JSONL journal next to the CSV, and rewrites the CSV only on commit().
+
+If a run dies before commit, the journal is replayed onto the CSV the next
+time the file is read through io_utils.read_csv or opened by a store.
+
+Usage:
+    df, p = next(ProjectPaths.get_gate_pickup_data())
+    with CsvStore(df, p) as store:
+        for cntr_id in ...:
+            store.update(cntr_id, {"mvt": "C"})
+            if end_of_group:
+                store.commit()
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from helper.logger import logger
+from helper.df_cache import csv_cache
+
+DEFAULT_FLUSH_INTERVAL = 30.0  # seconds
+
+
+class CsvStore:
+    """Write-behind store wrapping a DataFrame loaded from `path`."""
+
+    def __init__(self, df: pd.DataFrame, path: Union[str, Path],
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+                 fsync: bool = False):
+        """
+        Args:
+            df: DataFrame loaded from `path`; it is updated in place
+            path: CSV file backing the DataFrame
+            flush_interval: Commit automatically when an update arrives this many
+                seconds after the last commit (None disables timed commits)
+            fsync: fsync the journal after each update (survives power loss, slower)
+        """
+        self.df = df
+        self.path = Path(path)
+        self.journal_path = journal_path_for(self.path)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._journal = None
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+        if self.journal_path.exists():
+            self._recover()
+
+    def __enter__(self) -> "CsvStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Persist finished rows even when the UI step failed
+        self.close()
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending > 0
+
+    def update(self, key: Any, values: Dict[str, Any], key_column: str = "cntr_id") -> int:
+        """
+        Set `values` on every row where `key_column == key`.
+
+        Returns:
+            Number of rows updated
+
+        Raises:
+            ValueError: If no row matches
+        """
+        mask = self.df[key_column] == key
+        count = int(mask.sum())
+        if not count:
+            raise ValueError(f"Cannot update {list(values)} for {key_column}={key}")
+
+        _apply(self.df, mask, values)
+        self._append_journal({"key_column": key_column, "key": _to_json(key),
+                              "values": {k: _to_json(v) for k, v in values.items()}})
+        self._pending += 1
+        logger.debug("Staged %s for %s=%s", values, key_column, key)
+
+        if self.flush_interval is not None and time.monotonic() - self._last_commit >= self.flush_interval:
+            self.commit()
+        return count
+
+    def commit(self) -> None:
+        """Rewrite the CSV with all staged updates and clear the journal."""
+        if self._pending:
+            write_csv_atomic(self.df, self.path)
+            logger.info("Committed %d update(s) to %s", self._pending, self.path)
+            self._pending = 0
+        self._clear_journal()
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        self.commit()
+
+    def _append_journal(self, entry: Dict[str, Any]) -> None:
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _clear_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+
+    def _recover(self) -> None:
+        """Replay a journal left behind by an interrupted run."""
+        self._pending = _replay(self.df, self.journal_path)
+        logger.warning("Replayed %d journaled update(s) onto %s", self._pending, self.path)
+        self.commit()
+
+
+def write_csv_atomic(df: pd.DataFrame, path: Union[str, Path]) -> None:
+    """Write a CSV through a temporary file so readers never see a partial file."""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    csv_cache.invalidate(path)
+
+
+def journal_path_for(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.journal")
+
+
+def replay_journal(path: Union[str, Path]) -> int:
+    """
+    Apply a journal left by an interrupted CsvStore to its CSV file.
+    Called by io_utils.read_csv so readers never see stale progress.
+
+    Returns:
+        Number of journal entries applied
+    """
+    path = Path(path)
+    journal_path = journal_path_for(path)
+    if not journal_path.exists():
+        return 0
+
+    df = pd.read_csv(path)
+    replayed = _replay(df, journal_path)
+    write_csv_atomic(df, path)
+    journal_path.unlink()
+    logger.warning("Replayed %d journaled update(s) onto %s", replayed, path)
+    return replayed
+
+
+def _replay(df: pd.DataFrame, journal_path: Path) -> int:
+    replayed = 0
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line from a crash mid-write
+                continue
+            mask = df[entry["key_column"]] == entry["key"]
+            if mask.any():
+                _apply(df, mask, entry["values"])
+                replayed += 1
+    return replayed
+
+
+def _apply(df: pd.DataFrame, mask: pd.Series, values: Dict[str, Any]) -> None:
+    for column, value in values.items():
+        if column in df.columns and isinstance(value, str) and is_numeric_dtype(df[column]):
+            # Empty columns (all NaN) are read as float; allow text values
+            df[column] = df[column].astype(object)
+        df.loc[mask, column] = value
+
+
+def _to_json(value: Any) -> Any:
+    # numpy scalars are not JSON serializable
+    return value.item() if hasattr(value, "item") else value
@@ -4,6 +4,7 @@ from pathlib import Path
 import pandas as pd
 
 import helper.io_utils
+from helper.data_store import write_csv_atomic
 
 def size_assignments():
     # Initialize dictionary to store identifier-size pairs
@@ -73,7 +74,7 @@ def bay_table(start_bay: int, end_bay: int):
     df['capacity'] = None
 
     # Save to CSV
-    df.to_csv(p, index=False)
+    write_csv_atomic(df, p)
 
     print("CSV file 'bay_table.csv' has been created.")
 
@@ -1,6 +1,13 @@
 import functools
 import logging
-from datetime import datetime
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from helper.logger import LOG_DIR, logger as app_logger
 
 # Configure basic logging
 logging.basicConfig(
@@ -10,38 +17,149 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def debug_out_line(func):
+PROFILE_CALLS = os.environ.get("PROFILE_CALLS", "0") == "1"
+PROFILE_REPORT = LOG_DIR / "call_profile.txt"
+# Histogram bucket upper bounds in ns: 1ms, 10ms, 100ms, 1s, 10s, then overflow
+HISTOGRAM_BOUNDS_NS = (1_000_000, 10_000_000, 100_000_000, 1_000_000_000, 10_000_000_000)
+HISTOGRAM_LABELS = ("<1ms", "<10ms", "<100ms", "<1s", "<10s", ">=10s")
+
+
+class CallProfiler:
+    """In-memory per-function call statistics collected by `debug_out_line`."""
+
+    def __init__(self, enabled: bool = PROFILE_CALLS, title: str = "Call profile"):
+        self.enabled = enabled
+        self.title = title
+        # name -> [count, total_ns, min_ns, max_ns, histogram]
+        self._stats: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        bucket = bisect_left(HISTOGRAM_BOUNDS_NS, elapsed_ns)
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                entry = self._stats[name] = [0, 0, elapsed_ns, elapsed_ns, [0] * len(HISTOGRAM_LABELS)]
+            entry[0] += 1
+            entry[1] += elapsed_ns
+            if elapsed_ns < entry[2]:
+                entry[2] = elapsed_ns
+            if elapsed_ns > entry[3]:
+                entry[3] = elapsed_ns
+            entry[4][bucket] += 1
+
+    def stats(self) -> List[dict]:
+        """Per-function statistics sorted by total time, slowest first."""
+        with self._lock:
+            items = [(name, entry[:4] + [entry[4][:]]) for name, entry in self._stats.items()]
+        rows = [
+            {
+                "name": name,
+                "count": count,
+                "total_ms": total / 1e6,
+                "mean_ms": total / count / 1e6,
+                "min_ms": low / 1e6,
+                "max_ms": high / 1e6,
+                "histogram": dict(zip(HISTOGRAM_LABELS, histogram)),
+            }
+            for name, (count, total, low, high, histogram) in items
+        ]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def report(self) -> str:
+        rows = self.stats()
+        header = (f"{'total_ms':>12} {'count':>7} {'mean_ms':>10} {'min_ms':>10} {'max_ms':>10}  "
+                  + " ".join(f"{label:>7}" for label in HISTOGRAM_LABELS) + "  function")
+        lines = [f"{self.title} (sorted by total time)", header]
+        for row in rows:
+            lines.append(
+                f"{row['total_ms']:>12.1f} {row['count']:>7} {row['mean_ms']:>10.2f} "
+                f"{row['min_ms']:>10.2f} {row['max_ms']:>10.2f}  "
+                + " ".join(f"{n:>7}" for n in row["histogram"].values())
+                + f"  {row['name']}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, path: Union[str, Path] = PROFILE_REPORT) -> Optional[Path]:
+        """Write the report to disk; returns None when nothing was recorded."""
+        if not self._stats:
+            return None
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.report() + "\n", encoding="utf-8")
+        return path
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+profiler = CallProfiler()
+
+
+def debug_out_line(func=None, *, log_result: bool = False):
     """
-    Decorator that logs function entry/exit with arguments and execution time
+    Decorator that logs function entry/exit with arguments and execution time.
+    Calls are also aggregated into `profiler` when PROFILE_CALLS=1.
+
+    Args:
+        log_result: Include the repr of the return value in the DEBUG exit line
     """
+    if func is None:
+        return functools.partial(debug_out_line, log_result=log_result)
 
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
+    qualname = func.__qualname__
+
+    def func_name(args) -> str:
         # Get class instance if method
         self = args[0] if len(args) > 0 and hasattr(args[0], '__class__') else None
+        return f"{self.__class__.__name__}.{func.__name__}" if self else func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Skip all message building unless the configured app logger (LOG_LEVEL) is at DEBUG;
+        # errors are still reported below
+        if not app_logger.isEnabledFor(logging.DEBUG):
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
+                logger.error("Error in %s - Duration: %.3fs - Exception: %s", func_name(args), duration, e)
+                raise
+            finally:
+                if profiler.enabled:
+                    profiler.record(qualname, time.perf_counter_ns() - start_ns)
 
         # Log function entry
-        func_name = f"{self.__class__.__name__}.{func.__name__}" if self else func.__name__
-        logger.debug(f"Entering {func_name} with args: {args[1:]} kwargs: {kwargs}")
+        name = func_name(args)
+        logger.debug("Entering %s with args: %s kwargs: %s", name, args[1:], kwargs)
 
         # Record start time
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
 
         try:
             # Execute the function
             result = func(*args, **kwargs)
 
             # Calculate execution time
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
 
             # Log successful exit
-            logger.debug(f"Exiting {func_name} - Duration: {duration:.3f}s - Result: {result}")
+            if log_result:
+                logger.debug("Exiting %s - Duration: %.3fs - Result: %r", name, duration, result)
+            else:
+                logger.debug("Exiting %s - Duration: %.3fs - Result type: %s", name, duration, type(result).__name__)
             return result
 
         except Exception as e:
             # Log any errors
-            duration = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Error in {func_name} - Duration: {duration:.3f}s - Exception: {str(e)}")
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            logger.error("Error in %s - Duration: %.3fs - Exception: %s", name, duration, e)
             raise
+        finally:
+            if profiler.enabled:
+                profiler.record(qualname, time.perf_counter_ns() - start_ns)
 
-    return wrapper
\ No newline at end of file
+    return wrapper
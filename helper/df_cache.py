@@ -0,0 +1,86 @@
+"""
+DataFrame Cache - In-process cache for the test-data CSV files.
+
+Entries are keyed by resolved path and validated against the file's
+mtime and size on every lookup, so edits made in Excel or by another process
+are picked up. Project writers (data_store.write_csv_atomic, io_utils.save_csv,
+CsvStore, snapshot restore) call `csv_cache.invalidate(path)` as well, which
+covers writes inside the same mtime tick and coarse-timestamp filesystems;
+page objects write their CSVs through `write_csv_atomic` for that reason.
+
+Callers get a copy-on-write view: mutating it never touches the cached frame.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+import pandas as pd
+
+from helper.logger import logger
+
+# pandas >= 3 always uses Copy-on-Write; on 2.x it is opt-in
+_COW = int(pd.__version__.split(".")[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
+
+
+class DataFrameCache:
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Union[str, Path], loader: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Return a private view of the DataFrame for `path`, loading it with `loader` on a miss.
+
+        Args:
+            path: File backing the DataFrame
+            loader: Function that parses the file, e.g. `pd.read_csv`
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        signature = _signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _view(entry[1])
+
+        df = loader(path)
+        # The loader may have rewritten the file (journal replay), so re-stat
+        signature = _signature(path)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (signature, df)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug("Cached DataFrame for %s (%d rows)", path, len(df))
+        return _view(df)
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Drop one cached file, or everything when `path` is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(path).resolve()), None)
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _view(df: pd.DataFrame) -> pd.DataFrame:
+    # A shallow copy is only isolated when Copy-on-Write is active
+    return df.copy(deep=not _COW)
+
+
+csv_cache = DataFrameCache()
@@ -0,0 +1,174 @@
+"""
+Discharge Batch - Generate discharge plans for many vessels in a process pool.
+
+Each vessel is allocated in its own worker process with its own GenerateDischarge
+(DataFrame + StowageIndex), so vessels never share occupancy state. The source
+CSVs are read with plain pandas (no journal replay or Feather sidecar) and are
+not modified; every vessel gets an output folder named after it:
+
+    <output_dir>/<vessel>/vessel_discharge_data.csv   allocated table
+    <output_dir>/<vessel>/assignments.csv             container_id, bay, stowage, size
+    <output_dir>/<vessel>/allocation.log              GenerateDischarge console output
+    <output_dir>/summary.json                         one entry per vessel
+
+Manifest (YAML):
+    vessels:
+      - name: TSHM04-V01
+        csv: data/vessel_discharge_data.csv
+        allocations:
+          - {start_id: DISH200000, count: 500, size: 20}
+          - {start_id: DISH300000, count: 200, size: 40}
+
+Usage:
+    python -m helper.discharge_batch manifest.yaml --output-dir tests/test-results/discharge --workers 4
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from helper.data_store import write_csv_atomic
+from helper.generate_discharge_container import GenerateDischarge
+from helper.io_utils import read_yaml
+from helper.logger import logger
+from helper.paths import ProjectPaths
+
+DEFAULT_OUTPUT_DIR = ProjectPaths.ROOT / "tests" / "test-results" / "discharge"
+
+
+def vessel_dir_for(output_dir: Union[str, Path], name: Any) -> Path:
+    """
+    Output folder for a vessel.
+
+    Raises:
+        ValueError: If the name is not a plain folder name (empty, ".", ".." or containing a path separator)
+    """
+    name = str(name)
+    if name in ("", ".", "..") or "/" in name or "\\" in name or Path(name).name != name:
+        raise ValueError(f"Invalid vessel name for an output folder: {name!r}")
+    return Path(output_dir) / name
+
+
+def allocate_vessel(vessel: Dict[str, Any], output_dir: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Run every allocation for one vessel and write its outputs.
+    Runs inside a worker process; errors are reported in the summary instead of raised.
+
+    Args:
+        vessel: {"name", "csv", "allocations": [{"start_id", "count", "size"}, ...]}
+        output_dir: Batch output folder; the vessel writes to <output_dir>/<name>
+
+    Returns:
+        Summary entry for the vessel
+    """
+    start = time.perf_counter()
+    name = vessel["name"]
+    summary: Dict[str, Any] = {"name": name, "source": str(vessel["csv"]), "pid": os.getpid(), "requests": []}
+
+    try:
+        vessel_dir = vessel_dir_for(output_dir, name)
+        vessel_dir.mkdir(parents=True, exist_ok=True)
+        output_csv = vessel_dir / "vessel_discharge_data.csv"
+        assignments = []
+
+        with open(vessel_dir / "allocation.log", "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            # Not io_utils.read_csv: that may replay a journal into the source and write a sidecar
+            # next to it, which workers sharing a source CSV would race on
+            generator = GenerateDischarge(pd.read_csv(vessel["csv"]), output_csv)
+            for request in vessel.get("allocations", []):
+                assigned = generator.bulk_assign_containers(
+                    request["start_id"], int(request["count"]), int(request["size"]), save=False)
+                assignments.extend(assigned)
+                summary["requests"].append({**request, "assigned": len(assigned)})
+
+        write_csv_atomic(generator.df, output_csv)
+        write_csv_atomic(pd.DataFrame(assignments, columns=["container_id", "bay", "stowage", "size"]),
+                         vessel_dir / "assignments.csv")
+
+        summary.update({
+            "status": "ok",
+            "output": str(output_csv),
+            "cells": len(generator.df),
+            "assigned": len(assignments),
+            "requested": sum(int(r["count"]) for r in vessel.get("allocations", [])),
+        })
+    except Exception as e:
+        summary.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    summary["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return summary
+
+
+def run_batch(vessels: List[Dict[str, Any]], output_dir: Union[str, Path] = DEFAULT_OUTPUT_DIR,
+              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Allocate all vessels in a process pool and write <output_dir>/summary.json.
+
+    Args:
+        vessels: Vessel entries as in the manifest
+        output_dir: Batch output folder
+        max_workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        Summary entries in manifest order
+
+    Raises:
+        ValueError: If two vessels share a name (their outputs would collide) or a name
+            is not a plain folder name
+    """
+    names = [vessel["name"] for vessel in vessels]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate vessel names: {sorted(duplicates)}")
+    for name in names:
+        vessel_dir_for(output_dir, name)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    summaries: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(allocate_vessel, vessel, output_dir): vessel["name"] for vessel in vessels}
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries[futures[future]] = summary
+            if summary["status"] == "ok":
+                logger.info("Allocated %d/%d containers for %s in %.0f ms",
+                            summary["assigned"], summary["requested"], summary["name"], summary["elapsed_ms"])
+            else:
+                logger.error("Allocation failed for %s: %s", summary["name"], summary["error"])
+
+    ordered = [summaries[name] for name in names]
+    report = {
+        "vessels": ordered,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "failed": sum(1 for s in ordered if s["status"] != "ok"),
+    }
+    (output_dir / "summary.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return ordered
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate discharge plans for many vessels in parallel")
+    parser.add_argument("manifest", help="YAML manifest with a 'vessels' list")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    summaries = run_batch(read_yaml(args.manifest)["vessels"], args.output_dir, args.workers)
+    print(f"{'vessel':<24} {'status':<7} {'assigned':>9} {'requested':>10} {'ms':>9}")
+    for s in summaries:
+        print(f"{s['name']:<24} {s['status']:<7} {s.get('assigned', 0):>9} "
+              f"{s.get('requested', 0):>10} {s['elapsed_ms']:>9.0f}")
+    return 1 if any(s["status"] != "ok" for s in summaries) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,32 @@
-from src.core.driver import BaseDriver
+import re
+
+import numpy as np
+
+import pandas as pd
+
+from helper.data_store import write_csv_atomic
 from helper.paths import ProjectPaths
+from helper.stowage_grid import StowageGrid
+from helper.stowage_index import StowageIndex, decode_stowage, encode_stowage, free_cells_in_order
+
+# Fill order inside a bay: tier first, then row
+ASSIGN_TIERS = [82, 84, 86, 88, 90]
+ASSIGN_ROWS = list(range(0, 13))  # 0 to 12
 
-class GenerateDischarge(BaseDriver):
-    def __init__(self):
-        super().__init__()
-        self.df, self.p = next(ProjectPaths.get_discharge_data())
+class GenerateDischarge:
+    def __init__(self, df: pd.DataFrame = None, p=None):
+        """
+        Args:
+            df: Discharge table (defaults to data/vessel_discharge_data.csv)
+            p: CSV file assignments are saved to
+        """
+        if df is None:
+            df, p = next(ProjectPaths.get_discharge_data())
+        self.df, self.p = df, p
+        # Built once; every assignment updates both so they stay in sync with self.df.
+        # The index answers per-cell questions, the grid finds fill order in bulk.
+        self.index = StowageIndex(self.df)
+        self.grid = StowageGrid.from_dataframe(self.df)
 
     def debug_planned_0082_positions(self):
         """Debug logger to show all stowage positions ending in 0082 that are planned"""
@@ -157,66 +179,118 @@ class GenerateDischarge(BaseDriver):
         print(f"Total containers assigned: {containers_assigned}/{count}")
         return assignments
     
+    def bulk_assign_containers(self, id: str, count: int, size: int, save: bool = True):
+        """
+        Same assignments as auto_assign_containers, computed in one pass and saved once.
+
+        Args:
+            id: Base container ID like "DIS1000000" (increments by 1)
+            count: Number of containers to assign
+            size: Container size (20 or 40)
+            save: Write the CSV after assigning
+        """
+        target_bays = self._target_bays(size)
+        if not target_bays:
+            print(f"No available groups for size {size}")
+            return []
+
+        bay_nums = [int(bay.replace('D', '')) for bay in target_bays]
+        positions = free_cells_in_order(self.df, bay_nums, ASSIGN_TIERS, ASSIGN_ROWS, count, grid=self.grid)
+        container_ids = self._id_range(id, len(positions))
+        labels = self.df.index[positions]
+        stowages = self.df["StowageCell_ISO"].to_numpy()[positions]
+
+        self.df.loc[labels, "ContainerNum"] = container_ids
+        for stowage, container_id in zip(stowages, container_ids):
+            self.index.assign(decode_stowage(stowage), container_id)
+        self.grid.occupy(stowages)
+        if save and len(positions):
+            write_csv_atomic(self.df, self.p)
+
+        assignments = [
+            {'container_id': container_id, 'bay': f"{int(stowage) // 10000:02d}D",
+             'stowage': int(stowage), 'size': size}
+            for container_id, stowage in zip(container_ids, stowages)
+        ]
+        print(f"Total containers assigned: {len(assignments)}/{count}")
+        return assignments
+
+    def _target_bays(self, size: int) -> list:
+        """Bays auto_assign_containers fills for `size`, in fill order."""
+        groups_result = self.get_bay_groups()
+
+        if size == 20:
+            available_groups = groups_result['available_for_20']
+            target_bays_in_group = [0, 2]  # Use first and last bay in group
+        elif size == 40:
+            available_groups = groups_result['available_for_40']
+            target_bays_in_group = [1]  # Use middle bay in group
+        else:
+            raise ValueError("Size must be 20 or 40")
+
+        # Groups are disjoint, so availability cannot change while filling other groups
+        return [group[i] for group in available_groups
+                if self._is_group_still_available(group, size)
+                for i in target_bays_in_group]
+
+    def _id_range(self, container_id: str, count: int) -> list:
+        """`count` IDs starting at container_id, as repeated _increment_id calls would produce."""
+        match = re.search(r'(\d+)$', container_id)
+        if not match:
+            ids = []
+            for _ in range(count):
+                ids.append(container_id)
+                container_id = self._increment_id(container_id)
+            return ids
+
+        start = int(match.group(1))
+        numbers = np.arange(start, start + count).astype(str)
+        return np.char.add(container_id[:match.start()], np.char.zfill(numbers, len(match.group(1)))).tolist()
+
     def _assign_to_bay(self, bay_num: int, container_id: str):
         """
         Find first free position in a bay and assign container
         Order: tier first (82→84→86→88→90), then row (0→1→2→...→12)
         """
-        tiers = [82, 84, 86, 88, 90]
-        rows = list(range(0, 13))  # 0 to 12
-        
-        for tier in tiers:
-            for row in rows:
-                stowage = int(f"{bay_num}{row:02d}{tier}")
-                
-                # Check if position is free
-                if self._is_position_free(stowage):
-                    # Update CSV with new container assignment
-                    self._update_csv_with_assignment(container_id, bay_num, stowage, row, tier)
-                    
-                    print(f"  Assigned {container_id} to position: {stowage} (bay {bay_num}, row {row:02d}, tier {tier})")
-                    return {
-                        'stowage': stowage,
-                        'row': row,
-                        'tier': tier
-                    }
-        
-        return None  # No free positions found
+        cell = self.index.first_free(bay_num, ASSIGN_TIERS, ASSIGN_ROWS)
+        if cell is None:
+            return None  # No free positions found
+
+        _, row, tier = cell
+        stowage = encode_stowage(*cell)
+        # Update CSV with new container assignment
+        self._update_csv_with_assignment(container_id, bay_num, stowage, row, tier)
+
+        print(f"  Assigned {container_id} to position: {stowage} (bay {bay_num}, row {row:02d}, tier {tier})")
+        return {
+            'stowage': stowage,
+            'row': row,
+            'tier': tier
+        }
     
     def _is_position_free(self, stowage: int) -> bool:
         """Check if a stowage position is free (ContainerNum is empty)"""
-        matching_rows = self.df[self.df["StowageCell_ISO"] == stowage]
-        
-        if not matching_rows.empty:
-            # Check if ContainerNum is empty at this stowage
-            container_nums = matching_rows["ContainerNum"]
-            is_empty = container_nums.isna() | (container_nums == "")
-            return is_empty.all()  # True if all ContainerNum fields are empty
-        
         # If stowage doesn't exist, position is not available
-        return False
+        return self.index.is_free(decode_stowage(stowage))
     
     def _update_csv_with_assignment(self, container_id: str, bay_num: int, stowage: int, row: int, tier: int):
         """Update existing CSV row with container assignment"""
-        # Find the row with this stowage
-        mask = self.df["StowageCell_ISO"] == stowage
-        matching_indices = self.df[mask].index
+        cell = decode_stowage(stowage)
         
-        if len(matching_indices) > 0:
+        if cell in self.index:
             # Update the first matching row
-            idx = matching_indices[0]
+            idx = self.index.assign(cell, container_id)
+            self.grid.occupy(stowage)
             self.df.loc[idx, "ContainerNum"] = container_id
             
             # Save to CSV
-            self.df.to_csv(self.p, index=False)
+            write_csv_atomic(self.df, self.p)
             print(f"  Updated CSV: {container_id} assigned to stowage {stowage}")
         else:
             print(f"  Warning: Stowage {stowage} not found in CSV")
     
     def _increment_id(self, container_id: str) -> str:
         """Increment container ID by 1 (e.g., DIS1000000 -> DIS1000001)"""
-        import re
-        
         # Find numeric part at the end
         match = re.search(r'(\d+)$', container_id)
         if match:
@@ -246,15 +320,8 @@ class GenerateDischarge(BaseDriver):
     
     def _bay_has_no_containers(self, bay: str) -> bool:
         """Check if a bay has no containers assigned (ContainerNum is empty for all positions)"""
-        bay_rows = self.df[self.df["Bay"] == bay]
-        
-        if bay_rows.empty:
-            return True  # No rows for this bay means it's free
-        
-        # Check if ALL ContainerNum fields in this bay are empty
-        container_nums = bay_rows["ContainerNum"]
-        all_empty = (container_nums.isna() | (container_nums == "")).all()
-        return all_empty
+        # No rows for this bay means it's free
+        return self.index.bay_is_empty(bay)
     
     def _check_position_free(self, bay_num: int, row_tier: str) -> bool:
         """
@@ -263,18 +330,10 @@ class GenerateDischarge(BaseDriver):
         row_tier: like "0082" for row 00, tier 82
         Returns True if position is free (planned column is not "Yes")
         """
-        target_stowage = int(f"{bay_num}{row_tier}")  # Convert to integer like 10082
-        
-        # Find rows with this stowage
-        matching_rows = self.df[self.df["StowageCell_ISO"] == target_stowage]
-        
-        # Check if any of these rows have "Yes" in planned column
-        if not matching_rows.empty:
-            planned_yes = (matching_rows["planned"] == "Yes").any()
-            return not planned_yes  # True if position is free (no "Yes" in planned)
+        target_stowage = encode_stowage(bay_num, int(row_tier[:2]), int(row_tier[2:]))  # like 10082
         
-        # If stowage doesn't exist, position is free
-        return True
+        # True if no row for this stowage has "Yes" in planned (missing stowage is free)
+        return not self.index.is_planned(decode_stowage(target_stowage))
     
 
 if __name__ == "__main__":
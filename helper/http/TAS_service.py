@@ -6,14 +6,127 @@ Handles sending AppointmentCreateUpdate messages with authentication and saving
 
 import requests
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+import random
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
-from helper.logger import logger
+from typing import Dict, Any, Iterable, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from helper.decorators import CallProfiler
+from helper.logger import LOG_DIR, logger
 from helper.paths import ProjectPaths
 import base64
 
+# Connections kept per host; create_appointments grows this to its worker count
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_WORKERS = int(os.getenv("TAS_MAX_WORKERS", "8"))
+# Containers per AppointmentChangeList request; 1 keeps one request per container
+DEFAULT_BATCH_SIZE = int(os.getenv("TAS_BATCH_SIZE", "1"))
+# Seconds to connect / to wait for the reply
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("TAS_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("TAS_TIMEOUT", "30"))
+# Resends after a failed connect or a RETRY_STATUS reply, with jittered exponential backoff; a CREATE
+# that may have reached the server (read timeout, dropped connection) is never resent
+DEFAULT_RETRIES = int(os.getenv("TAS_RETRIES", "2"))
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+RETRY_STATUS = (429, 502, 503, 504)
+# Consecutive failed attempts that open the circuit (0 disables it) and seconds before a trial request
+DEFAULT_BREAKER_FAILURES = int(os.getenv("TAS_BREAKER_FAILURES", "5"))
+DEFAULT_BREAKER_RESET = float(os.getenv("TAS_BREAKER_RESET", "30"))
+
+PROFILE_TAS = os.environ.get("PROFILE_TAS", "0") == "1"
+LATENCY_REPORT = LOG_DIR / "tas_latency.txt"
+# Per-attempt latency by outcome, shared by senders; written with the session call profile
+latency_profiler = CallProfiler(enabled=PROFILE_TAS, title="TAS request latency")
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TASUnavailableError(RuntimeError):
+    """Raised when appointments failed while the TAS circuit breaker is open."""
+
+    def __init__(self, message: str, results: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.results = results
+
+
+def _sent_nothing(error: requests.exceptions.ConnectionError) -> bool:
+    """Whether a ConnectionError happened while connecting, before any of the request was sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def appointment_created(result: Dict[str, Any]) -> bool:
+    """Whether a send result is a delivered reply whose appointment_status reports success."""
+    return bool(result.get('success') and result.get('appointment_status', {}).get('appointment_successful'))
+
+
+class CircuitBreaker:
+    """
+    Fails fast once the endpoint has failed `failure_threshold` times in a row.
+
+    After `reset_timeout` seconds one trial request is let through (half-open):
+    success closes the circuit, failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_BREAKER_FAILURES,
+                 reset_timeout: float = DEFAULT_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "open" if time.monotonic() - self._opened_at < self.reset_timeout else "half-open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("TAS circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if not self.failure_threshold:
+                return
+            if self._trial or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial:
+                    logger.warning("TAS circuit open after %d consecutive failures; failing fast for %g s",
+                                   self._failures, self.reset_timeout)
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
 class AppointmentMessageSender:
     """
     HTTP Message Sender for AppointmentCreateUpdate messages with authentication and response saving.
@@ -23,7 +136,14 @@ class AppointmentMessageSender:
                  endpoint_url: str = "https://aqctiut1.hphit.hutchisonports.com:30154/services/message/tasService",
                  username: Optional[str] = None,
                  password: Optional[str] = None,
-                 save_directory: Optional[Union[str, Path]] = None):
+                 save_directory: Optional[Union[str, Path]] = None,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 timeout: float = DEFAULT_READ_TIMEOUT,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 breaker: Optional[CircuitBreaker] = None,
+                 latency: Optional[CallProfiler] = None):
         """
         Initialize the appointment message sender.
         
@@ -32,17 +152,31 @@ class AppointmentMessageSender:
             username: Username for authentication
             password: Password for authentication
             save_directory: Directory to save response XML files (defaults to project responses directory)
+            pool_maxsize: Keep-alive connections to the endpoint shared by concurrent senders
+            timeout: Seconds to wait for a reply
+            connect_timeout: Seconds to wait for a connection
+            retries: Resends after a failed connect or a RETRY_STATUS reply
+            backoff_base: First backoff ceiling in seconds; doubles per retry up to DEFAULT_BACKOFF_MAX
+            breaker: Circuit breaker for the endpoint (defaults to a new CircuitBreaker)
+            latency: Latency recorder (defaults to latency_profiler, enabled with PROFILE_TAS=1)
         """
         self.endpoint_url = endpoint_url
         self.username = username
         self.password = password
         self.save_directory = Path(save_directory) if save_directory else ProjectPaths.RESPONSES
+        self.timeout = (connect_timeout, timeout)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = latency_profiler if latency is None else latency
         
         # Create save directory if it doesn't exist
         self.save_directory.mkdir(parents=True, exist_ok=True)
         
         # Setup session with headers
         self.session = requests.Session()
+        self.pool_maxsize = 0
+        self.set_pool_size(pool_maxsize)
         self.headers = {
             'Content-Type': 'application/xml',
             'Accept': 'application/xml',
@@ -53,6 +187,15 @@ class AppointmentMessageSender:
         if self.username and self.password:
             self._setup_authentication()
     
+    def set_pool_size(self, pool_maxsize: int) -> None:
+        """Mount connection pools holding up to `pool_maxsize` connections per host."""
+        if pool_maxsize == self.pool_maxsize:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool_maxsize = pool_maxsize
+
     def _setup_authentication(self):
         """Setup authentication for the HTTP session."""
         if self.username and self.password:
@@ -85,24 +228,83 @@ class AppointmentMessageSender:
         """
         Send XML message to the HTTP endpoint and save response.
         
+        Failed connects and RETRY_STATUS replies are retried with jittered
+        exponential backoff. Read timeouts and connections dropped after the
+        request went out are not, since the server may already have created
+        the appointment. While the circuit breaker is open the message fails
+        at once without a request.
+        
         Args:
             xml_message: XML message to send
             message_name: Name identifier for the message (used in filename)
             
         Returns:
-            Dictionary containing response information and file path
+            Dictionary containing response information and file path, plus the
+            number of 'attempts' and total 'elapsed_ms'
         """
-        try:
-            logger.info(f"Sending appointment message '{message_name}' to {self.endpoint_url}")
-            logger.debug(f"Message content: {xml_message}")
+        logger.info(f"Sending appointment message '{message_name}' to {self.endpoint_url}")
+        logger.debug(f"Message content: {xml_message}")
+        start_ns = time.perf_counter_ns()
+        error = 'Circuit open'
+        
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                logger.error(f"TAS circuit open, not sending message '{message_name}'")
+                return self._failed_result(message_name, error, attempt, start_ns)
             
-            # Send the request
-            response = self.session.post(
-                self.endpoint_url,
-                data=xml_message,
-                timeout=30
-            )
+            sent_ns = time.perf_counter_ns()
+            try:
+                response = self.session.post(
+                    self.endpoint_url,
+                    data=xml_message,
+                    timeout=self.timeout
+                )
+            except requests.exceptions.ConnectionError as e:
+                # Includes ConnectTimeout
+                retryable = _sent_nothing(e)
+                error = 'Connection error' if retryable else 'Connection lost'
+                logger.error(f"{error} to {self.endpoint_url} for message '{message_name}'")
+            except requests.exceptions.Timeout:
+                retryable = False
+                error = 'Request timeout'
+                logger.error(f"Request timeout while sending message '{message_name}'")
+            except Exception as e:
+                self._record("POST error", time.perf_counter_ns() - sent_ns)
+                self.breaker.record_failure()
+                logger.error(f"Unexpected error while sending message '{message_name}': {e}")
+                return self._failed_result(message_name, str(e), attempt + 1, start_ns)
+            else:
+                self._record(f"POST {response.status_code}", time.perf_counter_ns() - sent_ns)
+                if response.status_code not in RETRY_STATUS:
+                    self.breaker.record_success()
+                    return self._handle_response(response, message_name, attempt + 1, start_ns)
+                error = f"HTTP {response.status_code}"
+                self.breaker.record_failure()
+                if attempt == self.retries:
+                    return self._handle_response(response, message_name, attempt + 1, start_ns)
+                logger.warning(f"TAS returned {response.status_code} for message '{message_name}'")
+                time.sleep(backoff_delay(attempt, self.backoff_base))
+                continue
             
+            self._record(f"POST {error.lower()}", time.perf_counter_ns() - sent_ns)
+            self.breaker.record_failure()
+            if not retryable:
+                return self._failed_result(message_name, error, attempt + 1, start_ns)
+            if attempt < self.retries:
+                delay = backoff_delay(attempt, self.backoff_base)
+                logger.info(f"Retrying message '{message_name}' in {delay:.2f}s (attempt {attempt + 1}/{self.retries})")
+                time.sleep(delay)
+        
+        return self._failed_result(message_name, error, self.retries + 1, start_ns)
+    
+    def _record(self, name: str, elapsed_ns: int) -> None:
+        if self.latency.enabled:
+            self.latency.record(name, elapsed_ns)
+    
+    def _handle_response(self, response: requests.Response, message_name: str,
+                         attempts: int, start_ns: int) -> Dict[str, Any]:
+        """Save and analyze a reply and build the send_message result."""
+        try:
             # Generate filename for response
             response_filename = self._generate_filename(f"{message_name}_response")
             response_file_path = self.save_directory / response_filename
@@ -122,9 +324,13 @@ class AppointmentMessageSender:
                 'response_file_path': str(response_file_path),
                 'message_name': message_name,
                 'timestamp': datetime.now().isoformat(),
+                'attempts': attempts,
+                'elapsed_ms': round((time.perf_counter_ns() - start_ns) / 1e6, 1),
                 'appointment_status': response_analysis
             }
             
+            self._record("send_message", time.perf_counter_ns() - start_ns)
+            
             if result['success']:
                 logger.info(f"Message '{message_name}' sent successfully. Response saved to: {response_file_path}")
                 if response_analysis.get('appointment_successful'):
@@ -136,30 +342,22 @@ class AppointmentMessageSender:
             
             return result
             
-        except requests.exceptions.Timeout:
-            logger.error(f"Request timeout while sending message '{message_name}'")
-            return {
-                'success': False, 
-                'error': 'Request timeout',
-                'message_name': message_name,
-                'timestamp': datetime.now().isoformat()
-            }
-        except requests.exceptions.ConnectionError:
-            logger.error(f"Connection error to {self.endpoint_url} for message '{message_name}'")
-            return {
-                'success': False, 
-                'error': 'Connection error',
-                'message_name': message_name,
-                'timestamp': datetime.now().isoformat()
-            }
         except Exception as e:
-            logger.error(f"Unexpected error while sending message '{message_name}': {e}")
-            return {
-                'success': False, 
-                'error': str(e),
-                'message_name': message_name,
-                'timestamp': datetime.now().isoformat()
-            }
+            logger.error(f"Unexpected error while handling the reply to message '{message_name}': {e}")
+            return self._failed_result(message_name, str(e), attempts, start_ns)
+    
+    def _failed_result(self, message_name: str, error: str, attempts: int, start_ns: int) -> Dict[str, Any]:
+        """send_message result for a message that got no usable reply."""
+        self._record("send_message failed", time.perf_counter_ns() - start_ns)
+        return {
+            'success': False,
+            'error': error,
+            'message_name': message_name,
+            'timestamp': datetime.now().isoformat(),
+            'attempts': attempts,
+            'elapsed_ms': round((time.perf_counter_ns() - start_ns) / 1e6, 1),
+            'circuit_state': self.breaker.state
+        }
     
     def _analyze_response(self, response_text: str) -> Dict[str, Any]:
         """
@@ -169,7 +367,8 @@ class AppointmentMessageSender:
             response_text: XML response text
             
         Returns:
-            Dictionary with response analysis
+            Dictionary with response analysis; the top-level container fields describe the
+            first tasContainer and 'containers' holds the status of every tasContainer
         """
         try:
             root = ET.fromstring(response_text)
@@ -179,35 +378,42 @@ class AppointmentMessageSender:
             return_code = return_code_elem.text if return_code_elem is not None else 'Unknown'
             
             # Check container details
-            container_elem = root.find('.//tasContainer')
-            if container_elem is not None:
-                cntr_id = container_elem.find('cntrId')
-                valid_tas_cntr = container_elem.find('validTASCntr')
-                fail_reason = container_elem.find('failReason')
-                appointment_status = container_elem.find('appointmentStatus')
-                
-                return {
-                    'return_code': return_code,
-                    'container_id': cntr_id.text if cntr_id is not None else 'Unknown',
-                    'valid_tas_container': valid_tas_cntr.text if valid_tas_cntr is not None else 'Unknown',
-                    'appointment_successful': valid_tas_cntr.text == 'Y' if valid_tas_cntr is not None else False,
-                    'fail_reason': fail_reason.text if fail_reason is not None else None,
-                    'appointment_status': appointment_status.text if appointment_status is not None else None
-                }
+            containers = [self._container_status(elem, return_code) for elem in root.iter('tasContainer')]
+            if containers:
+                return {**containers[0], 'containers': containers}
             
             return {
                 'return_code': return_code,
                 'appointment_successful': return_code == '000',
-                'container_id': 'Unknown'
+                'container_id': 'Unknown',
+                'containers': []
             }
             
         except ET.ParseError:
             return {
                 'return_code': 'PARSE_ERROR',
                 'appointment_successful': False,
-                'error': 'Failed to parse XML response'
+                'error': 'Failed to parse XML response',
+                'containers': []
             }
     
+    @staticmethod
+    def _container_status(container_elem: ET.Element, return_code: str) -> Dict[str, Any]:
+        """Status of one tasContainer element."""
+        cntr_id = container_elem.find('cntrId')
+        valid_tas_cntr = container_elem.find('validTASCntr')
+        fail_reason = container_elem.find('failReason')
+        appointment_status = container_elem.find('appointmentStatus')
+        
+        return {
+            'return_code': return_code,
+            'container_id': cntr_id.text if cntr_id is not None else 'Unknown',
+            'valid_tas_container': valid_tas_cntr.text if valid_tas_cntr is not None else 'Unknown',
+            'appointment_successful': valid_tas_cntr.text == 'Y' if valid_tas_cntr is not None else False,
+            'fail_reason': fail_reason.text if fail_reason is not None else None,
+            'appointment_status': appointment_status.text if appointment_status is not None else None
+        }
+    
     def _save_response_as_xml(self, response: requests.Response, file_path: Path, message_name: str):
         """
         Save HTTP response as XML file.
@@ -295,6 +501,27 @@ class AppointmentMessageGenerator:
         logger.info(f"Generated appointment message for container: {cntr_id}")
         return xml_message
     
+    def generate_appointments_message(self, cntr_ids: Iterable[str], **kwargs) -> str:
+        """
+        Generate one AppointmentCreateUpdate XML message with an AppointmentChange per container.
+        
+        Args:
+            cntr_ids: Container IDs, one AppointmentChange each (in this order)
+            **kwargs: Additional fields to override defaults, applied to every container
+            
+        Returns:
+            Generated XML message as string
+        """
+        cntr_ids = list(cntr_ids)
+        if not cntr_ids:
+            raise ValueError("At least one container ID is required")
+        
+        changes = [self._generate_dynamic_fields(cntr_id, **kwargs) for cntr_id in cntr_ids]
+        xml_message = self._create_appointment_xml(changes)
+        
+        logger.info(f"Generated appointment message for {len(cntr_ids)} containers: {cntr_ids[0]}..{cntr_ids[-1]}")
+        return xml_message
+    
     def _generate_dynamic_fields(self, cntr_id: str, **kwargs) -> Dict[str, str]:
         """
         Generate dynamic fields for the AppointmentCreateUpdate message.
@@ -350,16 +577,20 @@ class AppointmentMessageGenerator:
         
         return fields
     
-    def _create_appointment_xml(self, fields: Dict[str, str]) -> str:
+    def _create_appointment_xml(self, fields: Union[Dict[str, str], List[Dict[str, str]]]) -> str:
         """
         Create AppointmentCreateUpdate XML message using the provided fields.
         
         Args:
-            fields: Dictionary of field values
+            fields: Dictionary of field values, or one dictionary per AppointmentChange;
+                    the message-level flags are taken from the first
             
         Returns:
             XML message as formatted string
         """
+        changes = fields if isinstance(fields, list) else [fields]
+        fields = changes[0]
+        
         # Create root element
         root = ET.Element('AppointmentCreateUpdate')
         
@@ -373,9 +604,6 @@ class AppointmentMessageGenerator:
         # AppointmentChangeList
         change_list = ET.SubElement(root, 'AppointmentChangeList')
         
-        # AppointmentChange
-        change = ET.SubElement(change_list, 'AppointmentChange')
-        
         # Add all fields in the order shown in the example
         field_order = [
             'actionCode', 'cntrId', 'mode', 'bolNo', 'bookingNo', 'terminalId',
@@ -384,10 +612,13 @@ class AppointmentMessageGenerator:
             'clearingAgentRepName', 'tictsId', 'sourcePoint', 'userId', 'vip', 'remark'
         ]
         
-        for field_name in field_order:
-            if field_name in fields:
-                elem = ET.SubElement(change, field_name)
-                elem.text = fields[field_name]
+        # One AppointmentChange per container
+        for change_fields in changes:
+            change = ET.SubElement(change_list, 'AppointmentChange')
+            for field_name in field_order:
+                if field_name in change_fields:
+                    elem = ET.SubElement(change, field_name)
+                    elem.text = change_fields[field_name]
         
         # Format XML with proper indentation
         ET.indent(root, space="   ", level=0)  # Using 3 spaces as in the example
@@ -406,7 +637,8 @@ class AppointmentService:
                  endpoint_url: str = "http://172.18.51.25:20210/services/message/tasService",
                  username = os.environ.get('USER'),
                  password = os.environ.get('PASSWORD'),
-                 save_directory: Optional[Union[str, Path]] = None):
+                 save_directory: Optional[Union[str, Path]] = None,
+                 **sender_options):
         """
         Initialize the complete appointment service.
         
@@ -415,8 +647,9 @@ class AppointmentService:
             username: Authentication username (if None, will try environment variables)
             password: Authentication password (if None, will try environment variables)
             save_directory: Directory to save response files (defaults to project responses directory)
+            **sender_options: AppointmentMessageSender options (timeout, retries, breaker, ...)
         """
-        self.sender = AppointmentMessageSender(endpoint_url, username, password, save_directory)
+        self.sender = AppointmentMessageSender(endpoint_url, username, password, save_directory, **sender_options)
         self.generator = AppointmentMessageGenerator()
     
     def send_appointment_request(self, 
@@ -465,6 +698,117 @@ class AppointmentService:
         kwargs['actionCode'] = 'UPDATE'
         return self.send_appointment_request(cntr_id, **kwargs)
 
+    def send_appointments_request(self,
+                                  cntr_ids: Iterable[str],
+                                  message_name: Optional[str] = None,
+                                  **kwargs) -> List[Dict[str, Any]]:
+        """
+        Generate and send one appointment message covering several containers.
+        
+        Args:
+            cntr_ids: Container IDs, one AppointmentChange each
+            message_name: Name for the message (defaults to the first container and count)
+            **kwargs: Additional field overrides applied to every container
+            
+        Returns:
+            One result per container, in input order; each is the request result with that
+            container's 'appointment_status' (a container missing from the reply is failed)
+        
+        Raises:
+            ValueError: If `cntr_ids` is empty
+        """
+        cntr_ids = list(cntr_ids)
+        # Raises ValueError for an empty list before anything is named or sent
+        xml_message = self.generator.generate_appointments_message(cntr_ids, **kwargs)
+        if message_name is None:
+            message_name = f"appointments_{cntr_ids[0]}_{len(cntr_ids)}"
+        
+        result = self.sender.send_message(xml_message, message_name)
+        result['generated_message'] = xml_message
+        
+        analysis = result.get('appointment_status')
+        statuses = {}
+        if analysis is not None:
+            statuses = {status['container_id']: status for status in analysis['containers']}
+        
+        results = []
+        for cntr_id in cntr_ids:
+            container_result = {**result, 'cntr_id': cntr_id}
+            if analysis is not None:
+                if cntr_id in statuses:
+                    container_result['appointment_status'] = statuses[cntr_id]
+                elif analysis['containers']:
+                    container_result['appointment_status'] = {
+                        'return_code': analysis['return_code'],
+                        'container_id': cntr_id,
+                        'appointment_successful': False,
+                        'fail_reason': 'No tasContainer in response'
+                    }
+                else:
+                    # Reply without container details: the return code covers every container
+                    container_result['appointment_status'] = {**analysis, 'container_id': cntr_id}
+            results.append(container_result)
+        return results
+
+    def create_appointments(self, cntr_ids: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                            batch_size: int = DEFAULT_BATCH_SIZE, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Create appointments for many containers concurrently.
+
+        Containers are packed `batch_size` to a request (one AppointmentChange
+        each), and requests run on a thread pool sharing the sender's session,
+        whose connection pool is grown to `max_workers` so no request waits
+        for a socket or opens a throwaway one.
+
+        Args:
+            cntr_ids: Container IDs
+            max_workers: Concurrent requests
+            batch_size: Containers per request (TAS_BATCH_SIZE)
+            **kwargs: Field overrides applied to every container
+
+        Returns:
+            One result per container, in input order; unexpected errors are
+            reported as {'success': False, 'error': ...} instead of raised
+
+        Raises:
+            TASUnavailableError: If any appointment failed and the circuit breaker
+                is open; its `results` holds the per-container results
+        """
+        cntr_ids = list(cntr_ids)
+        if not cntr_ids:
+            return []
+        batch_size = max(1, batch_size)
+        batches = [cntr_ids[i:i + batch_size] for i in range(0, len(cntr_ids), batch_size)]
+        workers = max(1, min(max_workers, len(batches)))
+        self.sender.set_pool_size(max(self.sender.pool_maxsize, workers))
+        kwargs['actionCode'] = 'CREATE'
+
+        def create(batch: List[str]) -> List[Dict[str, Any]]:
+            try:
+                if len(batch) == 1:
+                    return [self.send_appointment_request(batch[0], **kwargs)]
+                return self.send_appointments_request(batch, **kwargs)
+            except Exception as e:
+                logger.error("Appointment request for %s failed: %s", batch, e)
+                timestamp = datetime.now().isoformat()
+                return [{'success': False, 'error': str(e), 'cntr_id': cntr_id, 'timestamp': timestamp}
+                        for cntr_id in batch]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tas") as pool:
+            results = [result for batch_results in pool.map(create, batches) for result in batch_results]
+
+        failed = [r['cntr_id'] for r in results if not appointment_created(r)]
+        logger.info("Created %d/%d appointments in %.0f ms with %d requests on %d workers",
+                    len(results) - len(failed), len(results),
+                    (time.perf_counter() - start) * 1000, len(batches), workers)
+        if failed:
+            logger.warning("Appointments not created for: %s", failed)
+            if self.sender.breaker.state == "open":
+                raise TASUnavailableError(
+                    f"TAS circuit open; appointments not created for {len(failed)} container(s)", results)
+        return results
+
 if __name__ == "__main__":
     tas = AppointmentService()
     tas.create_appointment("TEST000210")
\ No newline at end of file
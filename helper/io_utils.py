@@ -1,10 +1,35 @@
+import os
+import shutil
+import zlib
 import yaml
 import json
 import pandas as pd
 
 from pathlib import Path
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
 from helper.logger import logger
+from helper.data_store import journal_path_for, replay_journal
+from helper.df_cache import csv_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # Optional: without pyarrow every read parses the CSV
+    pa = feather = None
+
+# Typed Feather sidecar (<name>.csv.feather) kept next to large CSVs
+CSV_SIDECAR = os.environ.get("CSV_SIDECAR", "1") == "1"
+SIDECAR_MIN_BYTES = int(os.environ.get("SIDECAR_MIN_BYTES", 256 * 1024))
+_SIDECAR_SOURCE_KEY = b"source_signature"
+
+# "copy" (reflink/byte copy) or "delta" (changed lines against a base snapshot)
+SNAPSHOT_MODE = os.environ.get("SNAPSHOT_MODE", "copy")
+
+try:
+    import fcntl
+    _FICLONE = 0x40049409  # Linux ioctl: share extents on btrfs/XFS/bcachefs
+except ImportError:
+    fcntl = _FICLONE = None
 
 def read_excel(path: Union[str, Path]) -> pd.DataFrame:
     """Read an Excel file into a DataFrame."""
@@ -13,25 +38,85 @@ def read_excel(path: Union[str, Path]) -> pd.DataFrame:
     logger.debug(f"Read Excel from {path}")
     return df
 
-def read_csv(path: Union[str, Path]) -> pd.DataFrame:
-    """Read a CSV file into a DataFrame."""
+def read_csv(path: Union[str, Path], cached: bool = False) -> pd.DataFrame:
+    """
+    Read a CSV file into a DataFrame, applying any pending CsvStore journal first.
+
+    Args:
+        path: CSV file
+        cached: Serve repeated reads of an unchanged file from the in-process cache
+    """
     path = Path(path)
+    if cached:
+        # A pending journal means the file is about to change; let the loader replay it
+        if journal_path_for(path).exists():
+            csv_cache.invalidate(path)
+        return csv_cache.get(path, lambda p: read_csv(p, cached=False))
+
+    replay_journal(path)
+    signature = _sidecar_signature(path)
+    if signature is not None:
+        df = _read_sidecar(path, signature)
+        if df is not None:
+            logger.debug("Read CSV from sidecar %s", sidecar_path_for(path))
+            return df
+
     df = pd.read_csv(path)
-    logger.debug(f"Read CSV from {path}")
+    logger.debug("Read CSV from %s", path)
+    if signature is not None:
+        _write_sidecar(df, path, signature)
     return df
 
+def sidecar_path_for(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.feather")
+
+def _sidecar_signature(path: Path) -> Optional[bytes]:
+    """Source mtime/size stamp, or None when the sidecar should not be used."""
+    if not CSV_SIDECAR or feather is None:
+        return None
+    stat = os.stat(path)
+    if stat.st_size < SIDECAR_MIN_BYTES:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+def _read_sidecar(path: Path, signature: bytes) -> Optional[pd.DataFrame]:
+    sidecar = sidecar_path_for(path)
+    try:
+        table = feather.read_table(sidecar, memory_map=True)
+    except (OSError, pa.ArrowException):
+        return None
+    if (table.schema.metadata or {}).get(_SIDECAR_SOURCE_KEY) != signature:
+        # CSV was edited since the sidecar was written
+        return None
+    return table.to_pandas()
+
+def _write_sidecar(df: pd.DataFrame, path: Path, signature: bytes) -> None:
+    sidecar = sidecar_path_for(path)
+    tmp_path = sidecar.with_name(f"{sidecar.name}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_SIDECAR_SOURCE_KEY] = signature
+        feather.write_feather(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, sidecar)
+    except (OSError, pa.ArrowException, TypeError, ValueError) as e:
+        # Mixed-type columns or a read-only data dir: keep serving the CSV
+        logger.debug("Skipped CSV sidecar for %s: %s", path, e)
+        if tmp_path.exists():
+            tmp_path.unlink()
+
 def save_csv(df: pd.DataFrame, path: Union[str, Path], backup: bool = True) -> None:
     """Save DataFrame to CSV with optional backup."""
     path = Path(path)
     
     if backup and path.exists():
         backup_path = path.with_suffix('.bak.csv')
-        # Read existing file and save as backup
-        existing_df = pd.read_csv(path)
-        existing_df.to_csv(backup_path, index=False)
+        copy_file(path, backup_path)
         logger.info(f"Created backup at {backup_path}")
     
     df.to_csv(path, index=False)
+    csv_cache.invalidate(path)
     logger.info(f"Saved CSV to {path}")
 
 def read_yaml(path: Union[str, Path]) -> Dict[str, Any]:
@@ -95,29 +180,119 @@ def update_column(df, cntr_id, column: str, value) -> None:
     else:
         raise Exception(f"Cannot update {column} for {cntr_id}")
 
-def create_csv_snapshot(csv_path: Union[str, Path], snapshot_suffix: str = "_snapshot") -> Path:
-    """Create a snapshot copy of a CSV file."""
+def create_csv_snapshot(csv_path: Union[str, Path], snapshot_suffix: str = "_snapshot",
+                        delta: Optional[bool] = None) -> Path:
+    """
+    Create a snapshot of a CSV file without parsing it.
+
+    Full snapshots are reflinked where the filesystem supports it, otherwise copied.
+    Delta snapshots keep one full base (<stem><suffix>.base.csv) and store only
+    the lines that differ from it (<stem><suffix>.csv.delta).
+
+    Args:
+        csv_path: CSV file to snapshot
+        snapshot_suffix: Appended to the file stem
+        delta: Store a delta against the base snapshot (defaults to SNAPSHOT_MODE=delta)
+    """
     csv_path = Path(csv_path)
     if not csv_path.exists():
         logger.warning(f"CSV file {csv_path} does not exist, skipping snapshot")
         return None
-    
-    snapshot_path = csv_path.with_name(f"{csv_path.stem}{snapshot_suffix}.csv")
-    df = pd.read_csv(csv_path)
-    df.to_csv(snapshot_path, index=False)
-    logger.debug(f"Created snapshot: {csv_path} → {snapshot_path}")
-    return snapshot_path
+
+    if delta is None:
+        delta = SNAPSHOT_MODE == "delta"
+    snapshot_path = _snapshot_path(csv_path, snapshot_suffix)
+    delta_path = _delta_path(csv_path, snapshot_suffix)
+
+    if delta:
+        base_path = _base_path(csv_path, snapshot_suffix)
+        if not base_path.exists():
+            copy_file(csv_path, base_path)
+        _write_delta(csv_path, base_path, delta_path)
+        stale, created = snapshot_path, delta_path
+    else:
+        copy_file(csv_path, snapshot_path)
+        stale, created = delta_path, snapshot_path
+
+    # Only one snapshot kind may exist so restore is unambiguous
+    if stale.exists():
+        stale.unlink()
+    logger.debug(f"Created snapshot: {csv_path} → {created}")
+    return created
 
 def restore_csv_from_snapshot(csv_path: Union[str, Path], snapshot_suffix: str = "_snapshot") -> bool:
-    """Restore CSV file from its snapshot."""
+    """Restore CSV file from its full or delta snapshot."""
     csv_path = Path(csv_path)
-    snapshot_path = csv_path.with_name(f"{csv_path.stem}{snapshot_suffix}.csv")
-    
-    if not snapshot_path.exists():
+    snapshot_path = _snapshot_path(csv_path, snapshot_suffix)
+    delta_path = _delta_path(csv_path, snapshot_suffix)
+    tmp_path = csv_path.with_name(f"{csv_path.name}.tmp")
+
+    if snapshot_path.exists():
+        copy_file(snapshot_path, tmp_path)
+        source = snapshot_path
+    elif delta_path.exists():
+        tmp_path.write_bytes(_apply_delta(delta_path, _base_path(csv_path, snapshot_suffix)))
+        source = delta_path
+    else:
         logger.warning(f"Snapshot {snapshot_path} does not exist, cannot restore")
         return False
-    
-    df = pd.read_csv(snapshot_path)
-    df.to_csv(csv_path, index=False)
-    logger.debug(f"Restored: {snapshot_path} → {csv_path}")
-    return True
\ No newline at end of file
+
+    os.replace(tmp_path, csv_path)
+    csv_cache.invalidate(csv_path)
+    logger.debug(f"Restored: {source} → {csv_path}")
+    return True
+
+def copy_file(src: Union[str, Path], dst: Union[str, Path]) -> str:
+    """
+    Copy a file byte for byte, sharing extents via reflink when possible.
+
+    Returns:
+        "reflink" or "copy"
+    """
+    src, dst = Path(src), Path(dst)
+    if _FICLONE is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return "reflink"
+        except OSError:
+            # ext4/tmpfs/NTFS or cross-device: fall through to a kernel-side copy
+            pass
+    shutil.copyfile(src, dst)
+    return "copy"
+
+def _snapshot_path(csv_path: Path, suffix: str) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}{suffix}.csv")
+
+def _delta_path(csv_path: Path, suffix: str) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}{suffix}.csv.delta")
+
+def _base_path(csv_path: Path, suffix: str) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}{suffix}.base.csv")
+
+def _write_delta(csv_path: Path, base_path: Path, delta_path: Path) -> None:
+    base = base_path.read_bytes()
+    base_lines = base.splitlines(keepends=True)
+    lines = csv_path.read_bytes().splitlines(keepends=True)
+
+    # latin-1 maps every byte to one code point, so any encoding round-trips
+    changed = {
+        str(i): line.decode("latin-1")
+        for i, line in enumerate(lines)
+        if i >= len(base_lines) or line != base_lines[i]
+    }
+    delta = {"base_crc32": zlib.crc32(base), "line_count": len(lines), "changed": changed}
+    delta_path.write_text(json.dumps(delta), encoding="utf-8")
+    logger.debug(f"Delta snapshot of {csv_path}: {len(changed)}/{len(lines)} line(s) changed")
+
+def _apply_delta(delta_path: Path, base_path: Path) -> bytes:
+    delta = json.loads(delta_path.read_text(encoding="utf-8"))
+    base = base_path.read_bytes()
+    if zlib.crc32(base) != delta["base_crc32"]:
+        raise ValueError(f"Base snapshot {base_path} changed since {delta_path} was written")
+
+    lines = base.splitlines(keepends=True)[:delta["line_count"]]
+    lines.extend([b""] * (delta["line_count"] - len(lines)))
+    for index, line in delta["changed"].items():
+        lines[int(index)] = line.encode("latin-1")
+    return b"".join(lines)
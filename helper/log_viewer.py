@@ -0,0 +1,131 @@
+"""
+Log Viewer - Newest-first view of the append-only application log.
+
+Usage:
+    python -m helper.log_viewer                 # whole log, newest first
+    python -m helper.log_viewer -n 50           # last 50 records
+    python -m helper.log_viewer --level WARNING # only WARNING and above
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from helper.logger import LOG_FILE, BACKUP_COUNT
+
+BLOCK_SIZE = 64 * 1024
+# Matches the "%(asctime)s - %(levelname)s - " prefix of LOG_FORMAT
+RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - (\w+) - ")
+
+
+def iter_lines_reversed(path: Union[str, Path], block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield the lines of a file from last to first, reading it backwards by block.
+
+    Args:
+        path: File to read
+        block_size: Number of bytes read per seek
+
+    Returns:
+        Iterator of decoded lines without line endings
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b"\n")
+            # First piece may be a partial line; keep it for the next block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if remainder:
+            yield remainder.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def iter_records_newest_first(path: Union[str, Path] = LOG_FILE,
+                              include_backups: bool = True,
+                              block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield whole log records newest first, keeping multi-line records (tracebacks) in order.
+
+    Args:
+        path: Active log file
+        include_backups: Continue into rotated files (app.log.1, app.log.2, ...)
+        block_size: Number of bytes read per seek
+
+    Returns:
+        Iterator of records, each possibly spanning several lines
+    """
+    path = Path(path)
+    files = [path]
+    if include_backups:
+        files += [path.with_name(f"{path.name}.{i}") for i in range(1, BACKUP_COUNT + 1)]
+
+    for file in files:
+        if not file.exists():
+            continue
+        continuation = []
+        for line in iter_lines_reversed(file, block_size):
+            if not line and not continuation:
+                continue
+            continuation.append(line)
+            if RECORD_START.match(line):
+                yield "\n".join(reversed(continuation))
+                continuation = []
+        if continuation:
+            yield "\n".join(reversed(continuation))
+
+
+def _record_level(record: str) -> int:
+    match = RECORD_START.match(record)
+    if not match:
+        return logging.NOTSET
+    level = logging.getLevelName(match.group(1))
+    return level if isinstance(level, int) else logging.NOTSET
+
+
+def tail(path: Union[str, Path] = LOG_FILE, count: Optional[int] = None,
+         min_level: int = logging.NOTSET, include_backups: bool = True) -> Iterator[str]:
+    """Yield at most `count` records at or above `min_level`, newest first."""
+    emitted = 0
+    for record in iter_records_newest_first(path, include_backups):
+        if count is not None and emitted >= count:
+            return
+        if min_level and _record_level(record) < min_level:
+            continue
+        emitted += 1
+        yield record
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Show the application log newest first")
+    parser.add_argument("-f", "--file", default=str(LOG_FILE), help="Log file to read")
+    parser.add_argument("-n", "--lines", type=int, default=None, help="Maximum number of records")
+    parser.add_argument("--level", default="NOTSET", help="Minimum level, e.g. WARNING")
+    parser.add_argument("--no-backups", action="store_true", help="Ignore rotated log files")
+    args = parser.parse_args(argv)
+
+    min_level = logging.getLevelName(args.level.upper())
+    if not isinstance(min_level, int):
+        parser.error(f"Unknown level: {args.level}")
+
+    try:
+        for record in tail(args.file, args.lines, min_level, not args.no_backups):
+            print(record)
+    except BrokenPipeError:
+        # Allow piping into `head`
+        sys.stderr.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
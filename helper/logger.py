@@ -1,6 +1,8 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 from dotenv import load_dotenv
 from pathlib import Path
@@ -18,7 +20,60 @@ BACKUP_COUNT = 2
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 LOG_LEVEL = int(os.environ.get("LOG_LEVEL", "20"))  # 20 = INFO
 
-class TopInsertRotatingFileHandler(RotatingFileHandler):
+LOG_TOP_INSERT = os.environ.get("LOG_TOP_INSERT", "0") == "1"  # legacy newest-first file layout
+LOG_QUEUED = os.environ.get("LOG_QUEUED", "0") == "1"  # write logs from a background thread
+
+# Replace common emojis with text equivalents
+UNICODE_REPLACEMENTS = {
+    '🔧': '[TOOL]',
+    '🚗': '[CAR]',
+    '⚙️': '[GEAR]',
+    '✅': '[OK]',
+    '🆕': '[NEW]',
+    '♻️': '[RECYCLE]',
+    '⚠️': '[WARNING]',
+    '❌': '[ERROR]',
+    '🛑': '[STOP]',
+    '🔍': '[SEARCH]',
+    '🧹': '[CLEAN]',
+    '🔄': '[REFRESH]',
+    '🚀': '[ROCKET]',
+    '💾': '[SAVE]',
+    '📂': '[FOLDER]',
+    '🗑️': '[TRASH]',
+    '🔓': '[UNLOCK]',
+    '⏳': '[WAIT]'
+}
+
+class UnicodeCleaningMixin:
+    def _clean_unicode(self, text: str) -> str:
+        """Clean Unicode characters that may cause encoding issues on Windows."""
+        for emoji, replacement in UNICODE_REPLACEMENTS.items():
+            if emoji in text:
+                text = text.replace(emoji, replacement)
+
+        # Remove any other non-ASCII characters that might cause issues
+        try:
+            text.encode('ascii', errors='ignore').decode('ascii')
+        except:
+            # If still having issues, remove all non-ASCII characters
+            text = ''.join(char for char in text if ord(char) < 128)
+
+        return text
+
+class AppendRotatingFileHandler(UnicodeCleaningMixin, RotatingFileHandler):
+    """
+    Append-only rotating handler, newest record at the end of the file.
+    Use `python -m helper.log_viewer` for a newest-first view.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        return self._clean_unicode(super().format(record))
+
+class TopInsertRotatingFileHandler(UnicodeCleaningMixin, RotatingFileHandler):
+    """
+    Legacy handler that rewrites the whole file to keep the newest record on top.
+    Costs O(file size) per record; enable with LOG_TOP_INSERT=1.
+    """
     def emit(self, record: logging.LogRecord) -> None:
         try:
             if self.shouldRollover(record):
@@ -36,42 +91,6 @@ class TopInsertRotatingFileHandler(RotatingFileHandler):
                 f.write(f"{clean_record}\n{content}")
         except Exception:
             self.handleError(record)
-    
-    def _clean_unicode(self, text: str) -> str:
-        """Clean Unicode characters that may cause encoding issues on Windows."""
-        # Replace common emojis with text equivalents
-        replacements = {
-            '🔧': '[TOOL]',
-            '🚗': '[CAR]', 
-            '⚙️': '[GEAR]',
-            '✅': '[OK]',
-            '🆕': '[NEW]',
-            '♻️': '[RECYCLE]',
-            '⚠️': '[WARNING]',
-            '❌': '[ERROR]',
-            '🛑': '[STOP]',
-            '🔍': '[SEARCH]',
-            '🧹': '[CLEAN]',
-            '🔄': '[REFRESH]',
-            '🚀': '[ROCKET]',
-            '💾': '[SAVE]',
-            '📂': '[FOLDER]',
-            '🗑️': '[TRASH]',
-            '🔓': '[UNLOCK]',
-            '⏳': '[WAIT]'
-        }
-        
-        for emoji, replacement in replacements.items():
-            text = text.replace(emoji, replacement)
-        
-        # Remove any other non-ASCII characters that might cause issues
-        try:
-            text.encode('ascii', errors='ignore').decode('ascii')
-        except:
-            # If still having issues, remove all non-ASCII characters
-            text = ''.join(char for char in text if ord(char) < 128)
-        
-        return text
 
 class LogColorerFormatter(logging.Formatter):
     def __init__(self, fmt=None, datefmt=None, style="%"):
@@ -96,6 +115,9 @@ class LogColorerFormatter(logging.Formatter):
 
 class LoggerSingleton:
     _instance: Optional[logging.Logger] = None
+    _listener: Optional[QueueListener] = None
+    _queue: Optional[queue.Queue] = None
+    _listening: bool = False  # the listener thread is running
 
     @classmethod
     def get_logger(cls) -> logging.Logger:
@@ -103,15 +125,28 @@ class LoggerSingleton:
             cls._instance = cls.setup_logger()
         return cls._instance
 
-    @staticmethod
-    def setup_logger() -> logging.Logger:
+    @classmethod
+    def setup_logger(cls, queued: bool = LOG_QUEUED) -> logging.Logger:
+        """
+        Configure the application logger.
+
+        Args:
+            queued: Hand records to a QueueHandler and let a background listener
+                thread own the file and console handlers, so callers never wait on I/O.
+        """
+        cls.shutdown()
+
         logger = logging.getLogger("application_logger")
         logger.setLevel(LOG_LEVEL)
-        logger.handlers.clear()  # Clear any existing handlers to avoid duplicates
+        # Close and remove any existing handlers to avoid duplicates and leaked log files
+        for handler in list(logger.handlers):
+            handler.close()
+        logger.handlers.clear()
         logger.propagate = False  # Prevent propagation to parent loggers
 
         # File handler with UTF-8 encoding
-        file_handler = TopInsertRotatingFileHandler(
+        handler_cls = TopInsertRotatingFileHandler if LOG_TOP_INSERT else AppendRotatingFileHandler
+        file_handler = handler_cls(
             str(LOG_FILE), mode="a", maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT, encoding="utf-8", delay=False
         )
         file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
@@ -122,10 +157,54 @@ class LoggerSingleton:
         console_handler.setFormatter(LogColorerFormatter(LOG_FORMAT))
         console_handler.setLevel(LOG_LEVEL)
 
+        if queued:
+            cls._queue = queue.Queue(-1)
+            cls._listener = QueueListener(cls._queue, file_handler, console_handler, respect_handler_level=True)
+            cls._listener.start()
+            cls._listening = True
+            logger.addHandler(QueueHandler(cls._queue))
+            return logger
+
         # Add handlers
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
 
         return logger
 
+    @classmethod
+    def flush(cls) -> None:
+        """Block until every queued record has been written, then flush the handlers."""
+        listener = cls._listener
+        if listener is None or not cls._listening:
+            return
+        cls._queue.join()
+        for handler in listener.handlers:
+            handler.flush()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Drain and stop the background listener.
+        Its handlers are moved back onto the logger so later records are still written.
+        """
+        listener = cls._listener
+        if listener is None:
+            return
+        cls._listener = None
+        cls._queue = None
+        if cls._listening:
+            cls._listening = False
+            listener.stop()
+
+        logger = logging.getLogger("application_logger")
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        for handler in listener.handlers:
+            handler.flush()
+            logger.addHandler(handler)
+
+# Runs before logging's own shutdown hook, which would close the handlers first
+atexit.register(LoggerSingleton.shutdown)
+
 logger = LoggerSingleton.get_logger()
\ No newline at end of file
@@ -10,9 +10,9 @@ class ProjectPaths:
 
     @staticmethod
     def _get_csv_data(filename: str):
-        """Helper method to get CSV data."""
+        """Helper method to get CSV data; unchanged files are served from the in-process cache."""
         p = ProjectPaths.DATA / filename
-        df = read_csv(p)
+        df = read_csv(p, cached=True)
         return df, p
 
     @staticmethod
@@ -0,0 +1,235 @@
+"""
+Step Events - Structured JSONL timing log for UI actions and page-object steps.
+
+Enable with STEP_EVENTS=1. Each traced call appends one JSON line to
+tests/test-results/logs/step_events.jsonl:
+
+    {"kind": "action", "name": "ElementActions.click", "target": "//button",
+     "start": 1234.5, "end": 1234.9, "duration_ms": 400.1, "outcome": "ok",
+     "test": "tests/test_gate_pickup.py::test_workflow", "worker": "main", "pid": 4242}
+
+Usage:
+    python -m helper.step_events              # p50/p95/total per locator, keystroke call and step
+    python -m helper.step_events --top 20 --file path/to/step_events.jsonl
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from helper.logger import LOG_DIR
+
+STEP_EVENTS = os.environ.get("STEP_EVENTS", "0") == "1"
+STEP_EVENTS_FILE = Path(os.environ.get("STEP_EVENTS_FILE", LOG_DIR / "step_events.jsonl"))
+
+
+class StepEventSink:
+    """Thread-safe JSONL writer for step events."""
+
+    def __init__(self, path: Union[str, Path] = STEP_EVENTS_FILE, enabled: bool = STEP_EVENTS):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._file = None
+        self._lock = threading.Lock()
+
+    def emit(self, kind: str, name: str, target: Any, start: float, end: float,
+             outcome: str, **extra: Any) -> None:
+        event = {
+            "kind": kind,
+            "name": name,
+            "target": None if target is None else str(target),
+            "start": start,
+            "end": end,
+            "duration_ms": round((end - start) * 1000, 3),
+            "outcome": outcome,
+            "test": _current_test(),
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+            "pid": os.getpid(),
+        }
+        event.update(extra)
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+sink = StepEventSink()
+atexit.register(sink.close)
+
+
+def _current_test() -> Optional[str]:
+    # pytest sets "path::test_name (call)" while a test is running
+    current = os.environ.get("PYTEST_CURRENT_TEST")
+    return current.rsplit(" ", 1)[0] if current else None
+
+
+def _outcome(result: Any) -> str:
+    if result is None:
+        return "none"
+    if result is False:
+        return "false"
+    return "ok"
+
+
+def traced(kind: str, target_arg: Optional[int] = None) -> Callable:
+    """
+    Decorator that records one step event per call.
+
+    Args:
+        kind: Event category, e.g. "action", "property", "keys", "window", "step"
+        target_arg: Index of the positional argument holding the XPath or window pattern
+    """
+    def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not sink.enabled:
+                return func(*args, **kwargs)
+
+            target = args[target_arg] if target_arg is not None and len(args) > target_arg else None
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                sink.emit(kind, name, target, start, time.monotonic(), "error", error=type(e).__name__)
+                raise
+            sink.emit(kind, name, target, start, time.monotonic(), _outcome(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def step(name: str, kind: str = "step") -> Iterator[None]:
+    """Record a named block, e.g. alongside `allure.step` in a workflow test."""
+    if not sink.enabled:
+        yield
+        return
+
+    start = time.monotonic()
+    try:
+        yield
+    except Exception as e:
+        sink.emit(kind, name, None, start, time.monotonic(), "error", error=type(e).__name__)
+        raise
+    sink.emit(kind, name, None, start, time.monotonic(), "ok")
+
+
+def read_events(path: Union[str, Path] = STEP_EVENTS_FILE) -> Iterator[Dict[str, Any]]:
+    """Yield events from a JSONL file, skipping partially written lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(events: Iterator[Dict[str, Any]], kinds: Optional[tuple] = None,
+              key: Callable[[Dict[str, Any]], str] = lambda e: e["name"]) -> List[Dict[str, Any]]:
+    """
+    Aggregate durations per key.
+
+    Args:
+        events: Step events as produced by `read_events`
+        kinds: Only include these event kinds (all kinds if None)
+        key: Function mapping an event to its group key
+
+    Returns:
+        Rows with count, errors, total/p50/p95/max in ms, sorted by total time descending
+    """
+    durations = defaultdict(list)
+    errors = defaultdict(int)
+    for event in events:
+        if kinds is not None and event.get("kind") not in kinds:
+            continue
+        group = key(event)
+        durations[group].append(event["duration_ms"])
+        if event.get("outcome") == "error":
+            errors[group] += 1
+
+    rows = []
+    for group, values in durations.items():
+        values.sort()
+        rows.append({
+            "key": group,
+            "count": len(values),
+            "errors": errors[group],
+            "total_ms": round(sum(values), 3),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "max_ms": values[-1],
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def format_table(title: str, rows: List[Dict[str, Any]], top: Optional[int] = None) -> str:
+    lines = [title, "=" * len(title),
+             f"{'total_ms':>12} {'count':>6} {'p50_ms':>10} {'p95_ms':>10} {'max_ms':>10} {'err':>4}  key"]
+    for row in rows[:top]:
+        lines.append(f"{row['total_ms']:>12.1f} {row['count']:>6} {row['p50_ms']:>10.1f} "
+                     f"{row['p95_ms']:>10.1f} {row['max_ms']:>10.1f} {row['errors']:>4}  {row['key']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize step event timings")
+    parser.add_argument("-f", "--file", default=str(STEP_EVENTS_FILE), help="JSONL event file")
+    parser.add_argument("--test", default=None, help="Only events from this test node id")
+    parser.add_argument("--top", type=int, default=None, help="Show only the N slowest rows")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    events = [e for e in read_events(args.file) if args.test is None or e.get("test") == args.test]
+    per_locator = summarize(events, kinds=("action", "property", "window"),
+                            key=lambda e: f"{e['name']} {e['target']}")
+    # Keystrokes have no locator; group them by the sending function
+    per_keys = summarize(events, kinds=("keys",))
+    per_step = summarize(events, kinds=("step",))
+
+    if args.json:
+        print(json.dumps({"per_locator": per_locator, "per_keys": per_keys, "per_step": per_step}, indent=2))
+    else:
+        print(format_table("Per locator", per_locator, args.top))
+        print()
+        print(format_table("Per keystroke call", per_keys, args.top))
+        print()
+        print(format_table("Per step", per_step, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""
+Stowage Grid - Vessel bay plan as a compact bay x row x tier NumPy array.
+
+Every cell holds a uint8 of flags (exists, occupied, planned, 20/40/45 ft slot).
+Indices are the digits of `StowageCell_ISO` (bay * 10000 + row * 100 + tier),
+so a grid covers bays/rows/tiers 0-99 in 1 MB. Grids can be backed by a
+memory-mapped .npy file and shared between processes or runs.
+
+Usage:
+    grid = StowageGrid.from_dataframe(df, path="data/vessel_discharge.grid.npy")
+    codes = grid.first_free(bays=[1, 3], tiers=[82, 84], rows=range(13), count=10)
+    grid.occupy(codes)
+
+    grid = StowageGrid.open("data/vessel_discharge.grid.npy", mode="r")
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from helper.logger import logger
+
+EXISTS = 1
+OCCUPIED = 2
+PLANNED = 4
+SIZE_20 = 8
+SIZE_40 = 16
+SIZE_45 = 32
+
+GRID_SHAPE = (100, 100, 100)  # bay, row, tier
+# ISO 6346 length code (first character of the size/type) -> flag
+_SIZE_FLAGS = {"2": SIZE_20, "4": SIZE_40, "L": SIZE_45}
+
+
+def encode(bays, rows, tiers) -> np.ndarray:
+    """Vectorized (bay, row, tier) -> StowageCell_ISO integer."""
+    return (np.asarray(bays, dtype=np.int64) * 10000
+            + np.asarray(rows, dtype=np.int64) * 100
+            + np.asarray(tiers, dtype=np.int64))
+
+
+def decode(codes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized StowageCell_ISO -> (bays, rows, tiers).
+
+    Raises:
+        ValueError: If a code does not fit in six digits
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    if codes.size and (codes.min() < 0 or codes.max() >= 1_000_000):
+        raise ValueError("StowageCell_ISO values must be between 000000 and 999999")
+    return codes // 10000, codes // 100 % 100, codes % 100
+
+
+class StowageGrid:
+    """Flag array indexed [bay, row, tier]."""
+
+    def __init__(self, cells: np.ndarray):
+        if cells.shape != GRID_SHAPE or cells.dtype != np.uint8:
+            raise ValueError(f"Expected a uint8 array of shape {GRID_SHAPE}, got {cells.dtype} {cells.shape}")
+        self.cells = cells
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, path: Optional[Union[str, Path]] = None,
+                       cell_column: str = "StowageCell_ISO", container_column: str = "ContainerNum",
+                       planned_column: str = "planned", size_column: str = "EquipmentSizeType") -> "StowageGrid":
+        """
+        Build a grid from discharge rows; missing optional columns are skipped.
+
+        Args:
+            df: Rows with at least `cell_column`
+            path: Write the grid to this memory-mapped .npy file instead of RAM
+        """
+        if path is None:
+            cells = np.zeros(GRID_SHAPE, dtype=np.uint8)
+        else:
+            cells = np.lib.format.open_memmap(Path(path), mode="w+", dtype=np.uint8, shape=GRID_SHAPE)
+            cells[:] = 0
+
+        index = decode(df[cell_column].to_numpy())
+        flags = np.full(len(df), EXISTS, dtype=np.uint8)
+        if container_column in df:
+            containers = df[container_column]
+            flags[(containers.notna() & (containers != "")).to_numpy()] |= OCCUPIED
+        if planned_column in df:
+            flags[(df[planned_column] == "Yes").to_numpy()] |= PLANNED
+        if size_column in df:
+            length_codes = df[size_column].astype(str).str[0]
+            for code, flag in _SIZE_FLAGS.items():
+                flags[(length_codes == code).to_numpy()] |= flag
+
+        # Several rows for one cell combine their flags
+        np.bitwise_or.at(cells, index, flags)
+        grid = cls(cells)
+        if path is not None:
+            grid.flush()
+            logger.debug("Wrote stowage grid for %d rows to %s", len(df), path)
+        return grid
+
+    @classmethod
+    def open(cls, path: Union[str, Path], mode: str = "r+") -> "StowageGrid":
+        """Memory-map a grid written by `from_dataframe(path=...)` or `save`."""
+        return cls(np.load(Path(path), mmap_mode=mode))
+
+    def save(self, path: Union[str, Path]) -> None:
+        np.save(Path(path), np.asarray(self.cells))
+
+    def flush(self) -> None:
+        if isinstance(self.cells, np.memmap):
+            self.cells.flush()
+
+    @property
+    def exists(self) -> np.ndarray:
+        return (self.cells & EXISTS).astype(bool)
+
+    @property
+    def occupied(self) -> np.ndarray:
+        return (self.cells & OCCUPIED).astype(bool)
+
+    @property
+    def planned(self) -> np.ndarray:
+        return (self.cells & PLANNED).astype(bool)
+
+    @property
+    def free(self) -> np.ndarray:
+        """Cells that exist and hold no container."""
+        return (self.cells & (EXISTS | OCCUPIED)) == EXISTS
+
+    def cells_where(self, mask: np.ndarray) -> np.ndarray:
+        """StowageCell_ISO codes of every True cell in a grid-shaped mask, in code order."""
+        return encode(*np.nonzero(mask))
+
+    def is_free(self, codes) -> np.ndarray:
+        return (self.cells[decode(codes)] & (EXISTS | OCCUPIED)) == EXISTS
+
+    def size_of(self, codes) -> np.ndarray:
+        """Slot length in feet (20/40/45) per code, 0 when unknown."""
+        flags = self.cells[decode(codes)]
+        return np.select([flags & SIZE_20 > 0, flags & SIZE_40 > 0, flags & SIZE_45 > 0], [20, 40, 45], 0)
+
+    def free_per_bay(self) -> np.ndarray:
+        """Free cell count indexed by bay number."""
+        return self.free.sum(axis=(1, 2))
+
+    def first_free(self, bays: Iterable[int], tiers: Iterable[int], rows: Iterable[int],
+                   count: Optional[int] = None) -> np.ndarray:
+        """
+        Free cells in fill order: bay (as listed), then tier (as listed), then row (as listed).
+
+        Returns:
+            Up to `count` StowageCell_ISO codes
+        """
+        bays, tiers, rows = (np.asarray(list(v), dtype=np.int64) for v in (bays, tiers, rows))
+        # [bay, row, tier] -> [bay, tier, row] so C-order flattening follows the fill order
+        block = self.free[np.ix_(bays, rows, tiers)].transpose(0, 2, 1)
+        b, t, r = np.nonzero(block)
+        codes = encode(bays[b], rows[r], tiers[t])
+        return codes if count is None else codes[:count]
+
+    def occupy(self, codes) -> None:
+        self.cells[decode(codes)] |= OCCUPIED
+
+    def release(self, codes) -> None:
+        self.cells[decode(codes)] &= np.uint8(~OCCUPIED & 0xFF)
@@ -0,0 +1,157 @@
+"""
+Stowage Index - O(1) occupancy lookups for vessel discharge data.
+
+`StowageCell_ISO` encodes a cell as bay * 10000 + row * 100 + tier
+(bay 1, row 00, tier 82 -> 10082). The index is built once from the discharge
+DataFrame and kept in sync by `assign`, so allocation loops no longer scan the
+whole table for every candidate cell.
+
+Usage:
+    index = StowageIndex(df)
+    key = index.first_free(1, tiers=[82, 84], rows=range(13))
+    if key is not None:
+        label = index.assign(key, "DISH100051")
+        df.loc[label, "ContainerNum"] = "DISH100051"
+"""
+
+from collections import Counter, defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from helper.stowage_grid import StowageGrid
+
+Cell = Tuple[int, int, int]  # (bay, row, tier)
+
+
+def encode_stowage(bay: int, row: int, tier: int) -> int:
+    """(1, 0, 82) -> 10082"""
+    return bay * 10000 + row * 100 + tier
+
+
+def decode_stowage(stowage: int) -> Cell:
+    """10082 -> (1, 0, 82)"""
+    stowage = int(stowage)
+    return stowage // 10000, stowage // 100 % 100, stowage % 100
+
+
+def free_cells_in_order(df: pd.DataFrame, bays: Sequence[int], tiers: Sequence[int],
+                        rows: Sequence[int], count: int, cell_column: str = "StowageCell_ISO",
+                        container_column: str = "ContainerNum", grid: Optional[StowageGrid] = None) -> np.ndarray:
+    """
+    Positions of the first `count` free cells in fill order, found on a StowageGrid.
+
+    Fill order is bay (as listed), then tier (as listed), then row (as listed),
+    matching repeated `StowageIndex.first_free` calls. A cell is free when no
+    row for it holds a container; the first row for each cell is returned.
+
+    Args:
+        grid: Occupancy kept in sync with `df` by the caller; built from `df` when omitted
+
+    Returns:
+        Integer positions (for `df.iloc` / `df.index[...]`)
+    """
+    if grid is None:
+        grid = StowageGrid.from_dataframe(df, cell_column=cell_column, container_column=container_column)
+    free_codes = grid.first_free(bays, tiers, rows, count)
+
+    # First row holding each cell
+    codes, first_positions = np.unique(df[cell_column].to_numpy(dtype=np.int64), return_index=True)
+    return first_positions[np.searchsorted(codes, free_codes)]
+
+
+class StowageIndex:
+    """Occupancy of every (bay, row, tier) cell with per-bay free counters."""
+
+    def __init__(self, df: pd.DataFrame, cell_column: str = "StowageCell_ISO",
+                 bay_column: str = "Bay", container_column: str = "ContainerNum",
+                 planned_column: str = "planned"):
+        """
+        Args:
+            df: Discharge DataFrame; only read here, callers write assignments back
+            cell_column: Integer-encoded stowage position
+            bay_column: Bay label such as "01D" / "01H"
+            container_column: Container number, empty when the cell is free
+            planned_column: "Yes" when the cell is planned
+        """
+        # cell -> DataFrame index labels holding that cell (normally exactly one)
+        self._labels: Dict[Cell, List[Hashable]] = defaultdict(list)
+        self._bay_labels: Dict[Cell, List[str]] = defaultdict(list)
+        # cell -> number of occupied rows for that cell
+        self._occupied: Counter = Counter()
+        self._planned: Set[Cell] = set()
+        # bay number -> free cells, bay label -> occupied rows
+        self._bay_free: Counter = Counter()
+        self._label_used: Counter = Counter()
+
+        containers = df[container_column]
+        empty = (containers.isna() | (containers == "")).to_numpy()
+        planned = (df[planned_column] == "Yes").to_numpy()
+
+        for label, stowage, bay, is_empty, is_planned in zip(
+                df.index, df[cell_column].to_numpy(), df[bay_column].to_numpy(), empty, planned):
+            cell = decode_stowage(stowage)
+            self._labels[cell].append(label)
+            self._bay_labels[cell].append(bay)
+            if not is_empty:
+                self._occupied[cell] += 1
+                self._label_used[bay] += 1
+            if is_planned:
+                self._planned.add(cell)
+
+        for cell in self._labels:
+            if not self._occupied[cell]:
+                self._bay_free[cell[0]] += 1
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self._labels
+
+    def is_free(self, cell: Cell) -> bool:
+        """True if the cell exists and no row for it holds a container."""
+        return cell in self._labels and not self._occupied[cell]
+
+    def is_planned(self, cell: Cell) -> bool:
+        return cell in self._planned
+
+    def free_in_bay(self, bay: int) -> int:
+        """Number of free cells with this bay number (deck and hold)."""
+        return self._bay_free[bay]
+
+    def bay_is_empty(self, bay_label: str) -> bool:
+        """True if no row with this Bay label holds a container (unknown labels are empty)."""
+        return not self._label_used[bay_label]
+
+    def first_free(self, bay: int, tiers: Iterable[int], rows: Iterable[int]) -> Optional[Cell]:
+        """
+        First free cell in `bay`, scanning tier first, then row.
+
+        Returns:
+            (bay, row, tier) or None when no listed cell is free
+        """
+        if not self._bay_free[bay]:
+            return None
+        rows = list(rows)
+        for tier in tiers:
+            for row in rows:
+                cell = (bay, row, tier)
+                if self.is_free(cell):
+                    return cell
+        return None
+
+    def assign(self, cell: Cell, container_id: Any) -> Hashable:
+        """
+        Mark `cell` occupied by `container_id`.
+
+        Returns:
+            Index label of the DataFrame row to update
+
+        Raises:
+            ValueError: If the cell does not exist or is already occupied
+        """
+        if not self.is_free(cell):
+            raise ValueError(f"Cannot assign {container_id} to occupied or unknown cell {cell}")
+        self._occupied[cell] += 1
+        self._bay_free[cell[0]] -= 1
+        self._label_used[self._bay_labels[cell][0]] += 1
+        return self._labels[cell][0]
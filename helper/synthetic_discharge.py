@@ -0,0 +1,56 @@
+"""
+Synthetic vessel discharge tables.
+
+Same columns as data/vessel_discharge_data.csv, generated from a fixed seed so
+tests and benchmarks (benchmarks/bench_discharge.py) work on identical data.
+"""
+
+import numpy as np
+import pandas as pd
+
+from helper.stowage_grid import encode
+
+# Bay numbers as on the sample vessel: multiples of 4 are 40 ft bay labels, not cells
+BAYS = [bay for bay in range(1, 100) if bay % 4 != 0]
+DECK_TIERS, HOLD_TIERS = list(range(80, 100, 2)), list(range(2, 20, 2))
+
+
+def synthetic_discharge(cells: int, seed: int = 42, occupancy: float = 0.05) -> pd.DataFrame:
+    """
+    Discharge table with about `cells` stowage cells.
+
+    Rows grow first; very large tables also use every tier (deck 50-99, hold 0-49)
+    so they still fit six-digit StowageCell_ISO codes. The first `occupancy` of
+    cells in code order hold planned containers, like the sample data.
+    """
+    rng = np.random.default_rng(seed)
+    tiers = DECK_TIERS + HOLD_TIERS
+    if cells > len(BAYS) * len(tiers) * 100:
+        tiers = list(range(100))
+    rows = min(100, -(-cells // (len(BAYS) * len(tiers))))
+    if cells > len(BAYS) * len(tiers) * rows:
+        raise ValueError(f"Cannot fit {cells} cells in six-digit StowageCell_ISO codes")
+
+    bay, row, tier = (a.ravel() for a in np.meshgrid(BAYS, range(rows), tiers, indexing="ij"))
+    keep = np.sort(rng.choice(bay.size, size=cells, replace=False))
+    bay, row, tier = bay[keep], row[keep], tier[keep]
+    deck = tier >= (80 if len(tiers) < 100 else 50)
+    codes = encode(bay, row, tier)
+
+    occupied = np.zeros(cells, dtype=bool)
+    occupied[:int(cells * occupancy)] = True
+    container_nums = np.where(occupied, np.char.add("SYNT", np.char.zfill(np.arange(cells).astype(str), 6)), None)
+
+    return pd.DataFrame({
+        "ContainerNum": container_nums,
+        "EquipmentSizeType": rng.choice([2010, 4010], size=cells),
+        "FullEmptyInd": "F",
+        "PartyInfo_BIC": "NVD",
+        "Bay": np.char.add(np.char.zfill(bay.astype(str), 2), np.where(deck, "D", "H")),
+        "StowageCell_ISO": codes,
+        "planned": np.where(occupied, "Yes", None),
+        "vesselStructure.bays.bay.bayId.bayNo": bay,
+        "vesselStructure.bays.bay.bayId.deckHoldId": np.where(deck, "D", "H"),
+        "vesselStructure.bays.bay.cells.item.row": row,
+        "vesselStructure.bays.bay.cells.item.tier": tier,
+    })
@@ -3,26 +3,29 @@ import pywinauto
 from typing import Optional
 from pywinauto.keyboard import send_keys
 from helper.logger import logger
+from helper.step_events import traced
 
+@traced("keys")
 def sendkeys(keys: str, with_tab: bool = False, field_length: Optional[int] = None) -> None:
     should_send_tab = with_tab or (field_length is not None and len(keys) < field_length)
 
-    logger.info(f"Sending keys: {keys}{' + TAB' if should_send_tab else ''}")
+    logger.info("Sending keys: %s%s", keys, " + TAB" if should_send_tab else "")
     send_keys(keys)
     if should_send_tab:
         send_keys("{TAB}")
 
+@traced("window", target_arg=0)
 def wait_for_window(title: str, timeout: int = 10) -> None:
     """Wait for a window with the given title to appear."""
     import time
-    logger.info(f"Waiting for window: {title} (timeout={timeout}s)")
+    logger.info("Waiting for window: %s (timeout=%ss)", title, timeout)
     for _ in range(timeout * 2):  # 0.5s intervals
         windows = pywinauto.findwindows.find_windows(title_re=title)
         if windows:
-            logger.info(f"Found window: {windows}")
+            logger.info("Found window: %s", windows)
             return windows
         time.sleep(0.5)
-    logger.warning(f"Window not found: {title} after {timeout}s")
+    logger.warning("Window not found: %s after %ss", title, timeout)
     return None
 
 def find_window(title: str, exact_match: bool = False) -> list:
@@ -41,7 +44,7 @@ def focus_window(title: str, exact_match: bool = False) -> bool:
             windows = pywinauto.findwindows.find_windows(title_re=title)
         
         if not windows:
-            logger.warning(f"No windows found with title: {title}")
+            logger.warning("No windows found with title: %s", title)
             return False
         
         # Try each matching window until one succeeds
@@ -51,17 +54,17 @@ def focus_window(title: str, exact_match: bool = False) -> bool:
                 app = pywinauto.Application().connect(handle=window_handle)
                 window = app.window(handle=window_handle)
                 window.set_focus()
-                logger.info(f"Successfully brought window to front: {title} (handle: {window_handle})")
+                logger.info("Successfully brought window to front: %s (handle: %s)", title, window_handle)
                 return True
             except Exception as window_error:
-                logger.debug(f"Failed to focus window handle {window_handle}: {window_error}")
+                logger.debug("Failed to focus window handle %s: %s", window_handle, window_error)
                 continue
         
-        logger.warning(f"All windows with title '{title}' failed to activate")
+        logger.warning("All windows with title '%s' failed to activate", title)
         return False
         
     except Exception as e:
-        logger.error(f"Error bringing window to front by title '{title}': {e}")
+        logger.error("Error bringing window to front by title '%s': %s", title, e)
         return False
 
 def main():
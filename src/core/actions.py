@@ -6,41 +6,46 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from helper.logger import logger
 from helper.win_utils import sendkeys
+from helper.step_events import traced
 
 class ElementActions:
     def __init__(self, driver):
         self.driver = driver
 
+    @traced("action", target_arg=1)
     def find(self, xpath, timeout=10):
         try:
             self.driver.implicitly_wait(timeout)
             wait = WebDriverWait(self.driver, timeout)
             wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
             element = self.driver.find_element(By.XPATH, xpath)
-            logger.info(f"Element found: {xpath}")
+            logger.info("Element found: %s", xpath)
             return element
         except (WebDriverException, TimeoutException) as e:
-            logger.warning(f"Element not found: {xpath} after {timeout} seconds")
+            logger.warning("Element not found: %s after %s seconds", xpath, timeout)
             return None
         finally:
             self.driver.implicitly_wait(10)  # Reset implicit wait to default
 
+    @traced("action", target_arg=1)
     def click(self, xpath, timeout=10):
         element = self.find(xpath, timeout)
         try:
             element.click()
-            logger.info(f"Clicked on element: {xpath}")
+            logger.info("Clicked on element: %s", xpath)
         except Exception as e:
             raise Exception(f"Failed to click on element: {xpath} - {e}")
 
+    @traced("action", target_arg=1)
     def set_text(self, xpath, text, timeout=10):
         try:
             self.click(xpath, timeout)
             sendkeys(text)
         except Exception as e:
-            logger.error(f"Failed to set text for element: {xpath} - {e}")
+            logger.error("Failed to set text for element: %s - %s", xpath, e)
             raise
 
+    @traced("action", target_arg=1)
     def right_click(self, xpath, timeout=10):
         element = self.find(xpath, timeout)
         try:
@@ -53,10 +58,11 @@ class ElementActions:
 
             mouse.right_click(coords=(screen_x, screen_y))
 
-            logger.info(f"Right clicked on element: {xpath}")
+            logger.info("Right clicked on element: %s", xpath)
         except Exception as e:
             raise Exception(f"Failed to right-click on element: {xpath} - {e}")
 
+    @traced("action", target_arg=1)
     def drag_release(self, xpath, offset_x, offset_y, target_x, target_y, timeout=10):
         element = self.find(xpath, timeout)
         try:
@@ -73,7 +79,7 @@ class ElementActions:
             pyautogui.moveTo(screen_x + target_x, screen_y + target_y, duration=1)
             pyautogui.mouseUp()
 
-            logger.info(f"Dragged element: {xpath}")
+            logger.info("Dragged element: %s", xpath)
         except Exception as e:
-            logger.error(f"Failed to drag element: {xpath} - {e}")
+            logger.error("Failed to drag element: %s - %s", xpath, e)
             raise
\ No newline at end of file
@@ -1,58 +1,64 @@
 from selenium.webdriver.common.by import By
 from helper.logger import logger
+from helper.step_events import traced
 
 class ElementProperties:
     def __init__(self, driver):
         self.driver = driver
 
+    @traced("property", target_arg=1)
     def visible(self, xpath: str, timeout: int = 10) -> bool:
         try:
             self.driver.implicitly_wait(timeout)
             element = self.driver.find_element(By.XPATH, xpath)
             is_visible = element.get_dom_attribute("visible") == "True"
-            logger.info(f"Element visibility for {xpath}: {is_visible}")
+            logger.info("Element visibility for %s: %s", xpath, is_visible)
             return is_visible
         except Exception as e:
-            logger.error(f"Visibility check failed for {xpath}: {e}")
+            logger.error("Visibility check failed for %s: %s", xpath, e)
             return False
         finally:
             self.driver.implicitly_wait(10)  # Reset implicit wait to default
 
+    @traced("property", target_arg=1)
     def editable(self, xpath: str, timeout: int = 10) -> bool:
         try:
             self.driver.implicitly_wait(timeout)
             element = self.driver.find_element(By.XPATH, xpath)
             is_editable = element.get_dom_attribute("editable") == "True"
-            logger.info(f"Element editability for {xpath}: {is_editable}")
+            logger.info("Element editability for %s: %s", xpath, is_editable)
             return is_editable
         except Exception as e:
-            logger.error(f"Editability check failed for {xpath}: {e}")
+            logger.error("Editability check failed for %s: %s", xpath, e)
             return False
         finally:
             self.driver.implicitly_wait(10)  # Reset implicit wait to default
 
+    @traced("property", target_arg=1)
     def enabled(self, xpath: str, timeout: int = 10) -> bool:
         try:
             self.driver.implicitly_wait(timeout)
             element = self.driver.find_element(By.XPATH, xpath)
             is_enabled = element.get_dom_attribute("enabled") == "True"
-            logger.info(f"Element editability for {xpath}: {is_enabled}")
+            logger.info("Element enabled state for %s: %s", xpath, is_enabled)
             return is_enabled
         except Exception as e:
-            logger.error(f"Enabled check failed for {xpath}: {e}")
+            logger.error("Enabled check failed for %s: %s", xpath, e)
             return False
 
+    @traced("property", target_arg=1)
     def selected(self, xpath: str, timeout: int = 10) -> bool:
         try:
             self.driver.implicitly_wait(timeout)
             element = self.driver.find_element(By.XPATH, xpath)
             is_selected = element.get_dom_attribute("selected") == "True"
-            logger.info(f"Element selected state for {xpath}: {is_selected}")
+            logger.info("Element selected state for %s: %s", xpath, is_selected)
             return is_selected
         except Exception as e:
-            logger.error(f"Selected check failed for {xpath}: {e}")
+            logger.error("Selected check failed for %s: %s", xpath, e)
             return False
 
+    @traced("property", target_arg=1)
     def get_row_index(self, xpath: str, timeout: int = 10) -> int | None:
         try:
             self.driver.implicitly_wait(timeout)
@@ -62,14 +68,16 @@ class ElementProperties:
         except Exception as e:
             return None
 
+    @traced("property", target_arg=1)
     def item_text(self, xpath: str, timeout: int = 10) -> str:
         self.driver.implicitly_wait(timeout)
         element = self.driver.find_element(By.XPATH, xpath)
         text = element.get_dom_attribute("selectedItemText")
         return text
 
+    @traced("property", target_arg=1)
     def text_value(self, xpath: str) -> str:
         element = self.driver.find_element(By.XPATH, xpath)
         text = element.text
-        logger.info(f"Text value for {xpath}: {text}")
+        logger.info("Text value for %s: %s", xpath, text)
         return text
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 import os
 import time
 import pandas as pd
@@ -5,11 +6,14 @@ import pandas as pd
 from pathlib import Path
 from pandas.errors import EmptyDataError
 from src.core.driver import BaseDriver
-from helper.http.TAS_service import AppointmentService
+from helper.http.TAS_service import AppointmentService, appointment_created
 from helper.logger import logger
 from helper.paths import ProjectPaths
+from helper.data_store import CsvStore, write_csv_atomic
 from helper.win_utils import wait_for_window, sendkeys, find_window
 from src.common.menu import Menu
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class GateTransaction(BaseDriver):
     MODULE = "GT"
@@ -27,6 +31,8 @@ class GateTransaction(BaseDriver):
         self.gross_wt = "17500"
         self.max_gross = "32000"
 
+    @traced("step")
+    @debug_out_line
     def create_gate_pickup(self) -> None:
         df, p = next(ProjectPaths.get_gate_pickup_data())
         self.get_tractor(df, p)
@@ -38,55 +44,66 @@ class GateTransaction(BaseDriver):
         if not self.properties.visible(self.gt["search_tractor"], timeout=1):
             Menu.to_module(self.MODULE, self)
 
-        for tractor, group in df_filtered.groupby("tractor"):
-            logger.info(f"Processing tractor group: {tractor}, size: {len(group)}")
-            if self.properties.editable(self.gt["search_tractor"]):
-                self.actions.click(self.gt["search_tractor"])
-                sendkeys(tractor)
-                sendkeys("{ENTER}")
-            else:
-                raise RuntimeError("Search tractor field not editable")
+        # Appointments for every pickup in a few concurrent round-trips instead of one per UI iteration
+        results = self.service.create_appointments(df_filtered["cntr_id"].tolist())
+        failed = [r["cntr_id"] for r in results if not appointment_created(r)]
+        if failed:
+            logger.warning(f"Skipping pickup for containers without an appointment: {failed}")
+            df_filtered = df_filtered[~df_filtered["cntr_id"].isin(failed)]
+            if df_filtered.empty:
+                raise RuntimeError("No appointment was created for any pickup")
+
+        with CsvStore(df, p) as store:
+            for tractor, group in df_filtered.groupby("tractor"):
+                logger.info(f"Processing tractor group: {tractor}, size: {len(group)}")
+                if self.properties.editable(self.gt["search_tractor"]):
+                    self.actions.click(self.gt["search_tractor"])
+                    sendkeys(tractor)
+                    sendkeys("{ENTER}")
+                else:
+                    raise RuntimeError("Search tractor field not editable")
 
-            for _, row in group.iterrows():
-                logger.info(f"Processing pickup for cntr_id: {row['cntr_id']}, tractor: {row['tractor']}, pin: {row['pin']}")
-                self.service.create_appointment(row["cntr_id"])
+                for _, row in group.iterrows():
+                    logger.info(f"Processing pickup for cntr_id: {row['cntr_id']}, tractor: {row['tractor']}, pin: {row['pin']}")
 
-                if self.properties.enabled(self.gt["pickup_btn"]):
-                    sendkeys("%1")
-                else:
-                    raise RuntimeError("Pickup button not enabled")
+                    if self.properties.enabled(self.gt["pickup_btn"]):
+                        sendkeys("%1")
+                    else:
+                        raise RuntimeError("Pickup button not enabled")
 
-                if wait_for_window("Create Pickup"):
-                    self.actions.click(self.cp["pin"])
-                    sendkeys(str(row["pin"])[:6])
-                    self.actions.click(self.cp["driver"])
-                    sendkeys(row["tractor"])
-                    sendkeys("{ENTER}")
-                else:
-                    raise RuntimeError("Create Pickup window not found")
+                    if wait_for_window("Create Pickup"):
+                        self.actions.click(self.cp["pin"])
+                        sendkeys(str(row["pin"])[:6])
+                        self.actions.click(self.cp["driver"])
+                        sendkeys(row["tractor"])
+                        sendkeys("{ENTER}")
+                    else:
+                        raise RuntimeError("Create Pickup window not found")
 
-                if wait_for_window(".*gatex0225$"):
-                    sendkeys("{ENTER}")
-                else:
-                    raise RuntimeError("gatex0225 window not found")
+                    if wait_for_window(".*gatex0225$"):
+                        sendkeys("{ENTER}")
+                    else:
+                        raise RuntimeError("gatex0225 window not found")
 
-                time.sleep(1)
-                if find_window(".*(gatex2421|gatex3276)$"):
-                    self.handle_auth_window()
+                    time.sleep(1)
+                    if find_window(".*(gatex2421|gatex3276)$"):
+                        self.handle_auth_window()
 
-                self.actions.click(self.gt["create_pickup_ok_btn"])
+                    self.actions.click(self.gt["create_pickup_ok_btn"])
 
-                if wait_for_window("Confirmation"):
-                    sendkeys("{ENTER}")
-                else:
-                    raise RuntimeError("Confirmation window not found")
+                    if wait_for_window("Confirmation"):
+                        sendkeys("{ENTER}")
+                    else:
+                        raise RuntimeError("Confirmation window not found")
 
-                df.loc[df["cntr_id"] == row["cntr_id"], "mvt"] = "C"
-                df.to_csv(p, index=False)
+                    store.update(row["cntr_id"], {"mvt": "C"})
 
-                self.actions.click(self.gt["gate_transaction_refresh_btn"])
-            self.release_print_cwp()
+                    self.actions.click(self.gt["gate_transaction_refresh_btn"])
+                self.release_print_cwp()
+                store.commit()
 
+    @traced("step")
+    @debug_out_line
     def create_gate_ground(self, df, p) -> None:
         # df, p = next(ProjectPaths.get_gate_ground_data())
         self.get_tractor(df, p)
@@ -97,113 +114,116 @@ class GateTransaction(BaseDriver):
         if not self.properties.visible(self.gt["search_tractor"], timeout=1):
             Menu.to_module(self.MODULE, self)
 
-        for tractor, group in df_filtered.groupby("tractor"):
-            logger.info(f"Processing tractor group: {tractor}, cntr_id: {group['cntr_id'].tolist()}")
-            if self.properties.editable(self.gt["search_tractor"]):
-                self.actions.click(self.gt["search_tractor"])
-                sendkeys(tractor)
-                sendkeys("{ENTER}")
-            else:
-                raise RuntimeError("Search tractor field not editable")
-
-            for i, (_, row) in enumerate(group.iterrows()):
-                logger.info(f"Processing ground for cntr_id: {row['cntr_id']}, tractor: {row['tractor']}")
-                if self.properties.enabled(self.gt["ground_btn"]):
-                    sendkeys("%2")
-                else:
-                    raise RuntimeError("Ground button not enabled")
-
-                if wait_for_window("Create Gate Grounding"):
-                    self.actions.click(self.cg["cntr_id"])
-                    sendkeys(row["cntr_id"])
-                    if i == 0:
-                        self.actions.click(self.cg["driver"])
-                        sendkeys(row["tractor"])
+        with CsvStore(df, p) as store:
+            for tractor, group in df_filtered.groupby("tractor"):
+                logger.info(f"Processing tractor group: {tractor}, cntr_id: {group['cntr_id'].tolist()}")
+                if self.properties.editable(self.gt["search_tractor"]):
+                    self.actions.click(self.gt["search_tractor"])
+                    sendkeys(tractor)
                     sendkeys("{ENTER}")
                 else:
-                    raise RuntimeError("Create Gate Grounding window not found")
-
-                time.sleep(0.5)
-                if find_window(".*gatex1536$"):
-                    sendkeys("{ENTER}")
-
-                if self.properties.editable(self.cg["size"]):
-                    self.actions.click(self.cg["size"])
-                    sendkeys(str(row["size"]))
-                    sendkeys(self.type)
-                    self.actions.click(self.cg["ok"])
-                else:
-                    self.actions.click(self.cg["ok"])
+                    raise RuntimeError("Search tractor field not editable")
+
+                for i, (_, row) in enumerate(group.iterrows()):
+                    logger.info(f"Processing ground for cntr_id: {row['cntr_id']}, tractor: {row['tractor']}")
+                    if self.properties.enabled(self.gt["ground_btn"]):
+                        sendkeys("%2")
+                    else:
+                        raise RuntimeError("Ground button not enabled")
+
+                    if wait_for_window("Create Gate Grounding"):
+                        self.actions.click(self.cg["cntr_id"])
+                        sendkeys(row["cntr_id"])
+                        if i == 0:
+                            self.actions.click(self.cg["driver"])
+                            sendkeys(row["tractor"])
+                        sendkeys("{ENTER}")
+                    else:
+                        raise RuntimeError("Create Gate Grounding window not found")
 
-                if i == 0:
                     time.sleep(0.5)
-                    if find_window(".*Gate Inspection$"):
-                        sendkeys("%c")
-                        self.actions.click(self.ins["ok"])
+                    if find_window(".*gatex1536$"):
+                        sendkeys("{ENTER}")
+
+                    if self.properties.editable(self.cg["size"]):
+                        self.actions.click(self.cg["size"])
+                        sendkeys(str(row["size"]))
+                        sendkeys(self.type)
+                        self.actions.click(self.cg["ok"])
+                    else:
                         self.actions.click(self.cg["ok"])
 
-                if i == 1:
-                    self.actions.click(self.gt["ok"])
+                    if i == 0:
+                        time.sleep(0.5)
+                        if find_window(".*Gate Inspection$"):
+                            sendkeys("%c")
+                            self.actions.click(self.ins["ok"])
+                            self.actions.click(self.cg["ok"])
 
-                if self.properties.editable(self.cg["material"]):
-                    self.actions.click(self.cg["material"])
-                else:
-                    raise RuntimeError("Material field not editable")
+                    if i == 1:
+                        self.actions.click(self.gt["ok"])
 
-                sendkeys(str(self.material))
-                sendkeys(self.max_gross[:2])
+                    if self.properties.editable(self.cg["material"]):
+                        self.actions.click(self.cg["material"])
+                    else:
+                        raise RuntimeError("Material field not editable")
 
-                if i ==0:
-                    sendkeys("Y")
+                    sendkeys(str(self.material))
+                    sendkeys(self.max_gross[:2])
 
-                if i == 1:
-                    # self.actions.click(self.cg["fa"])
-                    sendkeys("A")
-                    sendkeys("Y")
+                    if i ==0:
+                        sendkeys("Y")
 
-                self.actions.click(self.cg["ok"])
+                    if i == 1:
+                        # self.actions.click(self.cg["fa"])
+                        sendkeys("A")
+                        sendkeys("Y")
 
-                if self.properties.editable(self.cg["gross"]):
-                    sendkeys(self.gross_wt)
-                else:
-                    raise RuntimeError("Gross field not editable")
+                    self.actions.click(self.cg["ok"])
 
-                self.actions.click(self.cg["ok"])
+                    if self.properties.editable(self.cg["gross"]):
+                        sendkeys(self.gross_wt)
+                    else:
+                        raise RuntimeError("Gross field not editable")
 
-                time.sleep(0.5)
-                # Appointment
-                if find_window(".*(gatex2423|gatex3276)$"):
-                    self.handle_auth_window()
+                    self.actions.click(self.cg["ok"])
 
-                # if wait_for_window(".*gatex0792$", 1):
-                #     self.handle_auth_window()
+                    time.sleep(0.5)
+                    # Appointment
+                    if find_window(".*(gatex2423|gatex3276)$"):
+                        self.handle_auth_window()
 
-                self.actions.click(self.cg["ok"])
+                    # if wait_for_window(".*gatex0792$", 1):
+                    #     self.handle_auth_window()
 
-                if i == 1 and wait_for_window(".*gatex2153$", 1):
-                    sendkeys("{ENTER}")
+                    self.actions.click(self.cg["ok"])
 
-                for window in [".*gatex1990$", ".*gatex1247$", ".*cbo0644$"]:
-                    time.sleep(0.5)
-                    if find_window(window):
+                    if i == 1 and wait_for_window(".*gatex2153$", 1):
                         sendkeys("{ENTER}")
-                    elif window == ".*gatex1247$":
-                        raise RuntimeError("gatex1247 window not found")
 
-                if wait_for_window("Confirm"):
-                    self.actions.click(self.cg["noo"])
+                    for window in [".*gatex1990$", ".*gatex1247$", ".*cbo0644$"]:
+                        time.sleep(0.5)
+                        if find_window(window):
+                            sendkeys("{ENTER}")
+                        elif window == ".*gatex1247$":
+                            raise RuntimeError("gatex1247 window not found")
 
-                time.sleep(0.5)
-                if find_window(("User Error")):
-                    logger.error("User Error window found")
-                    raise
+                    if wait_for_window("Confirm"):
+                        self.actions.click(self.cg["noo"])
+
+                    time.sleep(0.5)
+                    if find_window(("User Error")):
+                        logger.error("User Error window found")
+                        raise
 
-                df.loc[df["cntr_id"] == row["cntr_id"], "mvt"] = "C"
-                df.to_csv(p, index=False)
+                    store.update(row["cntr_id"], {"mvt": "C"})
 
-                self.actions.click(self.gt["refresh"])
-            self.release_print_cwp()
+                    self.actions.click(self.gt["refresh"])
+                self.release_print_cwp()
+                store.commit()
 
+    @traced("step")
+    @debug_out_line
     def get_tractor(self, df: pd.DataFrame, path: Path) -> None:
         tdf, tp = next(ProjectPaths.get_tractor_usage_data())
         twin_col = "twin_ind"
@@ -238,10 +258,13 @@ class GateTransaction(BaseDriver):
                 tdf.loc[tdf["tractor_id"] == tractor_id, "reserved"] = "Y"
                 available_tractors = available_tractors[available_tractors["tractor_id"] != tractor_id]
 
-        logger.info(f"Assigned tractors: {df[[twin_col, 'tractor']].to_dict()}")
-        df.to_csv(path, index=False)
-        tdf.to_csv(tp, index=False)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Assigned tractors: %s", df[[twin_col, 'tractor']].to_dict())
+        write_csv_atomic(df, path)
+        write_csv_atomic(tdf, tp)
 
+    @traced("step")
+    @debug_out_line
     def release_print_cwp(self) -> None:
         self.actions.click(self.gt["refresh"])
         if self.properties.enabled(self.gt["release"]):
@@ -1,6 +1,7 @@
 import csv
 import os
 
+from helper.df_cache import csv_cache
 from helper.paths import ProjectPaths
 from helper.win_utils import sendkeys, focus_window
 from src.common.menu import Menu
@@ -42,6 +43,7 @@ class TractorCard(BaseDriver):
             writer = csv.writer(file)
             writer.writerow(header)  # Write header
             writer.writerows(all_data)  # Write all data
+        csv_cache.invalidate(self.path)
 
     def create_tractor_card(self, numeric: int, count: int) -> None:
         if count < 1:
@@ -1,6 +1,8 @@
 from helper.logger import logger
 from helper.win_utils import wait_for_window, sendkeys, focus_window
 from src.core.driver import BaseDriver
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 
 class CWP(BaseDriver):
@@ -26,6 +28,8 @@ class CWP(BaseDriver):
             logger.error("Open CWP window not found")
             raise
 
+    @traced("step")
+    @debug_out_line
     def release_cwp(self):
         if not wait_for_window("CWP", timeout=1):
             self.open_cwp_plan()
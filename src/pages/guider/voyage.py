@@ -4,8 +4,11 @@ import pandas as pd
 from pathlib import Path
 from helper.logger import logger
 from helper.paths import ProjectPaths
+from helper.data_store import CsvStore, write_csv_atomic
 from helper.win_utils import sendkeys, wait_for_window, focus_window, find_window
 from src.core.driver import BaseDriver
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class Voyage(BaseDriver):
     def __init__(self, external_driver=None):
@@ -123,6 +126,8 @@ class Voyage(BaseDriver):
         sendkeys(self.qc)
         sendkeys("{ENTER}")
 
+    @traced("step")
+    @debug_out_line
     def add_cntr(self) -> None:
         df, p = next(ProjectPaths.get_loading_data())
 
@@ -150,7 +155,7 @@ class Voyage(BaseDriver):
             self.panel_drag_release("work_plan_add")
             self.place_cntr_in_bay(df, bay, group["cntr_id"].tolist())
 
-        df.to_csv(p, index=False)
+        write_csv_atomic(df, p)
 
     def place_cntr_in_bay(self, df, bay, cntr_ids):
         for cntr_id in cntr_ids:
@@ -186,6 +191,8 @@ class Voyage(BaseDriver):
                 else:
                     self.update_planned(df, cntr_id)
 
+    @traced("step")
+    @debug_out_line
     def plan_cntr(self, target_count: int, bay_list: list[str], df, p: Path):
         times = 1
         limit = 3
@@ -194,42 +201,41 @@ class Voyage(BaseDriver):
             raise Exception("No container in the list")
 
         hold = True
-        for bay in bay_list:
-            if times >= limit:
-                raise Exception("Abnormal loop count")
-
-            count = self.properties.text_value(self.list["count"])
-            logger.info(count)
-
-            self.setup_bay(bay)
-            if target_count == 1:
-                self.panel_drag_release("work_plan_add")
-                self.actions.click(self.list["row_0"])
-            else:
-                logger.info(target_count)
-                self.work_plan_add(target_count)
-
-            if hold:
-                time.sleep(0.5)
-                if find_window(".*-gdr2303"):
-                    sendkeys("{TAB}")
-                    sendkeys("{ENTER}")
+        with CsvStore(df, p) as store:
+            for bay in bay_list:
+                if times >= limit:
+                    raise Exception("Abnormal loop count")
+
+                count = self.properties.text_value(self.list["count"])
+                logger.info(count)
+
+                self.setup_bay(bay)
+                if target_count == 1:
+                    self.panel_drag_release("work_plan_add")
+                    self.actions.click(self.list["row_0"])
                 else:
-                    hold = False
-
-            current_count = self.properties.text_value(self.list["count"])
-            target_count = target_count + int(current_count) - int(count)
-
-            if target_count > 0:
-                df.loc[df["bay"] == bay, "capacity"] = "F"
-                df.to_csv(p, index=False)
-            else:
-                df.loc[df["bay"] == bay, "capacity"] = "A"
-                df.to_csv(p, index=False)
-                logger.info("All containers placed")
-                return
+                    logger.info(target_count)
+                    self.work_plan_add(target_count)
+
+                if hold:
+                    time.sleep(0.5)
+                    if find_window(".*-gdr2303"):
+                        sendkeys("{TAB}")
+                        sendkeys("{ENTER}")
+                    else:
+                        hold = False
+
+                current_count = self.properties.text_value(self.list["count"])
+                target_count = target_count + int(current_count) - int(count)
+
+                if target_count > 0:
+                    store.update(bay, {"capacity": "F"}, key_column="bay")
+                else:
+                    store.update(bay, {"capacity": "A"}, key_column="bay")
+                    logger.info("All containers placed")
+                    return
 
-            times += 1
+                times += 1
 
     def work_plan_add(self, count: int):
         self.actions.click(self.list["row_0"])
@@ -285,6 +291,8 @@ class Voyage(BaseDriver):
         self.actions.click(self.list["search_list"])
         self.plan_cntr(count, bay_list, df, p)
 
+    @traced("step")
+    @debug_out_line
     def voyage_loading_actions(self, size_20_count: int, size_40_count: int):
         df, path = next(ProjectPaths.get_stowage_usage())
 
@@ -1,7 +1,9 @@
+import logging
 import pandas as pd
 
 from pathlib import Path
 from pandas.errors import EmptyDataError
+from helper.data_store import write_csv_atomic
 from helper.io_utils import read_json
 from helper.paths import ProjectPaths
 from src.core.driver import BaseDriver
@@ -10,6 +12,8 @@ from src.pages.inventory_operation.hold_release import HoldRelease
 from helper.win_utils import wait_for_window, sendkeys, focus_window
 from helper.container_utils import next_loc
 from helper.logger import logger
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class ContainerDetails(BaseDriver):
     MODULE = "CD"
@@ -33,6 +37,8 @@ class ContainerDetails(BaseDriver):
         self.blk = "HKHKG"
         self.gross_wt = "17500"
 
+    @traced("step")
+    @debug_out_line
     def create_cntr(self, count: int, movement: str, status: str, size: str, type: str) -> None:
         df, path = self._load_data(movement)
 
@@ -178,9 +184,10 @@ class ContainerDetails(BaseDriver):
             subset=["cntr_id"], keep="first"
         ).reset_index(drop=True)
 
-        logger.info(f"Updated DataFrame: {updated_df.to_dict()}")
-        updated_df.to_csv(path, index=False)
-        logger.debug(f"Saved DataFrame to {path}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Updated DataFrame: %s", updated_df.to_dict())
+        write_csv_atomic(updated_df, path)
+        logger.debug("Saved DataFrame to %s", path)
 
     def click(self):
         self.actions.click(self.home)
@@ -4,6 +4,8 @@ from src.core.driver import BaseDriver
 from src.common.menu import Menu
 from helper.win_utils import sendkeys, find_window, focus_window
 from helper.logger import logger
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class HoldRelease(BaseDriver):
     module = "HR"
@@ -46,6 +48,8 @@ class HoldRelease(BaseDriver):
 
         sendkeys("%s")
 
+    @traced("step")
+    @debug_out_line
     def release_hold(self, hold_condition: str, hold_condition2: str = None) -> None:
         import time
 
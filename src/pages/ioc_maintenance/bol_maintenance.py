@@ -5,6 +5,9 @@ from src.common.menu import Menu
 from helper.win_utils import wait_for_window, sendkeys
 from helper.logger import logger
 from helper.paths import ProjectPaths
+from helper.data_store import write_csv_atomic
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class BolMaintenance(BaseDriver):
     """Handles Bill of Lading (BOL) creation and container addition in a UI-based logistics application."""
@@ -26,6 +29,8 @@ class BolMaintenance(BaseDriver):
         self._search_bol()
         self._handle_bol_creation()
 
+    @traced("step")
+    @debug_out_line
     def add_containers(self) -> None:
         """Add containers to a BOL in the UI and update the DataFrame."""
         if not self.properties.visible(self.bol_config["line"], timeout=1):
@@ -53,7 +58,7 @@ class BolMaintenance(BaseDriver):
             self._add_container(cntr_id, is_last=(idx == len(df_filtered) - 1))
             self._update_container_bol(df, cntr_id, self.bol)
 
-        df.to_csv(path, index=False)
+        write_csv_atomic(df, path)
         if wait_for_window("Amend Bill", 1):
             self.actions.click(self.bol_config["create_cancel"])
         logger.info("Completed container addition process")
@@ -4,9 +4,12 @@ import allure
 
 from pathlib import Path
 from helper.logger import logger
+from helper.data_store import write_csv_atomic
 from helper.win_utils import sendkeys, wait_for_window, find_window, focus_window
 from src.core.driver import BaseDriver
 from src.common.menu import Menu
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class BookingMaintenance(BaseDriver):
     MODULE = "BM"
@@ -20,6 +23,8 @@ class BookingMaintenance(BaseDriver):
         self.booking_list = ["BK01", "BK02", "BK04"]
         self.booking_map = {"XF": "BK01", "EM": "BK02", "XM": "BK04"}  # Status to booking mapping
 
+    @traced("step")
+    @debug_out_line
     def add_return_cntr(self, df, p) -> None:
         """Main entry point for adding return containers."""
         focus_window("nGen")
@@ -66,7 +71,7 @@ class BookingMaintenance(BaseDriver):
             self._process_size_subgroup(status, size, subgroup, booking_no, df)
         
         # Save and close only after ALL sizes for this status are processed
-        df.to_csv(p, index=False)
+        write_csv_atomic(df, p)
         self.actions.click(self.bk["close"])
         allure.attach(f"✅ Status {status} completed successfully with booking: {booking_no}", 
                      name=f"🎯 {status} Completed", 
@@ -200,7 +205,7 @@ class BookingMaintenance(BaseDriver):
             df.loc[condition, "twin_ind"] = "S"
             
             # Save with automatic backup
-            df.to_csv(p, index=False)
+            write_csv_atomic(df, p)
         
         # Filter and clean data for processing
         df_filtered = df[df["mvt"] != "C"]
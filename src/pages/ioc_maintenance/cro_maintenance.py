@@ -4,6 +4,9 @@ from helper.win_utils import wait_for_window, sendkeys
 from src.core.driver import BaseDriver
 from src.common.menu import Menu
 from helper.paths import ProjectPaths
+from helper.data_store import CsvStore
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class CROMaintenance(BaseDriver):
     MODULE = "CRO"
@@ -23,6 +26,8 @@ class CROMaintenance(BaseDriver):
         self.create_cro(df, p)
         self.get_pin(df, p)
 
+    @traced("step")
+    @debug_out_line
     def create_cro(self, df, p) -> None:
         if not self.properties.visible(self.cro_config["cro_cntr_id"], timeout=1):
             logger.info("Opening CRO module")
@@ -37,44 +42,35 @@ class CROMaintenance(BaseDriver):
             logger.warning("No containers to create CRO for")
             return
 
-        for cntr_id in df_filtered["cntr_id"]:
-            logger.info(f"Creating CRO for cntr_id: {cntr_id}")
-            self.actions.click(self.cro_config["create"])
-            self.actions.click(self.cro_config["create_cntr_id"])
-            sendkeys(cntr_id, with_tab=True)
-            sendkeys(self.bol, with_tab=True)
+        with CsvStore(df, p) as store:
+            for cntr_id in df_filtered["cntr_id"]:
+                logger.info(f"Creating CRO for cntr_id: {cntr_id}")
+                self.actions.click(self.cro_config["create"])
+                self.actions.click(self.cro_config["create_cntr_id"])
+                sendkeys(cntr_id, with_tab=True)
+                sendkeys(self.bol, with_tab=True)
 
-            cro_no = self.generate_cro()
-            sendkeys(cro_no, with_tab=True)
+                cro_no = self.generate_cro()
+                sendkeys(cro_no, with_tab=True)
 
-            sendkeys(self.owner, with_tab=True)
-            sendkeys(self.date)
-            sendkeys(self.time)
-            sendkeys(self.agent, with_tab=True)
-            sendkeys("{TAB}")
-            sendkeys(self.date)
-            sendkeys("{ENTER}")
+                sendkeys(self.owner, with_tab=True)
+                sendkeys(self.date)
+                sendkeys(self.time)
+                sendkeys(self.agent, with_tab=True)
+                sendkeys("{TAB}")
+                sendkeys(self.date)
+                sendkeys("{ENTER}")
 
-            if wait_for_window("User Error", timeout=1):
-                logger.error("User Error in CRO creation")
-                raise RuntimeError("User Error detected")
+                if wait_for_window("User Error", timeout=1):
+                    logger.error("User Error in CRO creation")
+                    raise RuntimeError("User Error detected")
 
-            if not wait_for_window("User Information", timeout=5):
-                logger.error("User Information window not found")
-                raise RuntimeError("User Information window not found")
+                if not wait_for_window("User Information", timeout=5):
+                    logger.error("User Information window not found")
+                    raise RuntimeError("User Information window not found")
 
-            sendkeys("{ENTER}")
-            self.update_column(df, cntr_id, "cro_no", cro_no)
-            df.to_csv(p, index=False)
-
-    @staticmethod
-    def update_column(df, cntr_id, column: str, value) -> None:
-        mask = df["cntr_id"] == cntr_id
-        if mask.any():
-            df.loc[mask, column] = value
-            logger.info(f"Updated {column} for {cntr_id} to {value}")
-        else:
-            raise Exception(f"Cannot update {column} for {cntr_id}")
+                sendkeys("{ENTER}")
+                store.update(cntr_id, {"cro_no": cro_no})
 
     @staticmethod
     def generate_cro() -> str:
@@ -83,6 +79,8 @@ class CROMaintenance(BaseDriver):
         logger.debug(f"Generated CRO number: {cro_no}")
         return cro_no
 
+    @traced("step")
+    @debug_out_line
     def get_pin(self, df, p) -> None:
         cro_status = "active"
 
@@ -101,15 +99,15 @@ class CROMaintenance(BaseDriver):
         self.actions.click(self.cro_config["reset"])
         self.actions.click(self.cro_config["cro_status"])
         sendkeys(cro_status)
-        for cntr_id in df_filtered["cntr_id"]:
-            logger.info(f"Fetching pin for cntr_id: {cntr_id}")
-            self.actions.click(self.cro_config["cro_cntr_id"])
-            sendkeys("^a")
-            sendkeys(cntr_id)
-            sendkeys("{ENTER}")
-            pin = self.properties.text_value(self.cro_config["row0_pin"])
-            self.update_column(df, cntr_id, "pin", pin)
-            df.to_csv(p, index=False)
+        with CsvStore(df, p) as store:
+            for cntr_id in df_filtered["cntr_id"]:
+                logger.info(f"Fetching pin for cntr_id: {cntr_id}")
+                self.actions.click(self.cro_config["cro_cntr_id"])
+                sendkeys("^a")
+                sendkeys(cntr_id)
+                sendkeys("{ENTER}")
+                pin = self.properties.text_value(self.cro_config["row0_pin"])
+                store.update(cntr_id, {"pin": pin})
 
 if __name__ == "__main__":
     c = CROMaintenance()
@@ -2,9 +2,12 @@ import time
 
 from helper.logger import logger
 from helper.paths import ProjectPaths
+from helper.data_store import write_csv_atomic
 from helper.win_utils import sendkeys, wait_for_window, focus_window, find_window
 from src.pages.guider.voyage import Voyage
 from src.common.menu import Menu
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class DischargeContainer(Voyage):
     MODULE = "DC"
@@ -54,8 +57,10 @@ class DischargeContainer(Voyage):
 
         if not wait_for_window(".*(User Error|Host Error).*", timeout=1):
             df.loc[df["ContainerNum"].isin(df_filtered["ContainerNum"]), "planned"] = "Yes"
-            df.to_csv(path, index=False)
+            write_csv_atomic(df, path)
 
+    @traced("step")
+    @debug_out_line
     def data_confirm(self) -> None:
         focus_window("nGen")
         if not self.properties.visible(self.dc["data_confirmed"]):
@@ -80,6 +85,8 @@ class DischargeContainer(Voyage):
         else:
             raise Exception("Confirm window not found")
 
+    @traced("step")
+    @debug_out_line
     def actions_chains(self):
         self.open_voyage_plan()
         self.setup_voyage("Disc")
@@ -4,6 +4,8 @@ from helper.logger import logger
 from helper.win_utils import wait_for_window, sendkeys, focus_window, find_window
 from src.core.driver import BaseDriver
 from src.common.menu import Menu
+from helper.step_events import traced
+from helper.decorators import debug_out_line
 
 class BayPlan(BaseDriver):
     MODULE = "BP"
@@ -12,6 +14,8 @@ class BayPlan(BaseDriver):
         super().__init__(external_driver=external_driver)
         self.edi = self.config["EDI"]
 
+    @traced("step")
+    @debug_out_line
     def upload_bay_plan(self):
         focus_window("nGen")
 
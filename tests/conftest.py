@@ -3,6 +3,9 @@
 # Import fixtures to make them available to all tests
 from tests.fixtures.csv_fixtures import backup_csv, session
 from tests.fixtures.video_recorder import video_recorder
+from tests.fixtures.call_profiler import call_profile_report
+from helper.logger import LoggerSingleton
+from helper.step_events import sink as step_event_sink
 
 def pytest_addoption(parser):
     """Add custom command line options for pytest."""
@@ -23,4 +26,14 @@ def pytest_addoption(parser):
         action="store_true",
         default=True,
         help="Disable video recording if access violations occur (Windows safety)"
-    ) 
\ No newline at end of file
+    ) 
+
+def pytest_exception_interact(node, call, report):
+    """Write out queued log records and step events as soon as a test crashes."""
+    LoggerSingleton.flush()
+    step_event_sink.flush()
+
+def pytest_sessionfinish(session, exitstatus):
+    """Drain the logging queue and close the step event log before pytest exits."""
+    LoggerSingleton.shutdown()
+    step_event_sink.close()
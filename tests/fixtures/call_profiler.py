@@ -0,0 +1,25 @@
+"""Session-end reports for the debug_out_line call profiler and TAS request latency."""
+
+import allure
+import pytest
+from helper.decorators import profiler
+from helper.http.TAS_service import LATENCY_REPORT, latency_profiler
+
+def _attach_report(recorder, report_path, name):
+    if report_path is None:
+        return
+
+    print(f"\n{recorder.report()}")
+    allure.attach.file(
+        str(report_path),
+        name=name,
+        attachment_type=allure.attachment_type.TEXT
+    )
+
+@pytest.fixture(scope="session", autouse=True)
+def call_profile_report():
+    """Dump the aggregated call profile (PROFILE_CALLS=1) and TAS latency histograms (PROFILE_TAS=1) to disk and Allure at session end."""
+    yield profiler
+
+    _attach_report(profiler, profiler.write_report(), "Call Profile")
+    _attach_report(latency_profiler, latency_profiler.write_report(LATENCY_REPORT), "TAS Latency")
@@ -0,0 +1,194 @@
+import io
+import socket
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+
+from helper.JMS.baplie_dispatch import dispatch_bay_plan, split_rows
+from helper.JMS.baplie_reader import diff_against_csv, iter_containers, read_reply
+from helper.JMS.baplie_template import BaplieTemplate, render_message
+from helper.JMS.generate_msg import _build_equipment, generate_message, iter_message, write_message
+from helper.JMS.local_broker import get_memory_broker, reset_memory_broker
+from helper.JMS.send_msg import Producer
+from helper.paths import ProjectPaths
+
+DISCHARGE_CSV = ProjectPaths.DATA / "vessel_discharge_data.csv"
+
+@pytest.fixture
+def tricky_csv(tmp_path):
+    df = pd.read_csv(DISCHARGE_CSV, nrows=6)
+    df["ContainerNum"] = ["A&B<1>", "", "  ", "Ü-\"q'", "PLAIN01", None]
+    df.loc[3, "PartyInfo_BIC"] = "N>V&D"
+    path = tmp_path / "tricky.csv"
+    df.to_csv(path, index=False)
+    return path
+
+@pytest.mark.baplie
+@pytest.mark.parametrize("chunk_size", [1, 4096, 1 << 20])
+def test_streamed_message_is_identical(tricky_csv, chunk_size):
+    for path in (DISCHARGE_CSV, tricky_csv):
+        chunks = list(iter_message(path, chunk_size))
+        assert "".join(chunks) == generate_message(path)
+        if chunk_size == 1:
+            assert len(chunks) > 1
+
+@pytest.mark.baplie
+def test_stream_without_containers(tmp_path):
+    path = tmp_path / "empty.csv"
+    pd.read_csv(DISCHARGE_CSV, nrows=3).assign(ContainerNum="").to_csv(path, index=False)
+    assert "".join(iter_message(path)) == generate_message(path)
+    assert "<EquipmentAndGoodsInfoList />" in generate_message(path)
+
+@pytest.mark.baplie
+def test_write_message_targets(tmp_path):
+    expected = generate_message(DISCHARGE_CSV).encode("utf-8")
+
+    out = tmp_path / "baplie.xml"
+    assert write_message(DISCHARGE_CSV, out) == len(expected)
+    assert out.read_bytes() == expected
+
+    text = io.StringIO()
+    write_message(DISCHARGE_CSV, text)
+    assert text.getvalue().encode("utf-8") == expected
+
+    left, right = socket.socketpair()
+    with left, right:
+        assert write_message(DISCHARGE_CSV, left, chunk_size=512) == len(expected)
+        left.shutdown(socket.SHUT_WR)
+        received = b"".join(iter(lambda: right.recv(1 << 16), b""))
+    assert received == expected
+
+@pytest.mark.baplie
+def test_template_render_is_byte_identical(tricky_csv, tmp_path):
+    empty = tmp_path / "empty.csv"
+    pd.read_csv(DISCHARGE_CSV, nrows=3).assign(ContainerNum="", FullEmptyInd="").to_csv(empty, index=False)
+
+    for path in (DISCHARGE_CSV, tricky_csv, empty):
+        assert render_message(path).encode("utf-8") == generate_message(path).encode("utf-8")
+
+    rendered = render_message(tricky_csv)
+    assert "<ContainerNum>A&amp;B&lt;1&gt;</ContainerNum>" in rendered
+    assert "<PartyInfo_BIC>N&gt;V&amp;D</PartyInfo_BIC>" in rendered
+
+@pytest.mark.baplie
+def test_template_renders_empty_fields_like_elementtree():
+    row = {"ContainerNum": "X1", "EquipmentSizeType": "", "FullEmptyInd": None,
+           "PartyInfo_BIC": "{0}", "StowageCell_ISO": "10082"}
+    xml = BaplieTemplate().render_equipment(row)
+    assert xml == ET.tostring(_build_equipment(row), encoding="unicode")
+    assert "<EquipmentSizeType /><FullEmptyInd />" in xml
+    assert "<PartyInfo_BIC>{0}</PartyInfo_BIC>" in xml
+    assert "<StowageCell_ISO>010082</StowageCell_ISO>" in xml
+
+@pytest.mark.baplie
+def test_importing_jms_pages_does_not_start_jvm():
+    code = ("import sys; from helper.JMS.baplie import Baplie; from helper.JMS.send_msg import Producer; "
+            "Producer('t3://localhost:1', 'jms/q'); print('jpype' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ProjectPaths.ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+@pytest.mark.baplie
+def test_split_rows_by_bay_range_and_count():
+    rows = [{"ContainerNum": f"C{i}", "StowageCell_ISO": str(bay * 10000 + 82)}
+            for i, bay in enumerate([5, 1, 3, 1, 7, 9, 3])] + [{"ContainerNum": " ", "StowageCell_ISO": "10082"}]
+
+    assert [[r["ContainerNum"] for r in chunk] for chunk in split_rows(rows, bays_per_chunk=2)] == \
+        [["C1", "C3", "C2", "C6"], ["C0", "C4"], ["C5"]]
+    assert [len(chunk) for chunk in split_rows(rows, max_containers=3)] == [3, 3, 1]
+    assert [len(chunk) for chunk in split_rows(rows, max_containers=3, bays_per_chunk=2)] == [3, 1, 2, 1]
+    assert split_rows(rows[-1:]) == [[]]
+    assert len(split_rows(rows, max_containers=0, bays_per_chunk=0)) == 1  # 0 means no limit
+    with pytest.raises(ValueError, match="non-negative"):
+        split_rows(rows, max_containers=-1)
+
+@pytest.mark.baplie
+def test_dispatch_sends_every_container_once_in_valid_chunks():
+    reset_memory_broker("dispatch")
+    with Producer("memory://dispatch", "jms/sp/InboundBayplanQueue") as producer:
+        result = dispatch_bay_plan(producer, DISCHARGE_CSV, max_containers=8, bays_per_chunk=1, max_in_flight=2)
+
+    received = list(get_memory_broker("dispatch").received["jms/sp/InboundBayplanQueue"])
+    expected = pd.read_csv(DISCHARGE_CSV, dtype=str).dropna(subset=["ContainerNum"])["ContainerNum"]
+    sent = []
+    for message in received:
+        root = ET.fromstring(message)
+        assert root.find("MessageList/Message/Header") is not None
+        assert root.find("MessageList/Message/Trailer") is not None
+        sent.extend(e.text for e in root.iter("ContainerNum"))
+
+    assert result["failed"] == 0
+    # 25 containers in each of bays 01 and 06
+    assert len(received) == len(result["chunks"]) == 8
+    assert all(chunk["containers"] <= 8 and chunk["bays"][0] == chunk["bays"][1] for chunk in result["chunks"])
+    assert sorted(sent) == sorted(expected)
+    assert result["sent_containers"] == len(expected)
+
+@pytest.mark.baplie
+def test_dispatch_resends_only_failed_chunks():
+    calls = []
+
+    def flaky(queue, message):
+        calls.append(message)
+        if "DISH100001" in message and calls.count(message) == 1:
+            raise RuntimeError("terminal busy")
+        return "<Reply>OK</Reply>"
+
+    reset_memory_broker("flaky")
+    get_memory_broker("flaky", handler=flaky)
+    with Producer("memory://flaky", "jms/sp/InboundBayplanQueue") as producer:
+        result = dispatch_bay_plan(producer, DISCHARGE_CSV, max_containers=10)
+
+    assert result["failed"] == 0
+    assert [chunk["attempts"] for chunk in result["chunks"]] == [2] + [1] * (len(result["chunks"]) - 1)
+    assert len(calls) == len(result["chunks"]) + 1
+    assert result["replies"] == ["<Reply>OK</Reply>"] * len(result["chunks"])
+
+    reset_memory_broker("flaky")
+    get_memory_broker("flaky", handler=lambda queue, message: (_ for _ in ()).throw(RuntimeError("down")))
+    with Producer("memory://flaky", "jms/sp/InboundBayplanQueue") as producer:
+        result = dispatch_bay_plan(producer, DISCHARGE_CSV, max_containers=10, retries=0)
+    assert result["failed"] == len(result["chunks"])
+    assert all("down" in chunk["error"] for chunk in result["chunks"])
+
+@pytest.mark.baplie
+def test_reader_streams_containers_and_diffs_against_csv(tricky_csv, tmp_path):
+    records = list(iter_containers(render_message(tricky_csv)))
+    assert [r["ContainerNum"] for r in records] == ["A&B<1>", "Ü-\"q'", "PLAIN01"]
+    assert records[0]["StowageCell_ISO"] == "010082"
+
+    message = tmp_path / "message.xml"
+    message.write_text(render_message(DISCHARGE_CSV), encoding="utf-8")
+    assert diff_against_csv(str(message), DISCHARGE_CSV)["ok"]
+
+    df = pd.read_csv(DISCHARGE_CSV, dtype=str)
+    first, second, third = df["ContainerNum"].dropna().iloc[:3]
+    df.loc[df["ContainerNum"] == first, "ContainerNum"] = "EXTRA0001"
+    df.loc[df["ContainerNum"] == second, "StowageCell_ISO"] = "999999"
+    df.loc[df["ContainerNum"] == third, "ContainerNum"] = "DUPE0001"
+    df.loc[df.index[-1], "ContainerNum"] = "DUPE0001"
+    edited = tmp_path / "edited.csv"
+    df.to_csv(edited, index=False)
+
+    diff = diff_against_csv(render_message(edited), DISCHARGE_CSV)
+    assert not diff["ok"]
+    assert diff["unexpected"] == ["EXTRA0001", "DUPE0001", "DUPE0001"]
+    assert diff["mismatched"] == [[second, "010182", "999999"]]
+    assert diff["missing"] == [first, third]
+    assert diff["duplicates"] == ["DUPE0001"]
+
+@pytest.mark.baplie
+def test_reader_summarizes_reply_and_chunked_messages():
+    reset_memory_broker("reader")
+    with Producer("memory://reader", "jms/sp/InboundBayplanQueue") as producer:
+        result = dispatch_bay_plan(producer, DISCHARGE_CSV, max_containers=7)
+    chunks = list(get_memory_broker("reader").received["jms/sp/InboundBayplanQueue"])
+    assert diff_against_csv(chunks, DISCHARGE_CSV)["ok"]
+
+    reply = read_reply(result["replies"][0])
+    assert reply["root"] == "Reply"
+    assert reply["values"]["Status"] == "OK"
+    assert read_reply(chunks[0])["containers"] == 7
@@ -0,0 +1,145 @@
+import pandas as pd
+import pytest
+
+from helper.data_store import CsvStore, journal_path_for
+from helper.io_utils import read_csv
+
+@pytest.fixture
+def pickup_csv(tmp_path):
+    path = tmp_path / "gate_pickup_data.csv"
+    pd.DataFrame({
+        "cntr_id": [f"TEST{i:06d}" for i in range(5)],
+        "mvt": [None] * 5,
+        "pin": [None] * 5,
+    }).to_csv(path, index=False)
+    return path
+
+@pytest.mark.data_store
+def test_updates_are_written_only_on_commit(pickup_csv):
+    df = read_csv(pickup_csv)
+    mtime = pickup_csv.stat().st_mtime_ns
+
+    with CsvStore(df, pickup_csv, flush_interval=None) as store:
+        store.update("TEST000001", {"mvt": "C"})
+        store.update("TEST000002", {"mvt": "C", "pin": "A12345"})
+        assert store.dirty
+        assert pickup_csv.stat().st_mtime_ns == mtime
+        assert journal_path_for(pickup_csv).exists()
+        with pytest.raises(ValueError):
+            store.update("MISSING", {"mvt": "C"})
+
+    assert not journal_path_for(pickup_csv).exists()
+    saved = read_csv(pickup_csv)
+    assert saved["mvt"].isna().tolist() == [True, False, False, True, True]
+    assert saved.loc[2, "pin"] == "A12345"
+
+@pytest.mark.data_store
+def test_journal_is_replayed_after_crash(pickup_csv):
+    df = read_csv(pickup_csv)
+    store = CsvStore(df, pickup_csv, flush_interval=None)
+    store.update("TEST000003", {"mvt": "C"})
+    store._journal.close()  # simulate the process dying before commit
+
+    recovered = read_csv(pickup_csv)
+    assert recovered.loc[recovered["cntr_id"] == "TEST000003", "mvt"].item() == "C"
+    assert not journal_path_for(pickup_csv).exists()
+
+@pytest.mark.data_store
+def test_timed_commit(pickup_csv):
+    df = read_csv(pickup_csv)
+    store = CsvStore(df, pickup_csv, flush_interval=0)
+    store.update("TEST000004", {"mvt": "C"})
+    assert not store.dirty
+    assert pd.read_csv(pickup_csv).loc[4, "mvt"] == "C"
+
+@pytest.mark.data_store
+def test_cached_reads_are_isolated_and_invalidated(pickup_csv):
+    from helper.df_cache import DataFrameCache
+    from helper.io_utils import save_csv
+
+    cache = DataFrameCache()
+    first = cache.get(pickup_csv, pd.read_csv)
+    first["mvt"] = "C"  # caller mutations must not leak into the cache
+    second = cache.get(pickup_csv, pd.read_csv)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert pd.isna(second.loc[0, "mvt"])
+
+    # External edit changes the file signature
+    pd.DataFrame({"cntr_id": ["NEW0000001"], "mvt": ["C"], "pin": [None]}).to_csv(pickup_csv, index=False)
+    assert cache.get(pickup_csv, pd.read_csv)["cntr_id"].tolist() == ["NEW0000001"]
+    assert cache.misses == 2
+
+    # Project writers invalidate the shared cache
+    cached = read_csv(pickup_csv, cached=True)
+    save_csv(cached.assign(mvt=None), pickup_csv, backup=False)
+    assert pd.isna(read_csv(pickup_csv, cached=True).loc[0, "mvt"])
+
+@pytest.mark.data_store
+def test_atomic_writes_invalidate_when_signature_is_unchanged(pickup_csv):
+    import os
+    from helper.data_store import write_csv_atomic
+
+    stat = pickup_csv.stat()
+    cached = read_csv(pickup_csv, cached=True)
+    # Same size and a restored mtime, as on a coarse-timestamp filesystem
+    write_csv_atomic(cached.assign(cntr_id=cached["cntr_id"].str.replace("TEST", "SWAP")), pickup_csv)
+    os.utime(pickup_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert pickup_csv.stat().st_size == stat.st_size
+    assert read_csv(pickup_csv, cached=True).loc[0, "cntr_id"] == "SWAP000000"
+
+@pytest.mark.data_store
+def test_feather_sidecar_used_only_while_fresh(pickup_csv, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from helper import io_utils
+
+    monkeypatch.setattr(io_utils, "SIDECAR_MIN_BYTES", 0)
+    sidecar = io_utils.sidecar_path_for(pickup_csv)
+
+    parsed = read_csv(pickup_csv)
+    assert sidecar.exists()
+    from_sidecar = read_csv(pickup_csv)
+    assert from_sidecar.equals(parsed)
+    assert (from_sidecar.dtypes == parsed.dtypes).all()
+
+    # A hand edit makes the sidecar stale; the CSV wins and the sidecar is rebuilt
+    pd.DataFrame({"cntr_id": ["EDIT000001"], "mvt": ["C"], "pin": [None]}).to_csv(pickup_csv, index=False)
+    assert read_csv(pickup_csv)["cntr_id"].tolist() == ["EDIT000001"]
+    assert read_csv(pickup_csv)["cntr_id"].tolist() == ["EDIT000001"]
+
+@pytest.mark.data_store
+@pytest.mark.parametrize("delta", [False, True])
+def test_snapshot_round_trip_is_byte_exact(pickup_csv, delta):
+    from helper.io_utils import create_csv_snapshot, restore_csv_from_snapshot
+
+    original = pickup_csv.read_bytes()
+    snapshot = create_csv_snapshot(pickup_csv, delta=delta)
+    assert snapshot.name.endswith(".csv.delta" if delta else "_snapshot.csv")
+
+    df = read_csv(pickup_csv)
+    df["mvt"] = df["mvt"].astype(object)
+    df.loc[df["cntr_id"] == "TEST000002", "mvt"] = "C"
+    df.to_csv(pickup_csv, index=False)
+    assert restore_csv_from_snapshot(pickup_csv)
+    assert pickup_csv.read_bytes() == original
+
+@pytest.mark.data_store
+def test_delta_snapshot_stores_only_changed_lines(pickup_csv):
+    import json
+    from helper.io_utils import create_csv_snapshot, restore_csv_from_snapshot
+
+    create_csv_snapshot(pickup_csv, delta=True)  # first call writes the base
+    df = read_csv(pickup_csv)
+    df["mvt"] = df["mvt"].astype(object)
+    df.loc[df["cntr_id"] == "TEST000002", "mvt"] = "C"
+    df = df.iloc[:-1]
+    df.to_csv(pickup_csv, index=False)
+    edited = pickup_csv.read_bytes()
+
+    delta_path = create_csv_snapshot(pickup_csv, delta=True)
+    delta = json.loads(delta_path.read_text(encoding="utf-8"))
+    assert list(delta["changed"]) == ["3"]
+    assert delta["line_count"] == len(df) + 1
+
+    pickup_csv.write_bytes(b"cntr_id\n")
+    assert restore_csv_from_snapshot(pickup_csv)
+    assert pickup_csv.read_bytes() == edited
@@ -0,0 +1,51 @@
+import json
+
+import pandas as pd
+import pytest
+
+from helper.synthetic_discharge import synthetic_discharge
+from helper.discharge_batch import allocate_vessel, run_batch
+from helper.generate_discharge_container import GenerateDischarge
+
+@pytest.mark.stowage
+def test_batch_allocates_each_vessel_independently(tmp_path):
+    vessels = []
+    for seed in (1, 2):
+        csv = tmp_path / f"vessel_{seed}.csv"
+        synthetic_discharge(2000, seed=seed).to_csv(csv, index=False)
+        vessels.append({"name": f"V{seed}", "csv": str(csv), "allocations": [
+            {"start_id": "DISH100000", "count": 40, "size": 20},
+            {"start_id": "DISH200000", "count": 10, "size": 40},
+        ]})
+    vessels.append({"name": "missing", "csv": str(tmp_path / "missing.csv"), "allocations": []})
+    source_before = (tmp_path / "vessel_1.csv").read_bytes()
+
+    out = tmp_path / "out"
+    summaries = run_batch(vessels, out, max_workers=2)
+
+    assert [s["name"] for s in summaries] == ["V1", "V2", "missing"]
+    assert [s["status"] for s in summaries] == ["ok", "ok", "error"]
+    assert summaries[0]["assigned"] == 50 and summaries[0]["requests"][1]["assigned"] == 10
+    assert json.loads((out / "summary.json").read_text())["failed"] == 1
+    assert (tmp_path / "vessel_1.csv").read_bytes() == source_before
+
+    # Same result as allocating the vessel on its own
+    single = GenerateDischarge(pd.read_csv(tmp_path / "vessel_1.csv"), tmp_path / "single.csv")
+    single.bulk_assign_containers("DISH100000", 40, 20, save=False)
+    single.bulk_assign_containers("DISH200000", 10, 40)
+    assert (out / "V1" / "vessel_discharge_data.csv").read_bytes() == (tmp_path / "single.csv").read_bytes()
+    assert len(pd.read_csv(out / "V2" / "assignments.csv")) == 50
+
+@pytest.mark.stowage
+@pytest.mark.parametrize("name", ["../escape", "a/b", "..", ""])
+def test_vessel_names_cannot_leave_the_output_dir(tmp_path, name):
+    csv = tmp_path / "vessel.csv"
+    synthetic_discharge(200, seed=1).to_csv(csv, index=False)
+    vessel = {"name": name, "csv": str(csv), "allocations": []}
+    out = tmp_path / "out"
+
+    with pytest.raises(ValueError, match="Invalid vessel name"):
+        run_batch([vessel], out, max_workers=1)
+    summary = allocate_vessel(vessel, out)
+    assert summary["status"] == "error" and "Invalid vessel name" in summary["error"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["vessel.csv"]
@@ -0,0 +1,37 @@
+import pytest
+
+from helper.synthetic_discharge import synthetic_discharge
+from helper.generate_discharge_container import GenerateDischarge
+from helper.stowage_index import decode_stowage
+
+@pytest.mark.stowage
+@pytest.mark.parametrize("size", [20, 40])
+def test_bulk_assignment_matches_container_loop(tmp_path, size):
+    df = synthetic_discharge(3000, seed=7)
+    loop_path, bulk_path = tmp_path / "loop.csv", tmp_path / "bulk.csv"
+
+    loop = GenerateDischarge(df.copy(), loop_path)
+    expected = loop.auto_assign_containers("DISH100098", 120, size)
+    bulk = GenerateDischarge(df.copy(), bulk_path)
+    assert bulk.bulk_assign_containers("DISH100098", 120, size) == expected
+
+    assert len(expected) == 120 and expected[2]["container_id"] == "DISH100100"
+    assert bulk_path.read_bytes() == loop_path.read_bytes()
+    assert not bulk.index.is_free(decode_stowage(expected[-1]["stowage"]))
+
+@pytest.mark.stowage
+def test_repeated_bulk_assignment_reuses_the_shared_grid(tmp_path):
+    df = synthetic_discharge(3000, seed=7)
+    loop = GenerateDischarge(df.copy(), tmp_path / "loop.csv")
+    expected = loop.auto_assign_containers("DISH100098", 60, 20)
+    expected += loop.auto_assign_containers("DISH100158", 60, 20)
+
+    bulk = GenerateDischarge(df.copy(), tmp_path / "bulk.csv")
+    grid = bulk.grid
+    assigned = bulk.bulk_assign_containers("DISH100098", 60, 20)
+    assigned += bulk.bulk_assign_containers("DISH100158", 60, 20)
+
+    assert assigned == expected
+    assert bulk.grid is grid
+    assert not grid.is_free([a["stowage"] for a in assigned]).any()
+    assert not loop.grid.is_free([a["stowage"] for a in expected]).any()
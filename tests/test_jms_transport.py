@@ -0,0 +1,216 @@
+import itertools
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from helper.JMS import weblogic
+from helper.JMS.baplie_template import render_message
+from helper.JMS.local_broker import SocketBroker, SpoolBroker, get_memory_broker, reset_memory_broker
+from helper.JMS.local_transport import MemoryTransport, SocketTransport, SpoolTransport
+from helper.JMS.send_msg import Producer
+from helper.JMS.transport import create_transport
+from helper.paths import ProjectPaths
+
+QUEUE = "jms/sp/InboundBayplanQueue"
+
+@pytest.fixture(scope="module")
+def message():
+    return render_message(ProjectPaths.DATA / "vessel_discharge_data.csv")
+
+@pytest.fixture
+def socket_broker():
+    broker = SocketBroker(port=0).start()
+    yield broker
+    broker.close()
+
+@pytest.mark.jms
+def test_scheme_selects_transport(tmp_path):
+    assert isinstance(create_transport("memory://unit", QUEUE), MemoryTransport)
+    assert isinstance(create_transport("tcp://127.0.0.1:1", QUEUE), SocketTransport)
+    assert isinstance(create_transport(f"spool://{tmp_path}", QUEUE), SpoolTransport)
+    assert type(create_transport("t3://127.0.0.1:1", QUEUE)).__name__ == "WebLogicTransport"
+    with pytest.raises(ValueError, match="ftp"):
+        create_transport("ftp://host", QUEUE)
+
+@pytest.mark.jms
+def test_memory_transport_round_trip(message):
+    reset_memory_broker("unit")
+    with Producer("memory://unit", QUEUE) as producer:
+        assert isinstance(producer.transport, MemoryTransport)
+        replies = producer.send_many([message, "<Empty />"])
+    assert "<Containers>50</Containers>" in replies[0]
+    assert "<Containers>0</Containers>" in replies[1]
+    assert list(get_memory_broker("unit").received[QUEUE]) == [message, "<Empty />"]
+
+@pytest.mark.jms
+def test_socket_transport_keeps_reply_order(socket_broker):
+    messages = [f"<Message>{i}</Message>" for i in range(50)]
+    socket_broker.handler = lambda queue, body: body.replace("Message", "Reply")
+    with Producer(socket_broker.url, QUEUE, pool_size=3) as producer:
+        replies = producer.send_many(messages)
+    assert replies == [f"<Reply>{i}</Reply>" for i in range(50)]
+    assert socket_broker.counts[QUEUE] == 50
+
+@pytest.mark.jms
+def test_socket_transport_reports_broker_errors(socket_broker):
+    def fail(queue, body):
+        raise ValueError("bad message")
+
+    socket_broker.handler = fail
+    with Producer(socket_broker.url, QUEUE) as producer:
+        with pytest.raises(RuntimeError, match="bad message"):
+            producer.request("<Bad />")
+
+@pytest.mark.jms
+def test_spool_transport_round_trip_and_timeout(tmp_path, message):
+    with Producer(f"spool://{tmp_path}", QUEUE) as producer:
+        future = producer.send_async(message, timeout=0.3)
+        with pytest.raises(TimeoutError):
+            future.result(timeout=5)
+
+        broker = SpoolBroker(tmp_path).start()
+        try:
+            assert "<Containers>50</Containers>" in producer.request(message)
+            # The late reply to the timed-out message is deleted, not left behind
+            outbox = producer.transport.outbox
+            deadline = time.monotonic() + 5
+            while any(outbox.iterdir()) and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert not any(outbox.iterdir())
+        finally:
+            broker.close()
+    assert broker.counts[QUEUE] == 2
+
+@pytest.mark.jms
+def test_socket_broker_runs_as_separate_process(message):
+    process = subprocess.Popen([sys.executable, "-m", "helper.JMS.local_broker", "tcp", "--port", "0"],
+                               cwd=ProjectPaths.ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        url = process.stdout.readline().strip()
+        with Producer(url, QUEUE) as producer:
+            replies = producer.send_many([message] * 5, timeout=10)
+        assert all("<Containers>50</Containers>" in reply for reply in replies)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+class FakeMessage:
+    ids = itertools.count()
+
+    def __init__(self):
+        self.message_id, self.correlation_id, self.text = f"ID:{next(self.ids)}", None, None
+
+    def setStringProperty(self, name, value):
+        pass
+
+    def setJMSCorrelationID(self, value):
+        self.correlation_id = value
+
+    def setJMSReplyTo(self, queue):
+        pass
+
+    def setText(self, text):
+        self.text = text
+
+    def getJMSMessageID(self):
+        return self.message_id
+
+    def getJMSCorrelationID(self):
+        return self.correlation_id
+
+    def getBody(self, cls):
+        return self.text
+
+class FakeConnection:
+    """Sessions whose sender fails while `fail_sends` is positive; `broken` fails new sessions."""
+
+    def __init__(self):
+        self.broken, self.fail_sends, self.sent = False, 0, []
+
+    def createQueueSession(self, transacted, ack):
+        if self.broken:
+            raise RuntimeError("connection lost")
+        return SimpleNamespace(createTextMessage=FakeMessage, createSender=lambda queue: self,
+                               close=lambda: None)
+
+    def send(self, message):
+        if self.fail_sends:
+            self.fail_sends -= 1
+            raise RuntimeError("send failed")
+        self.sent.append(message)
+
+    def close(self):
+        pass
+
+def _reply(correlation_id, text):
+    reply = FakeMessage()
+    reply.setJMSCorrelationID(correlation_id)
+    reply.setText(text)
+    return reply
+
+@pytest.fixture
+def weblogic_transport(monkeypatch):
+    """WebLogicTransport on a fake, already open connection (no JVM)."""
+    monkeypatch.setattr(weblogic, "java_classes",
+                        lambda: SimpleNamespace(StringClass=str, QueueRequestor=lambda session, queue: None))
+    transport = weblogic.WebLogicTransport("t3://127.0.0.1:1", QUEUE, retries=1)
+    transport._connection, transport._queue = FakeConnection(), QUEUE
+    transport._consumer, transport._reply_queue = object(), "reply-queue"
+    return transport
+
+@pytest.mark.jms
+def test_weblogic_failed_send_only_retries_that_message(weblogic_transport):
+    transport = weblogic_transport
+    first = transport.send_async("first")
+    transport._connection.fail_sends = 1
+    second = transport.send_async("second")
+
+    assert not first.done() and not second.done()
+    assert [m.text for m in transport._connection.sent] == ["first", "second"]
+    transport._resolve(_reply(first.correlation_id, "reply 1"))
+    # Server answering with the JMS message ID instead of the correlation ID
+    transport._resolve(_reply(transport._connection.sent[1].message_id, "reply 2"))
+    assert (first.result(), second.result()) == ("reply 1", "reply 2")
+    assert transport._pending == {} and transport._aliases == {}
+
+@pytest.mark.jms
+def test_weblogic_broken_connection_fails_in_flight_requests(weblogic_transport):
+    transport = weblogic_transport
+    transport.retries = 0
+    first = transport.send_async("first")
+    transport._connection.fail_sends = 1
+    transport._connection.broken = True
+
+    with pytest.raises(RuntimeError, match="send failed"):
+        transport.send_async("second")
+    with pytest.raises(ConnectionError, match="reset"):
+        first.result(timeout=1)
+    assert transport._connection is None
+
+@pytest.mark.jms
+def test_weblogic_expires_pending_and_unmatched_replies(weblogic_transport, monkeypatch):
+    transport = weblogic_transport
+    monkeypatch.setattr(weblogic, "UNMATCHED_TTL", 0)
+    future = transport.send_async("late", timeout=0)
+    transport._resolve(_reply("unknown-id", "orphan"))
+    assert "unknown-id" in transport._unmatched
+
+    transport._expire()
+    with pytest.raises(TimeoutError):
+        future.result(timeout=1)
+    assert transport._pending == {} and transport._aliases == {} and transport._unmatched == {}
+
+@pytest.mark.jms
+def test_memory_broker_rejects_conflicting_options():
+    reset_memory_broker("options")
+    broker = get_memory_broker("options", latency_ms=5)
+    assert get_memory_broker("options") is broker
+    assert get_memory_broker("options", latency_ms=5, per_container_ms=0.0) is broker
+    with pytest.raises(ValueError, match="latency_ms"):
+        MemoryTransport("memory://options?latency_ms=50", QUEUE)
+    reset_memory_broker("options")
+    assert MemoryTransport("memory://options?latency_ms=50", QUEUE).broker.latency == 0.05
+    reset_memory_broker("options")
@@ -0,0 +1,145 @@
+import logging
+import re
+import pytest
+
+import helper.logger as app_logging
+from helper.logger import AppendRotatingFileHandler, LoggerSingleton, LOG_FORMAT
+from helper.log_viewer import iter_lines_reversed, tail
+
+def _file_logger(path, name="test_logger"):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = AppendRotatingFileHandler(str(path), maxBytes=0, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    return logger, handler
+
+@pytest.mark.logger
+def test_append_handler_and_newest_first_view(tmp_path):
+    log_file = tmp_path / "app.log"
+    logger, handler = _file_logger(log_file)
+
+    logger.info("first ✅")
+    logger.warning("second")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("third")
+    handler.close()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert lines[0].endswith("INFO - first [OK]")
+    assert lines[1].endswith("WARNING - second")
+
+    records = list(tail(log_file, include_backups=False))
+    assert len(records) == 3
+    assert "ERROR - third" in records[0] and records[0].rstrip().endswith("ValueError: boom")
+    assert records[2].endswith("first [OK]")
+
+    assert [r.split(" - ")[-1] for r in tail(log_file, min_level=logging.WARNING, include_backups=False)][1] == "second"
+    assert len(list(tail(log_file, count=1, include_backups=False))) == 1
+
+@pytest.mark.logger
+def test_iter_lines_reversed_small_blocks(tmp_path):
+    path = tmp_path / "lines.txt"
+    lines = [f"line {i} " + "x" * (i % 7) for i in range(200)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert list(iter_lines_reversed(path, block_size=13)) == [""] + lines[::-1]
+
+@pytest.mark.logger
+def test_queued_logger_flush_and_shutdown(tmp_path, monkeypatch):
+    log_file = tmp_path / "app.log"
+    monkeypatch.setattr(app_logging, "LOG_FILE", log_file)
+    try:
+        logger = LoggerSingleton.setup_logger(queued=True)
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+        for i in range(100):
+            logger.warning("queued %d", i)
+        LoggerSingleton.flush()
+        assert log_file.read_text(encoding="utf-8").count("queued") == 100
+
+        LoggerSingleton.shutdown()
+        logger.warning("after shutdown")
+        assert "after shutdown" in log_file.read_text(encoding="utf-8")
+
+        file_handler = next(h for h in logger.handlers if isinstance(h, logging.FileHandler))
+        LoggerSingleton.setup_logger(queued=False)
+        assert file_handler.stream is None  # closed, not leaked
+    finally:
+        monkeypatch.undo()
+        LoggerSingleton.setup_logger(queued=False)
+
+@pytest.mark.logger
+def test_debug_out_line_profiler_aggregates_calls(tmp_path, monkeypatch):
+    from helper import decorators
+    from helper.decorators import CallProfiler, debug_out_line
+
+    monkeypatch.setattr(decorators, "profiler", CallProfiler(enabled=True))
+
+    class Page:
+        @debug_out_line
+        def step(self, fail=False):
+            if fail:
+                raise ValueError("boom")
+            return object()
+
+    page = Page()
+    for _ in range(5):
+        page.step()
+    with pytest.raises(ValueError):
+        page.step(fail=True)
+
+    (row,) = decorators.profiler.stats()
+    assert row["name"] == "test_debug_out_line_profiler_aggregates_calls.<locals>.Page.step"
+    assert row["count"] == 6
+    assert row["min_ms"] <= row["mean_ms"] <= row["max_ms"]
+    assert sum(row["histogram"].values()) == 6
+
+    report_path = decorators.profiler.write_report(tmp_path / "call_profile.txt")
+    assert "Page.step" in report_path.read_text(encoding="utf-8")
+
+@pytest.mark.logger
+def test_debug_out_line_keeps_entry_and_exit_records(caplog):
+    from helper import decorators
+    from helper.decorators import debug_out_line
+
+    @debug_out_line
+    def lookup(key):
+        return key
+
+    assert decorators.logger.level == logging.NOTSET  # level follows the root logger, as before
+    with caplog.at_level(logging.DEBUG), caplog.at_level(logging.DEBUG, logger="application_logger"):
+        lookup("cntr")
+    messages = [r.getMessage() for r in caplog.records if r.name == "helper.decorators"]
+    assert messages[0].startswith("Entering") and "lookup" in messages[0]
+    assert messages[1].startswith("Exiting") and "lookup" in messages[1]
+
+@pytest.mark.logger
+def test_debug_out_line_follows_app_log_level(caplog):
+    from helper.decorators import debug_out_line
+
+    class Page:
+        @debug_out_line
+        def step(self, fail=False):
+            if fail:
+                raise ValueError("boom")
+
+    # Root stays at DEBUG (basicConfig); LOG_LEVEL=WARNING on the app logger still skips the debug lines
+    with caplog.at_level(logging.DEBUG), caplog.at_level(logging.WARNING, logger="application_logger"):
+        Page().step()
+        with pytest.raises(ValueError):
+            Page().step(fail=True)
+        fast = [r.getMessage() for r in caplog.records if r.name == "helper.decorators"]
+    caplog.clear()
+    with caplog.at_level(logging.DEBUG), caplog.at_level(logging.DEBUG, logger="application_logger"):
+        with pytest.raises(ValueError):
+            Page().step(fail=True)
+        slow = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+
+    assert len(fast) == 1 and len(slow) == 1
+    pattern = r"Error in Page\.step - Duration: \d+\.\d{3}s - Exception: boom"
+    assert re.fullmatch(pattern, fast[0]) and re.fullmatch(pattern, slow[0])
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from helper import step_events
+from helper.step_events import StepEventSink, read_events, step, summarize, traced
+
+class FakeActions:
+    @traced("action", target_arg=1)
+    def find(self, xpath):
+        return None if xpath == "//missing" else object()
+
+    @traced("action", target_arg=1)
+    def click(self, xpath):
+        raise RuntimeError(f"cannot click {xpath}")
+
+@pytest.mark.step_events
+def test_traced_calls_write_jsonl_and_summarize(tmp_path, monkeypatch):
+    path = tmp_path / "step_events.jsonl"
+    monkeypatch.setattr(step_events, "sink", StepEventSink(path, enabled=True))
+    actions = FakeActions()
+
+    with step("Gate Pickup section"):
+        for _ in range(3):
+            actions.find("//ok")
+        actions.find("//missing")
+        with pytest.raises(RuntimeError):
+            actions.click("//broken")
+    step_events.sink.close()
+
+    events = list(read_events(path))
+    assert [e["kind"] for e in events] == ["action"] * 5 + ["step"]
+    assert [e["outcome"] for e in events] == ["ok", "ok", "ok", "none", "error", "ok"]
+    assert events[0]["name"] == "FakeActions.find" and events[0]["target"] == "//ok"
+    assert events[0]["end"] >= events[0]["start"]
+    assert events[0]["test"].endswith("test_traced_calls_write_jsonl_and_summarize")
+
+    per_locator = {r["key"]: r for r in summarize(events, kinds=("action",), key=lambda e: e["target"])}
+    assert per_locator["//ok"]["count"] == 3
+    assert per_locator["//broken"]["errors"] == 1
+    assert summarize(events, kinds=("step",))[0]["key"] == "Gate Pickup section"
+
+@pytest.mark.step_events
+def test_disabled_sink_writes_nothing(tmp_path, monkeypatch):
+    path = tmp_path / "step_events.jsonl"
+    monkeypatch.setattr(step_events, "sink", StepEventSink(path, enabled=False))
+    FakeActions().find("//ok")
+    assert not path.exists()
+
+@pytest.mark.step_events
+def test_main_summarizes_keys_events(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "step_events.jsonl"
+    monkeypatch.setattr(step_events, "sink", StepEventSink(path, enabled=True))
+
+    @traced("keys")
+    def sendkeys(keys):
+        return None
+
+    sendkeys("ABC")
+    sendkeys("{ENTER}")
+    step_events.sink.close()
+
+    assert step_events.main(["--file", str(path), "--json"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert [(r["key"], r["count"]) for r in summary["per_keys"]] == [
+        ("test_main_summarizes_keys_events.<locals>.sendkeys", 2)]
+    assert summary["per_locator"] == []
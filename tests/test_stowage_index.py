@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+
+from helper.stowage_index import StowageIndex, decode_stowage, encode_stowage, free_cells_in_order
+
+@pytest.fixture
+def discharge_df():
+    rows = []
+    for bay in (1, 2, 3):
+        for tier in (82, 84):
+            for row in range(3):
+                rows.append({"ContainerNum": None, "Bay": f"{bay:02d}D",
+                             "StowageCell_ISO": encode_stowage(bay, row, tier), "planned": None})
+    df = pd.DataFrame(rows)
+    df.loc[0, ["ContainerNum", "planned"]] = ["DISH100001", "Yes"]  # bay 1, row 0, tier 82
+    return df
+
+@pytest.mark.stowage
+def test_encode_decode_round_trip():
+    assert encode_stowage(1, 0, 82) == 10082 == int(f"{1}{0:02d}{82}")
+    assert decode_stowage(781692) == (78, 16, 92)
+    assert decode_stowage(encode_stowage(5, 12, 4)) == (5, 12, 4)
+
+@pytest.mark.stowage
+def test_index_tracks_occupancy_and_bay_counters(discharge_df):
+    index = StowageIndex(discharge_df)
+
+    assert not index.is_free((1, 0, 82)) and index.is_planned((1, 0, 82))
+    assert not index.is_free((9, 0, 82))  # unknown cell
+    assert index.free_in_bay(1) == 5 and index.free_in_bay(2) == 6
+    assert not index.bay_is_empty("01D") and index.bay_is_empty("02D") and index.bay_is_empty("99D")
+
+    # Tier first, then row
+    assert index.first_free(1, tiers=[82, 84], rows=range(3)) == (1, 1, 82)
+    label = index.assign((2, 0, 82), "DISH100002")
+    assert discharge_df.loc[label, "StowageCell_ISO"] == 20082
+    assert index.free_in_bay(2) == 5 and not index.bay_is_empty("02D")
+
+    with pytest.raises(ValueError):
+        index.assign((2, 0, 82), "DISH100003")
+
+    for row in range(3):
+        for tier in (82, 84):
+            if index.is_free((3, row, tier)):
+                index.assign((3, row, tier), "X")
+    assert index.free_in_bay(3) == 0
+    assert index.first_free(3, tiers=[82, 84], rows=range(3)) is None
+
+@pytest.mark.stowage
+def test_free_cells_in_order_matches_repeated_first_free(discharge_df):
+    index = StowageIndex(discharge_df)
+    bays, tiers, rows = [3, 1], [82, 84], list(range(3))
+
+    expected = []
+    for bay in bays:
+        while (cell := index.first_free(bay, tiers, rows)) is not None:
+            expected.append(index.assign(cell, "X"))
+
+    positions = free_cells_in_order(discharge_df, bays, tiers, rows, count=100)
+    assert discharge_df.index[positions].tolist() == expected
+    assert len(free_cells_in_order(discharge_df, bays, tiers, rows, count=4)) == 4
+
+@pytest.mark.stowage
+def test_grid_vectorized_codes_and_memmap(discharge_df, tmp_path):
+    import numpy as np
+    from helper.stowage_grid import StowageGrid, decode, encode
+
+    codes = discharge_df["StowageCell_ISO"].to_numpy()
+    assert (encode(*decode(codes)) == codes).all()
+    with pytest.raises(ValueError):
+        decode([1_000_000])
+
+    discharge_df["EquipmentSizeType"] = ["2010", "4010", "L5G1"] * 6
+    path = tmp_path / "discharge.grid.npy"
+    grid = StowageGrid.from_dataframe(discharge_df, path=path)
+    assert grid.free_per_bay()[[1, 2, 3]].tolist() == [5, 6, 6]
+    assert grid.is_free([10082, 20082, 990000]).tolist() == [False, True, False]
+    assert grid.planned[1, 0, 82] and not grid.planned[1, 1, 82]
+    assert grid.size_of([10082, 10182, 10282, 990000]).tolist() == [20, 40, 45, 0]
+
+    fill = grid.first_free(bays=[3, 1], tiers=[82, 84], rows=range(3), count=4)
+    assert fill.tolist() == [30082, 30182, 30282, 30084]
+    grid.occupy(fill)
+    grid.flush()
+
+    reopened = StowageGrid.open(path, mode="r")
+    assert isinstance(reopened.cells, np.memmap)
+    assert reopened.free_per_bay()[3] == 2
+    assert reopened.cells_where(reopened.free)[:2].tolist() == [10084, 10182]
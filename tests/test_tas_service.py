@@ -0,0 +1,189 @@
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from helper.decorators import CallProfiler
+from helper.http.TAS_service import (AppointmentService, CircuitBreaker, TASUnavailableError, appointment_created,
+                                     backoff_delay)
+
+DELAY = 0.1
+
+class TasHandler(BaseHTTPRequestHandler):
+    """Stand-in tasService: every cntrId in the request gets a tasContainer; ids starting with BAD fail."""
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(body)
+        time.sleep(self.server.delay)
+        if self.server.unavailable:
+            self.server.unavailable -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        containers = "".join(
+            f"<tasContainer><cntrId>{e.text}</cntrId>"
+            f"<validTASCntr>{'N' if e.text.startswith('BAD') else 'Y'}</validTASCntr>"
+            f"{'<failReason>Unknown container</failReason>' if e.text.startswith('BAD') else ''}"
+            f"<appointmentStatus>ACTIVE</appointmentStatus></tasContainer>"
+            for e in ET.fromstring(body).iter("cntrId"))
+        reply = (f"<AppointmentCreateUpdateReturn><CommonResponse><returnCode>000</returnCode></CommonResponse>"
+                 f"{containers}</AppointmentCreateUpdateReturn>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+class TasServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 drops concurrent connects
+
+@pytest.fixture
+def tas_server():
+    server = TasServer(("127.0.0.1", 0), TasHandler)
+    server.requests = []
+    server.delay = DELAY
+    server.unavailable = 0  # answer this many requests with 503
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def service(tas_server, tmp_path):
+    host, port = tas_server.server_address[:2]
+    return AppointmentService(f"http://{host}:{port}/services/message/tasService",
+                              username=None, password=None, save_directory=tmp_path, backoff_base=0)
+
+@pytest.mark.tas
+def test_create_appointments_concurrently_in_input_order(service, tas_server):
+    cntr_ids = [f"CNTR{i:06d}" for i in range(40)] + ["BAD0000001"]
+
+    start = time.perf_counter()
+    results = service.create_appointments(cntr_ids, max_workers=20)
+    elapsed = time.perf_counter() - start
+
+    assert [r["cntr_id"] for r in results] == cntr_ids
+    assert [r["appointment_status"]["container_id"] for r in results] == cntr_ids
+    assert all(r["appointment_status"]["appointment_successful"] for r in results[:-1])
+    assert results[-1]["appointment_status"]["fail_reason"] == "Unknown container"
+    assert [appointment_created(r) for r in results] == [True] * 40 + [False]
+    assert len(tas_server.requests) == len(cntr_ids)
+    assert service.sender.pool_maxsize == 20
+    # 41 serial round-trips would take over 4 s
+    assert elapsed < len(cntr_ids) * DELAY / 4
+
+@pytest.mark.tas
+def test_create_appointments_reports_unreachable_endpoint(tmp_path):
+    service = AppointmentService("http://127.0.0.1:9/services/message/tasService",
+                                 username=None, password=None, save_directory=tmp_path, backoff_base=0,
+                                 breaker=CircuitBreaker(failure_threshold=0))
+    results = service.create_appointments(["CNTR000001", "CNTR000002"], max_workers=2)
+    assert [(r["cntr_id"], r["success"], r["error"]) for r in results] == [
+        ("CNTR000001", False, "Connection error"), ("CNTR000002", False, "Connection error")]
+    assert not any(appointment_created(r) for r in results)
+
+@pytest.mark.tas
+def test_create_appointments_packs_batches_into_one_change_list(service, tas_server):
+    cntr_ids = [f"CNTR{i:06d}" for i in range(9)] + ["BAD0000001"]
+
+    results = service.create_appointments(cntr_ids, max_workers=2, batch_size=4)
+
+    assert len(tas_server.requests) == 3
+    changes = [[e.text for e in ET.fromstring(body).iter("cntrId")] for body in tas_server.requests]
+    assert sorted(changes) == [cntr_ids[0:4], cntr_ids[4:8], cntr_ids[8:10]]
+    assert all(len(ET.fromstring(body).findall("AppointmentChangeList")) == 1 for body in tas_server.requests)
+    assert [r["cntr_id"] for r in results] == cntr_ids
+    assert [r["appointment_status"]["container_id"] for r in results] == cntr_ids
+    assert all(r["appointment_status"]["appointment_successful"] for r in results[:-1])
+    assert results[-1]["appointment_status"]["fail_reason"] == "Unknown container"
+
+@pytest.mark.tas
+def test_send_appointments_request_rejects_empty_batch(service, tas_server):
+    with pytest.raises(ValueError, match="At least one container"):
+        service.send_appointments_request([])
+    assert tas_server.requests == []
+
+@pytest.mark.tas
+def test_analyze_response_reports_every_container(service):
+    reply = ("<AppointmentCreateUpdateReturn><CommonResponse><returnCode>000</returnCode></CommonResponse>"
+             "<tasContainer><cntrId>CNTR000001</cntrId><validTASCntr>Y</validTASCntr></tasContainer>"
+             "<tasContainer><cntrId>CNTR000002</cntrId><validTASCntr>N</validTASCntr>"
+             "<failReason>Blocked</failReason></tasContainer></AppointmentCreateUpdateReturn>")
+
+    analysis = service.sender._analyze_response(reply)
+
+    assert analysis["container_id"] == "CNTR000001"
+    assert [(c["container_id"], c["appointment_successful"], c["fail_reason"]) for c in analysis["containers"]] == [
+        ("CNTR000001", True, None), ("CNTR000002", False, "Blocked")]
+
+@pytest.mark.tas
+def test_send_retries_unavailable_endpoint_with_backoff(service, tas_server):
+    latency = service.sender.latency = CallProfiler(enabled=True, title="TAS request latency")
+    tas_server.delay = 0
+    tas_server.unavailable = 2
+
+    result = service.create_appointment("CNTR000001")
+
+    assert result["success"] and result["attempts"] == 3
+    assert result["appointment_status"]["appointment_successful"]
+    counts = {row["name"]: row["count"] for row in latency.stats()}
+    assert counts == {"POST 503": 2, "POST 200": 1, "send_message": 1}
+    assert "TAS request latency" in latency.report()
+
+@pytest.mark.tas
+def test_read_timeout_is_not_retried(tas_server, tmp_path):
+    host, port = tas_server.server_address[:2]
+    service = AppointmentService(f"http://{host}:{port}/services/message/tasService",
+                                 username=None, password=None, save_directory=tmp_path,
+                                 timeout=DELAY / 2, backoff_base=0)
+
+    result = service.create_appointment("CNTR000001")
+
+    # The server may have created the appointment already; a resend could duplicate it
+    assert (result["success"], result["error"], result["attempts"]) == (False, "Request timeout", 1)
+    assert len(tas_server.requests) == 1
+
+@pytest.mark.tas
+def test_circuit_breaker_fails_fast_when_endpoint_is_down(tmp_path):
+    service = AppointmentService("http://127.0.0.1:9/services/message/tasService",
+                                 username=None, password=None, save_directory=tmp_path,
+                                 retries=1, backoff_base=0, breaker=CircuitBreaker(failure_threshold=2),
+                                 latency=CallProfiler(enabled=False))
+    cntr_ids = [f"CNTR{i:06d}" for i in range(5)]
+
+    with pytest.raises(TASUnavailableError, match="5 container") as excinfo:
+        service.create_appointments(cntr_ids, max_workers=1)
+
+    results = excinfo.value.results
+    assert [(r["error"], r["attempts"]) for r in results] == [
+        ("Connection error", 2)] + [("Circuit open", 0)] * 4
+    assert results[-1]["circuit_state"] == "open"
+    assert service.sender.latency.stats() == []  # disabled recorder (PROFILE_TAS unset) collects nothing
+
+@pytest.mark.tas
+def test_circuit_breaker_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    assert breaker.allow() and not breaker.allow()  # a single trial request
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    assert all(0 <= backoff_delay(attempt, 0.5, 2.0) <= min(2.0, 0.5 * 2 ** attempt) for attempt in range(6))